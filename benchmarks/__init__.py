@@ -0,0 +1,4 @@
+"""Benchmarks for the generators, run against synthetic repositories."""
+from .synthetic import RepoSpec, build_repo
+
+__all__ = ["RepoSpec", "build_repo"]
@@ -0,0 +1,5 @@
+"""Run the generator benchmarks: ``python -m benchmarks``."""
+from .runner import main
+
+if __name__ == "__main__":
+    main()
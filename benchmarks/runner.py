@@ -0,0 +1,177 @@
+"""Time the generators on synthetic repositories and compare with a baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.runner --scales 1k,10k --output results.json
+    python -m benchmarks.runner --scales 1k --baseline results.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+from unittest import mock
+
+from loguru import logger
+
+from .synthetic import RepoSpec, build_repo
+from .timing import measure
+
+SCALES = {
+    "1k": RepoSpec(files=1_000, depth=3, fanout=4),
+    "10k": RepoSpec(files=10_000, depth=4, fanout=5),
+    "100k": RepoSpec(files=100_000, depth=5, fanout=6),
+}
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """An entry point to time, and how to undo what a run leaves behind."""
+    run: Callable[[], object]
+    setup: Optional[Callable[[], object]] = None
+
+
+def remove(*paths: Path) -> None:
+    """Delete files and directory trees, ignoring ones that do not exist."""
+    for path in paths:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink(missing_ok=True)
+
+
+@contextmanager
+def working_directory(path: Path) -> Iterator[None]:
+    """Temporarily change the working directory."""
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def benchmarks(root: Path, site_dir: Path) -> Dict[str, Benchmark]:
+    """Get the benchmarked entry points, bound to a synthetic repository.
+
+    Must be called with the repository as the working directory. Git
+    operations are replaced with no-ops so only generation is timed, and
+    the site generator is pointed at the synthetic repository. Caches and
+    outputs a run leaves behind are removed before the next, so every run
+    does the full work.
+    """
+    from readme_generator.generators import readme_generator, section_cache, tree_generator
+    from site_generator import generator as site_generator
+    from site_generator.cache import CACHE_DIR as SITE_CACHE_DIR
+    from summary_generator.generator import SummaryGenerator
+    from summary_generator.python_summary import generate_python_summary
+
+    def readme() -> None:
+        with mock.patch.object(readme_generator, "commit_and_push"):
+            readme_generator.generate_readme()
+
+    def reset_readme() -> None:
+        # Cached sections and an unchanged README.md would skip the render and the write
+        section_cache.clear_environments()
+        remove(root / section_cache.CACHE_DIR, root / "README.md")
+
+    def site() -> None:
+        with mock.patch.object(site_generator, "get_project_root", lambda: root):
+            site_generator.build_site(str(site_dir))
+
+    def reset_site() -> None:
+        # The render cache would leave an unchanged page untouched
+        remove(root / SITE_CACHE_DIR, site_dir)
+
+    return {
+        "summaries": Benchmark(lambda: SummaryGenerator(root, incremental=False).generate_all_summaries()),
+        "python_summary": Benchmark(lambda: generate_python_summary(root)),
+        "tree": Benchmark(lambda: tree_generator.generate_tree(str(root))),
+        "readme": Benchmark(readme, reset_readme),
+        "site": Benchmark(site, reset_site),
+    }
+
+
+def run_scale(spec: RepoSpec, repeat: int, selected: List[str]) -> Dict[str, dict]:
+    """Build one synthetic repository and time each benchmark on it."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve() / "repo"
+        build_repo(root, spec)
+        with working_directory(root):
+            for name, benchmark in benchmarks(root, root.parent / "_site").items():
+                if selected and name not in selected:
+                    continue
+                results[name] = measure(benchmark.run, repeat, benchmark.setup)
+                print(f"  {name:<16}{results[name]['wall_s'] * 1000:10.1f} ms", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Compare results with a baseline.
+
+    Args:
+        results: Results of this run
+        baseline: Results of an earlier run
+        tolerance: Allowed slowdown, as a fraction of the baseline time
+
+    Returns:
+        Descriptions of the benchmarks that regressed
+    """
+    regressions = []
+    for scale, timings in results["results"].items():
+        for name, timing in timings.items():
+            before = baseline.get("results", {}).get(scale, {}).get(name)
+            if before is None:
+                continue
+            ratio = timing["wall_s"] / before["wall_s"] if before["wall_s"] else 1.0
+            line = (f"{scale:>5} {name:<16}{before['wall_s'] * 1000:10.1f} ms"
+                    f" -> {timing['wall_s'] * 1000:10.1f} ms  ({ratio:.2f}x)")
+            print(line)
+            if ratio > 1 + tolerance:
+                regressions.append(line)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1k", help=f"comma-separated, from {', '.join(SCALES)}")
+    parser.add_argument("--benchmarks", default="", help="comma-separated subset to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="compare with results from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="allowed slowdown before a benchmark counts as regressed")
+    args = parser.parse_args()
+
+    logger.remove()  # Generator logging would dominate the output
+    selected = [name for name in args.benchmarks.split(",") if name]
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "scales": {},
+        "results": {},
+    }
+    for scale in args.scales.split(","):
+        print(f"{scale}:", flush=True)
+        results["scales"][scale] = asdict(SCALES[scale])
+        results["results"][scale] = run_scale(SCALES[scale], args.repeat, selected)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} benchmarks regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Micro-benchmark: single-pass scope visitor vs. parent links + ast.walk.
+
+Run from the repository root:
+
+    python -m benchmarks.signature_extractor --classes 400 --repeat 5
+"""
+import argparse
+import ast
+from typing import List
+
+from summary_generator.signature_extractor import ScopeVisitor, Signature, SignatureExtractor
+
+from .synthetic import build_module
+from .timing import best_of
+
+
+class ParentNodeTransformer(ast.NodeTransformer):
+    """Add parent references to all nodes in the AST, as the extractor used to."""
+    
+    def visit(self, node: ast.AST) -> ast.AST:
+        """Visit a node and add parent references to all its children."""
+        for child in ast.iter_child_nodes(node):
+            child.parent = node
+        return super().visit(node)
+
+
+def legacy_extract(extractor: SignatureExtractor, tree: ast.AST) -> List[Signature]:
+    """Reference two-pass algorithm: attach parents with a transformer, then ``ast.walk``."""
+    ParentNodeTransformer().visit(tree)
+
+    signatures: List[Signature] = []
+    classes = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            parent = getattr(node, 'parent', None)
+            in_class = isinstance(parent, ast.ClassDef)
+            sig = extractor.function_signature(node, 'method' if in_class else 'function')
+            if in_class and parent in classes:
+                classes[parent].methods.append(sig)
+            else:
+                signatures.append(sig)
+        elif isinstance(node, ast.ClassDef):
+            classes[node] = extractor.class_signature(node)
+            signatures.append(classes[node])
+    return signatures
+
+
+def scope_extract(extractor: SignatureExtractor, tree: ast.AST) -> List[Signature]:
+    """Current single-pass algorithm, as used by ``extract_signatures``."""
+    visitor = ScopeVisitor(extractor)
+    visitor.visit(tree)
+    return visitor.signatures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--classes", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    source = build_module(args.classes)
+    extractor = SignatureExtractor()
+    parse = best_of(lambda: ast.parse(source), args.repeat)
+
+    # Time the traversals on pre-parsed trees; parsing cost is shared
+    legacy_tree, scope_tree = ast.parse(source), ast.parse(source)
+    legacy = best_of(lambda: legacy_extract(extractor, legacy_tree), args.repeat)
+    current = best_of(lambda: scope_extract(extractor, scope_tree), args.repeat)
+
+    print(f"module: {len(source.splitlines())} lines, {len(source) / 1024:.0f} KiB")
+    print(f"ast.parse:               {parse * 1000:8.1f} ms")
+    print(f"parent links + ast.walk: {legacy * 1000:8.1f} ms")
+    print(f"scope visitor:           {current * 1000:8.1f} ms")
+    print(f"traversal speedup:       {legacy / current:8.1f}x")
+    print(f"end-to-end speedup:      {(parse + legacy) / (parse + current):8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Deterministic synthetic repositories for benchmarking the generators."""
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List
+
+WORDS = (
+    "summary tree readme template render parse module class method file "
+    "directory project config cache index stream chunk signature site page"
+).split()
+
+# Non-Python file types, cycled through for the remaining files
+TEXT_SUFFIXES = [".md", ".txt", ".json", ".yml", ".toml"]
+
+PYPROJECT = '''[project]
+name = "synthetic-project"
+version = "0.1.0"
+description = "Synthetic repository for benchmarks"
+
+[tool.readme]
+title = "Synthetic Project"
+
+[tool.readme.tree]
+ignore_patterns = ["__pycache__", "*.pyc", ".git", ".summary_cache", ".readme_cache", ".site_cache", "SUMMARY", "SUMMARIES"]
+
+[tool.summary]
+ignore_patterns = ["__pycache__", "*.pyc", ".git", "SUMMARY", ".summary_cache", ".readme_cache", ".site_cache"]
+'''
+
+BASE_TEMPLATE = '''# {{ readme.title }}
+
+{% for template in get_section_templates() %}
+{{ render_section(template) }}
+{% endfor %}
+'''
+
+SECTION_TEMPLATE = '''## {{ project.name }} section {n}
+
+{{ project.description }}. Version {{ project.version }}.
+'''
+
+SITE_TEMPLATE = "<html><head><title>Site</title></head><body>{{content}}</body></html>\n"
+
+
+@dataclass(frozen=True)
+class RepoSpec:
+    """Shape of a synthetic repository.
+
+    Files are spread round-robin over every directory of a tree with the
+    given depth and fan-out, so each directory holds a similar share.
+    """
+    files: int = 1000
+    depth: int = 3
+    fanout: int = 4
+    file_size: int = 2048
+    python_ratio: float = 0.4
+    classes: int = 3
+    methods: int = 4
+    statements: int = 6
+    seed: int = 0
+
+
+def build_module(classes: int, methods: int = 8, statements: int = 12) -> str:
+    """Build a Python module with realistic method bodies and closures."""
+    lines = ["import os", ""]
+    for c in range(classes):
+        lines.append(f"class Service{c}(Base):")
+        lines.append(f'    """Service number {c}."""')
+        for m in range(methods):
+            lines.append(f"    def method_{m}(self, path: str, retries: int = 3) -> dict[str, int]:")
+            lines.append('        """Do some work."""')
+            lines.append("        def closure(value):")
+            lines.append("            return value * 2")
+            for s in range(statements):
+                lines.append(f"        result_{s} = {{'key': os.path.join(path, str({s}))}}")
+            lines.append("        return {k: len(v) for k, v in result_0.items()}")
+        lines.append("")
+        lines.append(f"def helper_{c}(items: list[str]) -> int:")
+        lines.append("    return sum(len(item) for item in items if item)")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _directories(root: Path, depth: int, fanout: int) -> Iterator[Path]:
+    """Yield every directory of a tree, breadth first, starting at root."""
+    level = [root]
+    yield root
+    for d in range(depth):
+        level = [parent / f"dir{d}_{i}" for parent in level for i in range(fanout)]
+        yield from level
+
+
+def _text(rng: random.Random, size: int) -> str:
+    """Generate roughly size bytes of line-broken text."""
+    lines, length = [], 0
+    while length < size:
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14)))
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+
+def build_repo(root: str | Path, spec: RepoSpec = RepoSpec()) -> List[Path]:
+    """Write a synthetic repository; the same spec always gives the same tree.
+
+    Besides the generated files, the repository has the pyproject.toml,
+    README templates, site template and README.md the generators expect.
+
+    Args:
+        root: Directory to create the repository in
+        spec: Shape of the repository
+
+    Returns:
+        Paths of the generated source files
+    """
+    root = Path(root)
+    rng = random.Random(spec.seed)
+    directories = list(_directories(root / "src", spec.depth, spec.fanout))
+    for directory in directories:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    module = build_module(spec.classes, spec.methods, spec.statements)
+    paths = []
+    for n in range(spec.files):
+        directory = directories[n % len(directories)]
+        # Spread Python files evenly so any prefix has the requested ratio
+        if int((n + 1) * spec.python_ratio) > int(n * spec.python_ratio):
+            path = directory / f"module_{n}.py"
+            path.write_text(module.replace("Service", f"Service{n}_"), encoding="utf-8")
+        else:
+            suffix = TEXT_SUFFIXES[n % len(TEXT_SUFFIXES)]
+            size = max(1, int(rng.gauss(spec.file_size, spec.file_size / 4)))
+            path = directory / f"file_{n}{suffix}"
+            path.write_text(_text(rng, size), encoding="utf-8")
+        paths.append(path)
+
+    (root / "pyproject.toml").write_text(PYPROJECT, encoding="utf-8")
+    sections = root / "docs" / "readme" / "sections"
+    sections.mkdir(parents=True, exist_ok=True)
+    (root / "docs" / "readme" / "base.md.j2").write_text(BASE_TEMPLATE, encoding="utf-8")
+    for n, name in enumerate(["introduction", "usage", "development"]):
+        (sections / f"{name}.md.j2").write_text(SECTION_TEMPLATE.replace("{n}", str(n)), encoding="utf-8")
+    site = root / "docs" / "site"
+    site.mkdir(parents=True, exist_ok=True)
+    (site / "template.html").write_text(SITE_TEMPLATE, encoding="utf-8")
+    (root / "README.md").write_text("# Synthetic Project\n\n" + _text(rng, 4096), encoding="utf-8")
+    return paths
@@ -0,0 +1,45 @@
+"""Timing helpers shared by the benchmarks."""
+import gc
+import time
+from typing import Callable, Dict, Optional
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    """Return the fastest of several timed runs, in seconds.
+
+    Like ``timeit``, garbage collection is paused while timing, so freeing
+    the previous run's tree does not land in the next measurement.
+    """
+    return measure(fn, repeat)["wall_s"]
+
+
+def measure(
+    fn: Callable[[], object],
+    repeat: int,
+    setup: Optional[Callable[[], object]] = None
+) -> Dict[str, float]:
+    """Time several runs and keep the fastest wall and CPU times.
+
+    Args:
+        fn: Callable to time
+        repeat: Number of runs
+        setup: Called untimed before each run, e.g. to clear caches the
+            previous run left behind
+
+    Returns:
+        Best ``wall_s`` and ``cpu_s`` over the runs
+    """
+    walls, cpus = [], []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            wall, cpu = time.perf_counter(), time.process_time()
+            fn()
+            walls.append(time.perf_counter() - wall)
+            cpus.append(time.process_time() - cpu)
+        finally:
+            gc.enable()
+    return {"wall_s": min(walls), "cpu_s": min(cpus)}
@@ -0,0 +1,5 @@
+"""Utilities shared by the readme, site and summary generators."""
+from .context import ProjectContext, get_project_context
+from .path_filter import PathFilter, get_path_filter
+
+__all__ = ["PathFilter", "ProjectContext", "get_path_filter", "get_project_context"]
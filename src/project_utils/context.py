@@ -0,0 +1,110 @@
+"""Project root and configuration, located and parsed once per process."""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import tomli
+from loguru import logger
+
+CONFIG_NAME = "pyproject.toml"
+
+_roots: Dict[Path, Path] = {}
+_configs: Dict[Path, Tuple[Tuple[int, int], dict]] = {}
+
+
+@dataclass(frozen=True)
+class ProjectContext:
+    """Resolved project root, parsed configuration and template locations."""
+    root: Path
+    config: dict
+
+    @property
+    def config_path(self) -> Path:
+        """Path to the project's pyproject.toml."""
+        return self.root / CONFIG_NAME
+
+    @property
+    def readme_template_dir(self) -> Path:
+        """Directory holding the README templates."""
+        return self.root / "docs" / "readme"
+
+    @property
+    def site_template_dir(self) -> Path:
+        """Directory holding the site template."""
+        return self.root / "docs" / "site"
+
+    def tool_config(self, name: str) -> dict:
+        """Get a ``[tool.<name>]`` table, empty if it is not configured."""
+        return self.config.get("tool", {}).get(name, {})
+
+
+def find_project_root(start: Optional[str | Path] = None) -> Path:
+    """Find the nearest directory at or above start containing pyproject.toml.
+
+    Results are cached per start directory.
+
+    Args:
+        start: Directory to search from. Defaults to the working directory.
+
+    Returns:
+        Absolute path to the project root, or to start if none is found
+    """
+    start = Path(start or Path.cwd()).absolute()
+    if start not in _roots:
+        current = start
+        while current != current.parent:
+            if (current / CONFIG_NAME).exists():
+                break
+            current = current.parent
+        else:
+            logger.warning("Could not find pyproject.toml in parent directories")
+            current = start
+        _roots[start] = current
+    return _roots[start]
+
+
+def load_toml(path: str | Path) -> dict:
+    """Parse a TOML file, reusing the parsed result until the file changes.
+
+    The returned dict is shared between callers and must not be modified.
+
+    Args:
+        path: Path to the TOML file
+
+    Returns:
+        Parsed TOML data
+    """
+    path = Path(path).absolute()
+    stat = path.stat()
+    fingerprint = (stat.st_mtime_ns, stat.st_size)
+    cached = _configs.get(path)
+    if cached is None or cached[0] != fingerprint:
+        logger.debug(f"Parsing {path}")
+        with open(path, "rb") as f:
+            _configs[path] = (fingerprint, tomli.load(f))
+    return _configs[path][1]
+
+
+def get_project_context(start: Optional[str | Path] = None) -> ProjectContext:
+    """Get the context for the project containing start.
+
+    The root lookup and the config parse are cached; the config is parsed
+    again only when pyproject.toml's mtime or size changes.
+
+    Args:
+        start: Directory to search from. Defaults to the working directory.
+
+    Returns:
+        Project context, with an empty config if there is no pyproject.toml
+    """
+    root = find_project_root(start)
+    try:
+        config = load_toml(root / CONFIG_NAME)
+    except FileNotFoundError:
+        config = {}
+    return ProjectContext(root=root, config=config)
+
+
+def clear_cache() -> None:
+    """Forget cached roots and configs, e.g. after moving a project."""
+    _roots.clear()
+    _configs.clear()
@@ -0,0 +1,182 @@
+"""Committing generated files with a few git plumbing calls."""
+import os
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from loguru import logger
+from .report import count
+
+# Identity for generated commits, passed through the environment so no git config is written
+BOT_IDENTITY = ("github-actions[bot]", "github-actions[bot]@users.noreply.github.com")
+
+# Index entry mode and object id that remove a path in ``update-index --index-info``
+_REMOVE = f"0 {'0' * 40}"
+
+
+@dataclass
+class CommitResult:
+    """Outcome of ``commit_and_push``."""
+    commit: Optional[str] = None
+    branch: Optional[str] = None
+    pushed: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        """Whether a commit was made."""
+        return self.commit is not None
+
+
+class Git:
+    """Runs git commands in a repository and records the time each one takes."""
+
+    def __init__(self, root: str | Path = ".", identity: Optional[Tuple[str, str]] = BOT_IDENTITY):
+        """Initialize for a repository.
+
+        Args:
+            root: Directory inside the repository
+            identity: Author and committer name and email, or None to use
+                the repository's git config
+        """
+        self.root = Path(root)
+        self.env = dict(os.environ)
+        if identity is not None:
+            name, email = identity
+            self.env.update(
+                GIT_AUTHOR_NAME=name, GIT_AUTHOR_EMAIL=email,
+                GIT_COMMITTER_NAME=name, GIT_COMMITTER_EMAIL=email
+            )
+        self.timings: Dict[str, float] = {}
+
+    def run(self, *args: str, input: Optional[str] = None, index: Optional[Path] = None,
+            check: bool = True) -> subprocess.CompletedProcess:
+        """Run a git command.
+
+        Args:
+            *args: Command and arguments, without the leading ``git``
+            input: Text passed on stdin
+            index: Index file to use instead of the repository's own
+            check: Raise if the command fails
+
+        Returns:
+            Completed process with text stdout
+
+        Raises:
+            subprocess.CalledProcessError: If check is set and the command fails
+        """
+        env = self.env if index is None else {**self.env, "GIT_INDEX_FILE": str(index)}
+        start = time.perf_counter()
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=self.root, env=env, input=input,
+                capture_output=True, text=True, check=check
+            )
+        except subprocess.CalledProcessError as e:
+            logger.error(f"git {args[0]} failed: {e.stderr.strip()}")
+            raise
+        finally:
+            self.timings[args[0]] = self.timings.get(args[0], 0.0) + time.perf_counter() - start
+
+
+def _index_entries(git: Git, top: Path, paths: List[Path]) -> List[str]:
+    """Hash the files into the object store and build ``--index-info`` lines."""
+    present = [path for path in paths if path.is_file()]
+    hashed = git.run(
+        "hash-object", "-w", "--stdin-paths",
+        input="".join(f"{path}\n" for path in present)
+    ).stdout.split() if present else []
+    object_ids = dict(zip(present, hashed))
+
+    entries = []
+    for path in paths:
+        name = path.relative_to(top).as_posix()
+        if path in object_ids:
+            mode = "100755" if os.access(path, os.X_OK) else "100644"
+            entries.append(f"{mode} {object_ids[path]}\t{name}\n")
+        else:
+            entries.append(f"{_REMOVE}\t{name}\n")
+    return entries
+
+
+def commit_and_push(
+    paths: Iterable[str | Path],
+    message: str,
+    branch: Optional[str] = None,
+    base_branch: Optional[str] = None,
+    force: bool = False,
+    remote: Optional[str] = "origin",
+    root: str | Path = ".",
+    identity: Optional[Tuple[str, str]] = BOT_IDENTITY
+) -> CommitResult:
+    """Commit files as they are on disk and push the commit once.
+
+    Files are hashed in one ``hash-object --stdin-paths`` batch and staged
+    in one ``update-index --index-info`` batch; the commit is built with
+    ``write-tree`` and ``commit-tree``, so the working tree is never
+    checked out. Committing to the checked-out branch goes through the
+    repository's index, keeping ``git status`` clean; any other branch is
+    built in a temporary index. Nothing is committed or pushed when the
+    resulting tree equals the parent's.
+
+    Args:
+        paths: Files to commit; paths that no longer exist are removed
+        message: Commit message
+        branch: Branch to commit to; defaults to the checked-out branch
+        base_branch: Ref the commit is based on when the branch does not
+            exist yet, or always when forcing; defaults to HEAD
+        force: Base the commit on base_branch and force push, replacing
+            the branch's history (for generated content)
+        remote: Remote to push to, or None to only commit locally
+        root: Directory inside the repository
+        identity: Author and committer name and email, or None to use
+            the repository's git config
+
+    Returns:
+        The commit made, if any, and the time spent in each git command
+    """
+    git = Git(root, identity)
+    result = CommitResult(timings=git.timings)
+    base = base_branch or "HEAD"
+    top, parent, parent_tree, head = git.run(
+        "rev-parse", "--show-toplevel", f"{base}^{{commit}}", f"{base}^{{tree}}",
+        "--symbolic-full-name", "HEAD"
+    ).stdout.split("\n")[:4]
+    top = Path(top).resolve()
+    ref = head if branch is None else f"refs/heads/{branch}"
+    if not ref.startswith("refs/heads/"):
+        raise ValueError("Cannot commit to a detached HEAD without a branch name")
+    result.branch = ref[len("refs/heads/"):]
+    current = ref == head and not force
+    if not force and not (current and base_branch is None):
+        # Build on the branch itself when it already exists
+        existing = git.run("rev-parse", f"{ref}^{{commit}}", f"{ref}^{{tree}}", check=False)
+        if existing.returncode == 0:
+            parent, parent_tree = existing.stdout.split()
+
+    files = sorted({Path(path).resolve() for path in paths})
+    count("git", files=len(files))
+    with tempfile.TemporaryDirectory() as scratch:
+        index = None
+        if not current:
+            index = Path(scratch) / "index"
+            git.run("read-tree", parent, index=index)
+        git.run("update-index", "--add", "--remove", "--index-info",
+                input="".join(_index_entries(git, top, files)), index=index)
+        tree = git.run("write-tree", index=index).stdout.strip()
+
+    if tree == parent_tree:
+        logger.info(f"No changes to commit on {result.branch}")
+        return result
+
+    result.commit = git.run("commit-tree", tree, "-p", parent, "-m", message).stdout.strip()
+    git.run("update-ref", "-m", message, "HEAD" if current else ref, result.commit)
+    logger.info(f"Committed {len(files)} paths to {result.branch} as {result.commit[:12]}")
+
+    if remote is not None:
+        git.run("push", *(["--force"] if force else []), remote, f"{result.commit}:{ref}")
+        result.pushed = True
+        logger.success(f"Pushed {result.branch} to {remote}")
+    return result
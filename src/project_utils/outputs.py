@@ -0,0 +1,76 @@
+"""Writing generated files only when their content changes."""
+import hashlib
+import os
+from pathlib import Path
+from loguru import logger
+from .report import count, phase
+
+
+def hash_file(path: Path, chunk_size: int = 64 * 1024) -> str:
+    """Hash a file's bytes without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write a file through a temporary sibling, so it is never seen half written."""
+    staged_path = path.with_name(path.name + '.tmp')
+    try:
+        staged_path.write_bytes(data)
+        os.replace(staged_path, path)
+    except BaseException:
+        staged_path.unlink(missing_ok=True)
+        raise
+
+
+def write_if_changed(path: str | Path, content: str | bytes) -> bool:
+    """Write a generated file unless it already holds the same content.
+
+    The file on disk is only read when its size matches the new content,
+    and then compared by SHA-256. New content is written atomically.
+
+    Args:
+        path: File to write
+        content: New content, text is written as UTF-8
+
+    Returns:
+        Whether the file was written
+    """
+    path = Path(path)
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    with phase("write"):
+        try:
+            unchanged = (path.stat().st_size == len(data) and
+                         hash_file(path) == hashlib.sha256(data).hexdigest())
+        except FileNotFoundError:
+            unchanged = False
+        if unchanged:
+            logger.info(f"{path} is unchanged")
+            count("write", cache_hits=1)
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, data)
+    count("write", files=1, bytes_written=len(data))
+    return True
+
+
+def report_changed(changed: bool, name: str = "changed") -> None:
+    """Tell the caller whether a command changed anything.
+
+    Prints ``changed=true`` or ``changed=false`` and, inside GitHub
+    Actions, appends the same line to ``$GITHUB_OUTPUT`` so later steps
+    can be skipped with ``if: steps.<id>.outputs.changed == 'true'``.
+
+    Args:
+        changed: Whether any output was written
+        name: Output name
+    """
+    line = f"{name}={'true' if changed else 'false'}"
+    print(line)
+    github_output = os.environ.get("GITHUB_OUTPUT")
+    if github_output:
+        with open(github_output, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
@@ -0,0 +1,168 @@
+"""Precompiled gitignore-style path filtering shared by all generators."""
+import re
+from functools import lru_cache
+from pathlib import Path, PurePath
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def translate(pattern: str) -> str:
+    """Translate a glob pattern to a regex where ``*`` never crosses ``/``.
+
+    ``**/`` matches any number of leading directories and a trailing ``/**``
+    matches everything inside a directory, as in ``.gitignore``.
+    """
+    i, n, out = 0, len(pattern), []
+    while i < n:
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 2:]:
+            end = pattern.index(']', i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(out)
+
+
+class PathFilter:
+    """Match paths against ``.gitignore``-style exclusion patterns.
+
+    Patterns are compiled once. A pattern without a slash matches any single
+    path component, so it excludes a directory together with everything in
+    it. A pattern with a leading or inner slash is anchored to the root and
+    matched against the whole relative path. A trailing slash restricts a
+    pattern to directories and a leading ``!`` re-includes what an earlier
+    pattern excluded; as in git, nothing inside an excluded directory can be
+    re-included. Decisions for directory prefixes are memoized, so checking
+    many files in one directory costs one name match each.
+    """
+
+    def __init__(self, patterns: Iterable[str], root: Optional[str | Path] = None):
+        """Compile patterns.
+
+        Args:
+            patterns: Exclusion patterns, in ``.gitignore`` order
+            root: Optional root; paths under it are matched relative to it
+        """
+        self.patterns = tuple(patterns)
+        self.root_parts = PurePath(root).parts if root is not None else ()
+        # (regex, negated, directories only, anchored)
+        self._rules: List[Tuple[re.Pattern, bool, bool, bool]] = []
+        for pattern in self.patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith('#'):
+                continue
+            negated = pattern.startswith('!')
+            if negated:
+                pattern = pattern[1:]
+            dir_only = pattern.endswith('/')
+            pattern = pattern.rstrip('/')
+            anchored = '/' in pattern
+            regex = re.compile(translate(pattern.lstrip('/')) + r'\Z', re.DOTALL)
+            self._rules.append((regex, negated, dir_only, anchored))
+
+        self._has_negation = any(rule[1] for rule in self._rules)
+        self._names = self._combine(anchored=False)
+        self._anchored = self._combine(anchored=True)
+        self._dir_names = self._combine(anchored=False, dir_only=True)
+        self._dir_anchored = self._combine(anchored=True, dir_only=True)
+        self._directories: Dict[Tuple[str, ...], bool] = {}
+
+    def _combine(self, anchored: bool, dir_only: bool = False) -> Optional[re.Pattern]:
+        """Combine non-negated rules of one kind into a single regex."""
+        regexes = [
+            regex.pattern for regex, negated, rule_dir_only, rule_anchored in self._rules
+            if not negated and rule_anchored == anchored and (dir_only or not rule_dir_only)
+        ]
+        return re.compile('|'.join(f'(?:{r})' for r in regexes), re.DOTALL) if regexes else None
+
+    def _matches(self, parts: Tuple[str, ...], is_dir: bool) -> bool:
+        """Decide whether the last component of a path is itself excluded."""
+        name = parts[-1]
+        if not self._has_negation:
+            names = self._dir_names if is_dir else self._names
+            anchored = self._dir_anchored if is_dir else self._anchored
+            if names is not None and names.match(name):
+                return True
+            return anchored is not None and anchored.match('/'.join(parts)) is not None
+
+        # The last matching rule wins
+        rel_path = '/'.join(parts)
+        for regex, negated, dir_only, is_anchored in reversed(self._rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path if is_anchored else name):
+                return not negated
+        return False
+
+    def _relative_parts(self, path: str | PurePath | Tuple[str, ...]) -> Tuple[str, ...]:
+        if isinstance(path, tuple):
+            parts = path
+        elif isinstance(path, PurePath):
+            parts = path.parts
+        else:
+            parts = PurePath(path).parts
+        root = self.root_parts
+        if root and parts[:len(root)] == root:
+            parts = parts[len(root):]
+        return parts
+
+    def _is_directory_excluded(self, parts: Tuple[str, ...]) -> bool:
+        """Check a directory prefix, memoizing the decision."""
+        if not parts:
+            return False
+        excluded = self._directories.get(parts)
+        if excluded is None:
+            excluded = (self._is_directory_excluded(parts[:-1]) or
+                        self._matches(parts, is_dir=True))
+            self._directories[parts] = excluded
+        return excluded
+
+    def is_excluded(self, path: str | PurePath | Tuple[str, ...], is_dir: bool = False) -> bool:
+        """Check whether a path, or any directory containing it, is excluded.
+
+        Args:
+            path: Path to check, as a path, string or tuple of parts
+            is_dir: Whether the path itself is a directory
+
+        Returns:
+            True if the path should be skipped
+        """
+        parts = self._relative_parts(path)
+        if not parts:
+            return False
+        if is_dir:
+            return self._is_directory_excluded(parts)
+        return self._is_directory_excluded(parts[:-1]) or self._matches(parts, is_dir=False)
+
+    def is_included(self, path: str | PurePath | Tuple[str, ...], is_dir: bool = False) -> bool:
+        """Inverse of ``is_excluded``."""
+        return not self.is_excluded(path, is_dir)
+
+
+@lru_cache(maxsize=32)
+def get_path_filter(patterns: Tuple[str, ...], root: Optional[str] = None) -> PathFilter:
+    """Get a shared, compiled filter for a set of patterns.
+
+    Args:
+        patterns: Exclusion patterns, in ``.gitignore`` order
+        root: Optional root; paths under it are matched relative to it
+
+    Returns:
+        Cached path filter
+    """
+    return PathFilter(patterns, root)
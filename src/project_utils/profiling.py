@@ -0,0 +1,129 @@
+"""cProfile wrapper writing pstats and flamegraph-ready collapsed stacks."""
+import cProfile
+import io
+import pstats
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+from loguru import logger
+
+DEFAULT_PROFILE = "profile.pstats"
+
+# Stacks contributing less than this many microseconds are dropped
+MIN_MICROSECONDS = 1
+
+# Call paths are followed until they carry less than this fraction of the profiled time
+MIN_FRACTION = 1e-4
+
+# Stacks are cut off at this many frames
+MAX_DEPTH = 128
+
+Func = Tuple[str, int, str]
+
+
+def _label(func: Func) -> str:
+    """Format a pstats function key as a frame name."""
+    filename, line, name = func
+    if filename == "~":
+        return name  # Built-in
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """Convert profile statistics to collapsed stacks.
+
+    cProfile only records caller/callee pairs, so full stacks are rebuilt by
+    walking down from the entry points and splitting each function's time
+    between its callers in proportion to the time each call path spent in it.
+    Recursive calls are folded into the outermost frame. Paths are not
+    followed past ``MAX_DEPTH`` frames or once they carry less than
+    ``MIN_FRACTION`` of the total time; the time below is counted in the
+    last frame kept, so the number of stacks stays bounded however many
+    call paths the profile has.
+
+    Args:
+        stats: Profile statistics
+
+    Returns:
+        Lines of ``frame;frame;frame microseconds``, as read by flamegraph tools
+    """
+    raw = stats.stats
+    callees: Dict[Func, List[Tuple[Func, float]]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((func, cumulative))
+
+    roots = sorted(func for func, (_, _, _, _, callers) in raw.items() if not callers)
+    threshold = max(MIN_MICROSECONDS / 1e6, MIN_FRACTION * sum(raw[root][3] for root in roots))
+    totals: Dict[str, float] = {}
+
+    # Frames still to visit: function, key of the calling stack, functions on the path, time
+    pending: List[Tuple[Func, str, FrozenSet[Func], float]] = [
+        (root, "", frozenset(), raw[root][3]) for root in reversed(roots)
+    ]
+    while pending:
+        func, caller_key, path, seconds = pending.pop()
+        _, _, own, cumulative, _ = raw[func]
+        share = seconds / cumulative if cumulative else 0.0
+        key = f"{caller_key};{_label(func)}" if caller_key else _label(func)
+        path = path | {func}
+        spent = own * share
+        for callee, edge in callees.get(func, ()):
+            if callee in path or callee not in raw:
+                continue
+            if len(path) < MAX_DEPTH and edge * share >= threshold:
+                pending.append((callee, key, path, edge * share))
+            else:
+                spent += edge * share
+        totals[key] = totals.get(key, 0.0) + spent
+
+    return [
+        f"{key} {round(seconds * 1e6)}"
+        for key, seconds in sorted(totals.items())
+        if round(seconds * 1e6) >= MIN_MICROSECONDS
+    ]
+
+
+def format_top(stats: pstats.Stats, top: int) -> str:
+    """Format the hottest functions by cumulative time."""
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats("cumulative").print_stats(top)
+    return stream.getvalue()
+
+
+@contextmanager
+def profiling(
+    profile: Optional[bool | str] = None,
+    top: int = 0
+) -> Iterator[Optional[cProfile.Profile]]:
+    """Profile a block with cProfile.
+
+    Writes ``<profile>.pstats`` and a ``.collapsed`` file beside it when the
+    block exits, even on error. Does nothing unless profile or top is set.
+
+    Args:
+        profile: Path of the pstats file to write, or True for
+            ``profile.pstats`` in the working directory
+        top: Number of hottest functions to print; 0 prints none
+    """
+    if not profile and not top:
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        stats = pstats.Stats(profiler)
+        if profile:
+            path = Path(DEFAULT_PROFILE if profile is True else profile)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(path)
+            collapsed_path = path.with_suffix(".collapsed")
+            collapsed_path.write_text("\n".join(collapsed_stacks(stats)) + "\n", encoding="utf-8")
+            logger.info(f"Profile written to {path} and {collapsed_path}")
+        if top:
+            print(format_top(stats, top))
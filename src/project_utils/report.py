@@ -0,0 +1,203 @@
+"""Per-phase timing and I/O counters for a generator run."""
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import ContextManager, Dict, Iterator, Optional
+from loguru import logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Counters that can be added up across processes
+COUNTERS = ("files", "bytes_read", "bytes_written", "cache_hits", "cache_misses")
+
+
+def peak_rss_kb(children: bool = False) -> Optional[int]:
+    """Get the peak resident set size of this process or its children, in KiB."""
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@dataclass
+class PhaseStats:
+    """Accumulated measurements for one phase of a run."""
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    files: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    peak_rss_kb: Optional[int] = None
+
+
+class RunReport:
+    """Collect per-phase measurements for one command.
+
+    Phases can nest, e.g. reads during rendering, so their times are
+    inclusive and do not add up to the total. A phase's peak RSS is the
+    process high-water mark at the end of the phase. Phases may be timed
+    from several threads at once; CPU time is the whole process's.
+    """
+
+    def __init__(self, command: str = ""):
+        """Start a report.
+
+        Args:
+            command: Name of the command being measured
+        """
+        self.command = command
+        self.phases: Dict[str, PhaseStats] = {}
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._lock = threading.Lock()
+
+    def _stats(self, name: str) -> PhaseStats:
+        if name not in self.phases:
+            self.phases[name] = PhaseStats()
+        return self.phases[name]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseStats]:
+        """Time a block of work as part of a phase."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        with self._lock:
+            stats = self._stats(name)
+        try:
+            yield stats
+        finally:
+            with self._lock:
+                stats.calls += 1
+                stats.wall_s += time.perf_counter() - wall
+                stats.cpu_s += time.process_time() - cpu
+                stats.peak_rss_kb = peak_rss_kb()
+
+    def count(self, name: str, **counters: int) -> None:
+        """Add to a phase's counters, e.g. ``count("read", files=1)``."""
+        with self._lock:
+            stats = self._stats(name)
+            for key, value in counters.items():
+                setattr(stats, key, getattr(stats, key) + value)
+
+    def counters(self) -> Dict[str, Dict[str, float]]:
+        """Get the counters and CPU time of each phase, for merging elsewhere."""
+        return {
+            name: {"cpu_s": stats.cpu_s, **{key: getattr(stats, key) for key in COUNTERS}}
+            for name, stats in self.phases.items()
+        }
+
+    def merge(self, counters: Dict[str, Dict[str, float]]) -> None:
+        """Add counters collected in a worker process.
+
+        Wall time is not merged, since workers run concurrently with the
+        phase that waits for them.
+        """
+        for name, values in counters.items():
+            self.count(name, **values)
+
+    def to_dict(self) -> dict:
+        """Get the report as JSON-serializable data."""
+        return {
+            "command": self.command,
+            "wall_s": time.perf_counter() - self._wall_start,
+            "cpu_s": time.process_time() - self._cpu_start,
+            "peak_rss_kb": peak_rss_kb(),
+            "children_peak_rss_kb": peak_rss_kb(children=True),
+            "phases": {name: asdict(stats) for name, stats in self.phases.items()},
+        }
+
+    def save(self, path: str | Path) -> None:
+        """Write the report as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    def format_table(self) -> str:
+        """Format the report as a compact table."""
+        data = self.to_dict()
+        columns = [field.name for field in fields(PhaseStats)]
+        rows = [["phase", *columns]]
+        for name, stats in data["phases"].items():
+            rows.append([name, *(_format_value(stats[column]) for column in columns)])
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = ["  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows]
+        lines.append(
+            f"total: {data['wall_s']:.3f}s wall, {data['cpu_s']:.3f}s cpu, "
+            f"peak rss {_format_value(data['peak_rss_kb'])} KiB"
+        )
+        return "\n".join(lines)
+
+
+def _format_value(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+_current: Optional[RunReport] = None
+
+
+def current_report() -> Optional[RunReport]:
+    """Get the active report, or None when the run is not being measured."""
+    return _current
+
+
+def phase(name: str) -> ContextManager:
+    """Time a block as part of a phase of the active report, if any."""
+    return _current.phase(name) if _current is not None else nullcontext()
+
+
+def count(name: str, **counters: int) -> None:
+    """Add to a phase's counters in the active report, if any."""
+    if _current is not None:
+        _current.count(name, **counters)
+
+
+@contextmanager
+def reporting(path: Optional[str | Path], command: str = "") -> Iterator[Optional[RunReport]]:
+    """Measure a run and write its report to a path.
+
+    Does nothing if path is None. Otherwise the report is saved and a
+    summary table is logged when the block exits, even on error.
+
+    Args:
+        path: JSON file to write the report to
+        command: Name of the command being measured
+    """
+    global _current
+    if path is None:
+        yield None
+        return
+
+    previous, _current = _current, RunReport(command)
+    report = _current
+    try:
+        yield report
+    finally:
+        _current = previous
+        report.save(path)
+        logger.info(f"Run report written to {path}\n{report.format_table()}")
+
+
+@contextmanager
+def isolated_report() -> Iterator[RunReport]:
+    """Collect measurements in a fresh report, e.g. inside a worker process."""
+    global _current
+    previous, _current = _current, RunReport()
+    try:
+        yield _current
+    finally:
+        _current = previous
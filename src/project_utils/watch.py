@@ -0,0 +1,135 @@
+"""Change detection by diffing stat snapshots of a tree."""
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+# (size, mtime_ns) of each file; a change in either counts as a change
+Snapshot = Dict[Path, Tuple[int, int]]
+
+
+def take_snapshot(
+    root: str | Path,
+    include_directory: Callable[[Path], bool] = lambda path: True,
+    include_file: Callable[[Path], bool] = lambda path: True
+) -> Snapshot:
+    """Stat every included file beneath a root without reading any of them.
+
+    Args:
+        root: Directory to snapshot
+        include_directory: Predicate deciding whether a directory is entered
+        include_file: Predicate deciding whether a file is recorded
+
+    Returns:
+        Fingerprint of each included file
+    """
+    snapshot: Snapshot = {}
+    pending = [Path(root)]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            # Removed since its parent was listed
+            continue
+        for entry in entries:
+            path = directory / entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if include_directory(path):
+                        pending.append(path)
+                elif entry.is_file() and include_file(path):
+                    stat = entry.stat()
+                    snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                continue
+    return snapshot
+
+
+def changed_paths(before: Snapshot, after: Snapshot) -> Set[Path]:
+    """Get the files added, removed or modified between two snapshots."""
+    changed = {path for path, fingerprint in after.items() if before.get(path) != fingerprint}
+    changed.update(path for path in before if path not in after)
+    return changed
+
+
+class SnapshotWatcher:
+    """Poll a tree for changes and settle bursts of writes into one batch.
+
+    Usage::
+
+        watcher = SnapshotWatcher(lambda: take_snapshot("."))
+        while True:
+            changed = watcher.wait()
+            outputs = rebuild(changed)
+            watcher.absorb(outputs)
+    """
+
+    def __init__(
+        self,
+        take: Callable[[], Snapshot],
+        interval: float = 0.5,
+        debounce: float = 0.2,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """Take the baseline snapshot.
+
+        Args:
+            take: Callable returning a fresh snapshot of the watched files
+            interval: Seconds between polls while the tree is idle
+            debounce: Seconds the tree must stay unchanged before a batch
+                of changes is reported
+            sleep: Function used to wait between polls
+        """
+        self.take = take
+        self.interval = interval
+        self.debounce = debounce
+        self.sleep = sleep
+        self.snapshot = take()
+
+    def poll(self) -> Set[Path]:
+        """Snapshot the tree and get the files changed since the last snapshot."""
+        current = self.take()
+        changed = changed_paths(self.snapshot, current)
+        self.snapshot = current
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until files change and the tree then stays quiet.
+
+        Args:
+            timeout: Seconds to wait for a first change, or None for no limit
+
+        Returns:
+            Every file changed during the burst, empty on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = self.poll()
+        while not changed:
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            self.sleep(self.interval)
+            changed = self.poll()
+        while True:
+            self.sleep(self.debounce)
+            more = self.poll()
+            if not more:
+                return changed
+            changed |= more
+
+    def absorb(self, paths: Iterable[Path]) -> None:
+        """Accept the current state of files written by the watcher's owner.
+
+        Other files keep their last seen state, so edits made while a
+        rebuild ran are still reported by the next ``wait``.
+
+        Args:
+            paths: Files the owner wrote
+        """
+        current = self.take()
+        for path in paths:
+            if path in current:
+                self.snapshot[path] = current[path]
+            else:
+                self.snapshot.pop(path, None)
@@ -1,21 +1,78 @@
+from typing import Optional
 from loguru import logger
 import fire
+from project_utils.outputs import report_changed
+from project_utils.profiling import profiling
+from project_utils.report import reporting
 from .generators import generate_readme, update_structure, generate_tree
 
 class ReadmeGenerator:
     """CLI for README generation and maintenance"""
     
-    def readme(self) -> None:
-        """Generate and update the README.md file"""
-        generate_readme()
+    def readme(
+        self,
+        push: bool = True,
+        report: Optional[str] = None,
+        profile: bool | str = False,
+        profile_top: int = 0
+    ) -> None:
+        """Generate and update the README.md file
+        
+        Prints ``changed=true`` or ``changed=false``, also written to
+        ``$GITHUB_OUTPUT`` when run in GitHub Actions.
+        
+        Args:
+            push: Commit and push README.md if it changed
+            report: Path of a JSON file to write per-phase timings and counters to
+            profile: Write a cProfile ``.pstats`` file and collapsed stacks;
+                pass a path or use ``profile.pstats``
+            profile_top: Print this many of the hottest functions
+        """
+        with reporting(report, "readme_generator readme"), profiling(profile, profile_top):
+            changed = generate_readme(push=push)
+        report_changed(changed)
     
-    def structure(self) -> None:
-        """Update the project structure documentation"""
-        update_structure()
+    def structure(
+        self,
+        push: bool = True,
+        report: Optional[str] = None,
+        profile: bool | str = False,
+        profile_top: int = 0
+    ) -> None:
+        """Update the project structure documentation
+        
+        Prints ``changed=true`` or ``changed=false``, also written to
+        ``$GITHUB_OUTPUT`` when run in GitHub Actions.
+        
+        Args:
+            push: Commit and push the structure template if it changed
+            report: Path of a JSON file to write per-phase timings and counters to
+            profile: Write a cProfile ``.pstats`` file and collapsed stacks;
+                pass a path or use ``profile.pstats``
+            profile_top: Print this many of the hottest functions
+        """
+        with reporting(report, "readme_generator structure"), profiling(profile, profile_top):
+            changed = update_structure(push=push)
+        report_changed(changed)
     
-    def tree(self, path: str = ".") -> None:
-        """Print the project structure tree"""
-        print(generate_tree(path))
+    def tree(
+        self,
+        path: str = ".",
+        report: Optional[str] = None,
+        profile: bool | str = False,
+        profile_top: int = 0
+    ) -> None:
+        """Print the project structure tree
+        
+        Args:
+            path: Directory to print the tree for
+            report: Path of a JSON file to write per-phase timings and counters to
+            profile: Write a cProfile ``.pstats`` file and collapsed stacks;
+                pass a path or use ``profile.pstats``
+            profile_top: Print this many of the hottest functions
+        """
+        with reporting(report, "readme_generator tree"), profiling(profile, profile_top):
+            print(generate_tree(path))
 
 if __name__ == "__main__":
     fire.Fire(ReadmeGenerator)
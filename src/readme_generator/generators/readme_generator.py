@@ -1,8 +1,11 @@
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from loguru import logger
-from jinja2 import Environment, FileSystemLoader
-from ..utils import load_config, get_project_root, commit_and_push
+from project_utils.context import get_project_context
+from project_utils.git import commit_and_push
+from project_utils.outputs import write_if_changed
+from project_utils.report import phase
+from .section_cache import CACHE_DIR, SectionCache, get_environment
 
 def get_section_templates(template_dir: Path) -> List[str]:
     """Get all section templates in proper order.
@@ -41,40 +44,57 @@ def get_section_templates(template_dir: Path) -> List[str]:
         key=lambda x: section_order.get(x, 500)
     )
 
-def generate_readme() -> None:
-    """Generate README from templates and commit changes"""
-    project_root = get_project_root()
+def generate_readme(push: bool = True, root: Optional[Path] = None) -> bool:
+    """Generate README from templates and commit changes
+    
+    Nothing is written or committed when the rendered README matches the
+    one on disk.
+    
+    Args:
+        push: Commit and push the README after writing it
+        root: Directory to find the project from; defaults to the working directory
+        
+    Returns:
+        Whether README.md changed
+    """
+    context = get_project_context(root)
+    project_root = context.root
     logger.debug(f"Project root identified as: {project_root}")
     
     logger.info("Loading configurations")
-    project_config = load_config("pyproject.toml")
+    project_config = context.config
     
     logger.info("Setting up Jinja2 environment")
-    template_dir = project_root / 'docs/readme'
+    template_dir = context.readme_template_dir
     logger.debug(f"Template directory: {template_dir}")
     
-    env = Environment(
-        loader=FileSystemLoader(template_dir),
-        trim_blocks=True,
-        lstrip_blocks=True
-    )
-    
-    # Add template utility functions
-    env.globals['get_section_templates'] = lambda: get_section_templates(template_dir)
-    
-    template = env.get_template('base.md.j2')
+    cache_dir = project_root / CACHE_DIR
+    env = get_environment(template_dir, cache_dir)
+    sections = SectionCache(cache_dir, env)
     
     variables = {
         'project': project_config['project'],
         'readme': project_config['tool']['readme'],
     }
     
+    # Add template utility functions
+    env.globals['get_section_templates'] = lambda: get_section_templates(template_dir)
+    env.globals['render_section'] = lambda name: sections.render(f"sections/{name}", variables)
+    
+    template = env.get_template('base.md.j2')
+    
     logger.info("Rendering README template")
-    output = template.render(**variables)
+    with phase("render"):
+        output = template.render(**variables)
+    sections.save()
     
     readme_path = project_root / 'README.md'
     logger.debug(f"Writing README to: {readme_path}")
-    readme_path.write_text(output)
+    if not write_if_changed(readme_path, output):
+        return False
     
-    logger.info("Committing changes")
-    commit_and_push('README.md')
+    if push:
+        logger.info("Committing changes")
+        with phase("git"):
+            commit_and_push([readme_path], "Update README.md", root=project_root)
+    return True
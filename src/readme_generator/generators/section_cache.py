@@ -0,0 +1,174 @@
+"""Persistent memoization of rendered README sections."""
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, meta, nodes
+from loguru import logger
+from project_utils.report import count
+
+CACHE_DIR = ".readme_cache"
+SECTIONS_NAME = "sections.json"
+
+# Nodes that make a section depend on more than its own source and variables
+_DYNAMIC_NODES = (nodes.Include, nodes.Extends, nodes.Import, nodes.FromImport, nodes.Call)
+
+_environments: Dict[Path, Environment] = {}
+
+
+def get_environment(template_dir: Path, cache_dir: Path) -> Environment:
+    """Get the README template environment, created once per template directory.
+
+    Compiled templates are kept across runs in a bytecode cache, and in
+    memory while the process lives.
+
+    Args:
+        template_dir: Directory holding the README templates
+        cache_dir: Directory for the bytecode cache
+
+    Returns:
+        Shared environment for the directory
+    """
+    if template_dir not in _environments:
+        bytecode_dir = cache_dir / "bytecode"
+        bytecode_dir.mkdir(parents=True, exist_ok=True)
+        _environments[template_dir] = Environment(
+            loader=FileSystemLoader(template_dir),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            bytecode_cache=FileSystemBytecodeCache(str(bytecode_dir))
+        )
+    return _environments[template_dir]
+
+
+def clear_environments() -> None:
+    """Forget the shared environments, so the next run compiles templates afresh."""
+    _environments.clear()
+
+
+def _variable_path(node: nodes.Node) -> Optional[Tuple[str, ...]]:
+    """Get the lookup path of an expression like ``project.name``, if it is one."""
+    if isinstance(node, nodes.Name):
+        return (node.name,)
+    if isinstance(node, nodes.Getattr):
+        parent = _variable_path(node.node)
+        return None if parent is None else (*parent, node.attr)
+    if isinstance(node, nodes.Getitem) and isinstance(node.arg, nodes.Const):
+        parent = _variable_path(node.node)
+        return None if parent is None else (*parent, str(node.arg.value))
+    return None
+
+
+def variable_paths(ast: nodes.Template) -> Optional[List[Tuple[str, ...]]]:
+    """Find the parts of the render variables a template reads.
+
+    Args:
+        ast: Parsed template
+
+    Returns:
+        Sorted lookup paths such as ``("project", "name")``, or None if the
+        template includes other templates or calls functions, so its output
+        cannot be keyed on its variables alone
+    """
+    if any(True for _ in ast.find_all(_DYNAMIC_NODES)):
+        return None
+    undeclared = meta.find_undeclared_variables(ast)
+    paths: Set[Tuple[str, ...]] = set()
+
+    def visit(node: nodes.Node) -> None:
+        path = _variable_path(node)
+        if path is not None and path[0] in undeclared:
+            paths.add(path)
+            return
+        for child in node.iter_child_nodes():
+            visit(child)
+
+    visit(ast)
+    return sorted(paths)
+
+
+def _lookup(variables: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    """Follow a lookup path through nested mappings, None where it ends early."""
+    value: Any = variables
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+class SectionCache:
+    """Rendered sections keyed on their source and the variables they read.
+
+    Usage::
+
+        sections = SectionCache(cache_dir, env)
+        text = sections.render("sections/usage.md.j2", variables)
+        sections.save()
+    """
+
+    def __init__(self, cache_dir: Path, env: Environment):
+        """Load the cached sections.
+
+        Args:
+            cache_dir: Directory holding ``sections.json``
+            env: Environment the sections are rendered with
+        """
+        self.path = cache_dir / SECTIONS_NAME
+        self.env = env
+        self._dirty = False
+        try:
+            self.entries: Dict[str, dict] = json.loads(self.path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            self.entries = {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable section cache {self.path}: {e}")
+            self.entries = {}
+
+    def render(self, name: str, variables: Dict[str, Any]) -> str:
+        """Render a section, reusing the last output if nothing it uses changed.
+
+        Args:
+            name: Template name, e.g. ``sections/usage.md.j2``
+            variables: Render variables
+
+        Returns:
+            Rendered section
+        """
+        source, _, _ = self.env.loader.get_source(self.env, name)
+        source_hash = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        entry = self.entries.get(name)
+        if entry is None or entry["source"] != source_hash:
+            paths = variable_paths(self.env.parse(source))
+            entry = {"source": source_hash, "paths": paths}
+        elif entry["paths"] is not None:
+            paths = [tuple(path) for path in entry["paths"]]
+        else:
+            paths = None
+
+        if paths is None:
+            # Depends on more than its variables, so always render
+            return self.env.get_template(name).render(**variables)
+
+        used = json.dumps(
+            [[list(path), _lookup(variables, path)] for path in paths],
+            sort_keys=True, default=str
+        )
+        key = hashlib.sha256(used.encode('utf-8')).hexdigest()
+        if entry.get("key") == key:
+            count("render", cache_hits=1)
+            return entry["output"]
+
+        count("render", cache_misses=1)
+        output = self.env.get_template(name).render(**variables)
+        self.entries[name] = {**entry, "key": key, "output": output}
+        self._dirty = True
+        return output
+
+    def save(self) -> None:
+        """Write the cache if any section was rendered."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, indent=1, sort_keys=True), encoding='utf-8')
+        self._dirty = False
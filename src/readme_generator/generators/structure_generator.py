@@ -1,13 +1,28 @@
 from pathlib import Path
+from typing import Optional
 from loguru import logger
-from ..utils import get_project_root, commit_and_push
+from project_utils.context import get_project_context
+from project_utils.git import commit_and_push
+from project_utils.outputs import write_if_changed
+from project_utils.report import phase
 from .tree_generator import generate_tree
 
-def update_structure() -> None:
-    """Update the structure template and commit changes"""
-    project_root = get_project_root()
-    template_path = "docs/readme/sections/structure.md.j2"
-    full_template_path = project_root / template_path
+def update_structure(push: bool = True, root: Optional[Path] = None) -> bool:
+    """Update the structure template and commit changes
+    
+    Nothing is written or committed when the template is already current.
+    
+    Args:
+        push: Commit and push the template after writing it
+        root: Directory to find the project from; defaults to the working directory
+    
+    Returns:
+        Whether the structure template changed
+    """
+    context = get_project_context(root)
+    project_root = context.root
+    full_template_path = context.readme_template_dir / "sections" / "structure.md.j2"
+    template_path = full_template_path.relative_to(project_root).as_posix()
     
     tree = generate_tree(str(project_root))
     template_content = f"""## Project Structure
@@ -39,8 +54,10 @@ The repository is organized as follows:
 - `pyproject.toml`: Project configuration and dependencies
 """
     
-    full_template_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(full_template_path, 'w') as f:
-        f.write(template_content)
+    if not write_if_changed(full_template_path, template_content):
+        return False
     
-    commit_and_push(template_path)
+    if push:
+        with phase("git"):
+            commit_and_push([full_template_path], f"Update {template_path}", root=project_root)
+    return True
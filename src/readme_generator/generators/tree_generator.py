@@ -2,45 +2,30 @@ from pathlib import Path
 from typing import Optional, Tuple
 from loguru import logger
 from tree_format import format_tree
+from project_utils.path_filter import get_path_filter
+from project_utils.report import count, phase
 from ..utils import load_config
-import fnmatch
 
-def should_include_path(path: Path, config: dict) -> bool:
+def should_include_path(path: Path, config: dict, is_dir: bool = False) -> bool:
     """
     Determine if a path should be included in the tree.
-    Only excludes paths that exactly match ignore patterns.
+    Excludes paths where any component matches an ignore pattern.
     """
-    path_str = str(path)
-    logger.debug(f"Checking path: {path_str}")
-    
-    # Check against ignore patterns
-    ignore_patterns = set(config["tool"]["readme"]["tree"]["ignore_patterns"])
-    
-    # Split path into parts and check each part against patterns
-    path_parts = path_str.split('/')
-    for pattern in ignore_patterns:
-        for part in path_parts:
-            if fnmatch.fnmatch(part, pattern):
-                logger.debug(f"Path {path_str} matched ignore pattern {pattern}")
-                return False
-    
-    logger.debug(f"Path {path_str} included")
-    return True
+    patterns = tuple(config["tool"]["readme"]["tree"]["ignore_patterns"])
+    return get_path_filter(patterns).is_included(path, is_dir)
 
 def node_to_tree(path: Path, config: dict) -> Optional[Tuple[str, list]]:
     """Convert a path to a tree node format"""
-    logger.debug(f"Processing node: {path}")
-    
-    if not should_include_path(path, config):
-        logger.debug(f"Excluding node: {path}")
+    is_file = path.is_file()
+    if not should_include_path(path, config, is_dir=not is_file):
+        logger.debug("Excluding node: {}", path)
         return None
     
-    if path.is_file():
-        logger.debug(f"Including file: {path}")
+    count("scan", files=1)
+    if is_file:
         return path.name, []
     
     children = []
-    logger.debug(f"Processing children of: {path}")
     for child in sorted(path.iterdir()):
         node = node_to_tree(child, config)
         if node is not None:
@@ -48,10 +33,10 @@ def node_to_tree(path: Path, config: dict) -> Optional[Tuple[str, list]]:
     
     # Keep directories that have children or are essential
     if not children and path.name not in {'docs', 'src'}:
-        logger.debug(f"Excluding empty directory: {path}")
+        logger.debug("Excluding empty directory: {}", path)
         return None
     
-    logger.debug(f"Including directory: {path} with {len(children)} children")
+    logger.debug("Including directory: {} with {} children", path, len(children))
     return path.name, children
 
 def generate_tree(root_dir: str = ".") -> str:
@@ -65,7 +50,8 @@ def generate_tree(root_dir: str = ".") -> str:
     root_path = Path(root_dir)
     logger.debug(f"Root path: {root_path.absolute()}")
     
-    tree_root = node_to_tree(root_path, project_config)
+    with phase("scan"):
+        tree_root = node_to_tree(root_path, project_config)
     
     if tree_root is None:
         logger.warning("No tree generated - root excluded")
@@ -1,21 +1,50 @@
 """CLI entry point for site generator."""
+from typing import Optional
+
 import fire
 from loguru import logger
+from project_utils.profiling import profiling
+from project_utils.report import reporting
 
 from .generator import build_site
+from .pages import build_pages
 
 class SiteGenerator:
     """CLI for static site generation."""
     
-    def build(self, output_dir: str = "_site") -> None:
+    def build(
+        self,
+        output_dir: str = "_site",
+        pages: bool = False,
+        jobs: int = 0,
+        optimize: bool = False,
+        report: Optional[str] = None,
+        profile: bool | str = False,
+        profile_top: int = 0
+    ) -> None:
         """
         Build the static site.
         
         Args:
             output_dir: Output directory for the site. Defaults to '_site'.
+            pages: Build a page for every README.md and SUMMARIES/*.md file
+                with navigation between them, instead of only the root README
+            jobs: Number of processes converting markdown in multi-page
+                mode; 0 uses every CPU
+            optimize: Move the template's styles into a content-hashed
+                stylesheet, minify pages, write ``.gz`` siblings and log
+                the size before and after
+            report: Path of a JSON file to write per-phase timings and counters to
+            profile: Write a cProfile ``.pstats`` file and collapsed stacks;
+                pass a path or use ``profile.pstats``
+            profile_top: Print this many of the hottest functions
         """
         logger.info("Building static site")
-        build_site(output_dir)
+        with reporting(report, "site_generator build"), profiling(profile, profile_top):
+            if pages:
+                build_pages(output_dir, jobs=jobs, optimize=optimize)
+            else:
+                build_site(output_dir, optimize=optimize)
 
 def main() -> None:
     """CLI entry point."""
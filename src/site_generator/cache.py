@@ -0,0 +1,175 @@
+"""Content-hash cache of rendered pages for incremental site builds."""
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from loguru import logger
+from project_utils import report
+from .search import Section
+
+CACHE_DIR = ".site_cache"
+CACHE_NAME = "pages.json"
+# Converted markdown, one ``<key>.json`` file per source
+MARKDOWN_DIR = "markdown"
+
+
+def digest(*parts: str) -> str:
+    """Hash strings into one key, keeping part boundaries distinct."""
+    hasher = hashlib.sha256()
+    for part in parts:
+        data = part.encode('utf-8')
+        hasher.update(len(data).to_bytes(8, 'little'))
+        hasher.update(data)
+    return hasher.hexdigest()
+
+
+@dataclass
+class PageRecord:
+    """Key of a written page plus the stat of the file it was written to."""
+    key: str
+    markdown: str
+    size: int
+    mtime_ns: int
+
+
+class RenderCache:
+    """Rendered markdown and written pages of previous builds.
+
+    Converted markdown and its search sections are stored in a file of
+    their own, named by a hash of the source and the markdown2 extras, so
+    a page whose source is unchanged is never converted again and editing
+    one page writes only that page's entry. Each written page is recorded
+    in ``pages.json`` with the key of everything it was built from; a page
+    whose key is unchanged and whose file is untouched since it was
+    written is not rewritten.
+    """
+
+    VERSION = 3
+
+    def __init__(self, root_dir: str | Path):
+        """Initialize an empty cache for a project root.
+
+        Args:
+            root_dir: Project root; the cache lives in ``.site_cache/`` below it
+        """
+        self.path = Path(root_dir) / CACHE_DIR / CACHE_NAME
+        self.markdown_dir = self.path.parent / MARKDOWN_DIR
+        self.pages: Dict[str, PageRecord] = {}
+        # Entries read or stored during this build
+        self.markdown: Dict[str, dict] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, root_dir: str | Path) -> "RenderCache":
+        """Load the cache for a project root, or start a fresh one.
+
+        Args:
+            root_dir: Project root
+
+        Returns:
+            Loaded cache, empty if missing, stale or unreadable
+        """
+        cache = cls(root_dir)
+        try:
+            data = json.loads(cache.path.read_text(encoding='utf-8'))
+            if data.get("version") != cls.VERSION:
+                return cache
+            cache.pages = {key: PageRecord(**record) for key, record in data["pages"].items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable site cache {cache.path}: {e}")
+        return cache
+
+    def save(self) -> None:
+        """Write the page records if they changed, removing markdown no longer in use."""
+        if not self._dirty:
+            return
+        used = {record.markdown for record in self.pages.values()}
+        if self.markdown_dir.is_dir():
+            for entry in self.markdown_dir.iterdir():
+                if entry.stem not in used:
+                    entry.unlink(missing_ok=True)
+        data = {
+            "version": self.VERSION,
+            "pages": {key: vars(record) for key, record in sorted(self.pages.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(data, separators=(',', ':')), encoding='utf-8')
+        self._dirty = False
+
+    def is_current(self, output: Path, key: str) -> bool:
+        """Check whether a page was last written from the same inputs and is untouched.
+
+        Args:
+            output: Page file
+            key: Digest of everything the page is built from
+
+        Returns:
+            Whether the page can be left as it is
+        """
+        record = self.pages.get(str(output.absolute()))
+        if record is None or record.key != key:
+            return False
+        try:
+            stat = output.stat()
+        except FileNotFoundError:
+            return False
+        current = record.size == stat.st_size and record.mtime_ns == stat.st_mtime_ns
+        if current:
+            report.count("render", cache_hits=1)
+        return current
+
+    def _entry_path(self, markdown_key: str) -> Path:
+        return self.markdown_dir / f"{markdown_key}.json"
+
+    def converted(self, markdown_key: str) -> Optional[Tuple[str, List[Section]]]:
+        """Get previously converted markdown and its search sections, if any."""
+        entry = self.markdown.get(markdown_key)
+        if entry is None:
+            try:
+                entry = json.loads(self._entry_path(markdown_key).read_text(encoding='utf-8'))
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable site cache entry {markdown_key}: {e}")
+                return None
+            self.markdown[markdown_key] = entry
+        return entry["html"], [tuple(section) for section in entry["sections"]]
+
+    def store(self, markdown_key: str, html: str, sections: List[Section]) -> None:
+        """Remember converted markdown and its search sections in an entry of their own."""
+        entry = {"html": html, "sections": sections}
+        self.markdown[markdown_key] = entry
+        self.markdown_dir.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(entry, separators=(',', ':')).encode('utf-8')
+        staged_path = self._entry_path(markdown_key).with_suffix('.tmp')
+        staged_path.write_bytes(data)
+        os.replace(staged_path, self._entry_path(markdown_key))
+        self._dirty = True
+
+    def record(self, output: Path, key: str, markdown_key: str) -> None:
+        """Remember a page just written.
+
+        Args:
+            output: Page file, already written
+            key: Digest of everything the page is built from
+            markdown_key: Digest of the markdown source and extras
+        """
+        report.count("render", cache_misses=1)
+        stat = output.stat()
+        self.pages[str(output.absolute())] = PageRecord(key, markdown_key, stat.st_size, stat.st_mtime_ns)
+        self._dirty = True
+
+    def forget(self, outputs: Iterable[Path]) -> None:
+        """Drop the records of pages that are no longer built."""
+        for output in outputs:
+            if self.pages.pop(str(output.absolute()), None) is not None:
+                self._dirty = True
+
+    def outputs_under(self, directory: Path) -> Iterable[Path]:
+        """Get the recorded pages inside a directory."""
+        prefix = str(directory.absolute()) + os.sep
+        return [Path(key) for key in self.pages if key.startswith(prefix)]
@@ -1,24 +1,148 @@
 """Core site generation functionality."""
+import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from loguru import logger
 import markdown2
 
+from project_utils.context import get_project_context
+from project_utils.outputs import write_if_changed
+from project_utils.report import count, phase
+
+from .cache import RenderCache, digest
+from .optimize import Optimizer, remove_stylesheets
+from .search import INDEX_NAME, Section, build_index, extract_sections
+
+# markdown2 extras used for every page
+EXTRAS = ['fenced-code-blocks', 'tables', 'header-ids']
+
+PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+@dataclass(frozen=True)
+class PageTemplate:
+    """An HTML template split once into literal text and ``{{name}}`` placeholders."""
+    parts: Tuple[str, ...]
+    
+    @classmethod
+    def parse(cls, text: str) -> "PageTemplate":
+        """Split template text at its placeholders."""
+        # Odd positions hold placeholder names
+        return cls(tuple(PLACEHOLDER.split(text)))
+    
+    @property
+    def key(self) -> str:
+        """Digest of the template, for keying cached pages."""
+        return digest(*self.parts)
+    
+    def render(self, **values: str) -> str:
+        """Fill in placeholders; those without a value are kept as they are."""
+        parts = list(self.parts)
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = values[name] if name in values else f"{{{{{name}}}}}"
+        return "".join(parts)
+
+class PageWriter:
+    """Fills in the template and writes pages, optionally optimized."""
+    
+    def __init__(self, template_text: str, output_path: Path, optimize: bool = False):
+        """Parse the template once for every page.
+        
+        Args:
+            template_text: Content of template.html
+            output_path: Directory the site is written to
+            optimize: Move styles into a hashed stylesheet, minify pages and
+                write ``.gz`` siblings
+        """
+        self.template = PageTemplate.parse(template_text)
+        self.optimizer = Optimizer(output_path) if optimize else None
+        self.output_template = self.template
+        if self.optimizer is not None:
+            self.output_template = PageTemplate.parse(self.optimizer.extract_styles(template_text))
+        else:
+            # Pages of this build link no stylesheet from an optimized build
+            remove_stylesheets(output_path)
+    
+    @classmethod
+    def load(cls, path: Path, output_path: Path, optimize: bool = False) -> "PageWriter":
+        """Read a template file and prepare to write pages with it."""
+        with phase("read"):
+            text = path.read_text()
+        count("read", files=1, bytes_read=len(text))
+        return cls(text, output_path, optimize)
+    
+    @property
+    def key(self) -> str:
+        """Digest of how pages are written, for keying cached pages."""
+        return digest(self.output_template.key, str(self.optimizer is not None))
+    
+    def write(self, path: Path, **values: str) -> None:
+        """Render the template with placeholder values and write the page."""
+        page = self.output_template.render(**values)
+        if self.optimizer is None:
+            write_if_changed(path, page)
+            # A sibling left by an optimized build would no longer match
+            path.with_name(path.name + ".gz").unlink(missing_ok=True)
+        else:
+            self.optimizer.write(path, page, len(self.template.render(**values).encode('utf-8')))
+    
+    def write_data(self, path: Path, content: str) -> None:
+        """Write another site file, such as the search index."""
+        if self.optimizer is None:
+            write_if_changed(path, content)
+            path.with_name(path.name + ".gz").unlink(missing_ok=True)
+        else:
+            self.optimizer.write(path, content)
+    
+    def finish(self) -> None:
+        """Log the size savings, if optimizing."""
+        if self.optimizer is not None:
+            logger.info(self.optimizer.report.summary())
+
+def render_markdown(md_content: str) -> str:
+    """Convert markdown to HTML with the site's extras."""
+    return str(markdown2.markdown(md_content, extras=EXTRAS))
+
+def convert(md_content: str) -> Tuple[str, List[Section]]:
+    """Convert markdown to HTML and split it into search sections in one pass."""
+    html_content = render_markdown(md_content)
+    return html_content, extract_sections(html_content)
+
+def markdown_key(md_content: str) -> str:
+    """Digest of a markdown source and the extras it is converted with."""
+    return digest(md_content, *EXTRAS)
+
 def get_project_root() -> Path:
-    """Get the project root directory."""
-    return Path(__file__).parent.parent.parent
+    """Get the project root directory, searching upward from this package."""
+    return get_project_context(Path(__file__).parent).root
 
-def build_site(output_dir: Optional[str] = None) -> None:
+def build_site(
+    output_dir: Optional[str] = None,
+    root: Optional[Path] = None,
+    optimize: bool = False
+) -> Path:
     """
     Build a static site from README content.
     
+    A search index of the page's sections is written next to it. Nothing
+    is converted or written when the README and template are unchanged
+    since the last build and the page is untouched.
+    
     Args:
         output_dir: Optional directory for site output. Defaults to '_site'.
+        root: Project root to read the README and template from. Defaults
+            to the project containing this package.
+        optimize: Move the template's styles into a hashed stylesheet,
+            minify the page and write precompressed ``.gz`` siblings
+        
+    Returns:
+        Path of the written page
     """
     logger.info("Starting site generation")
     
-    root = get_project_root()
+    root = root or get_project_root()
     output_path = Path(output_dir or "_site")
     template_path = root / "docs" / "site" / "template.html"
     readme_path = root / "README.md"
@@ -42,29 +166,41 @@ def build_site(output_dir: Optional[str] = None) -> None:
     
     # Read template
     logger.debug("Loading template")
-    with template_path.open() as f:
-        template = f.read()
+    writer = PageWriter.load(template_path, output_path, optimize)
+    with phase("read"):
+        with readme_path.open() as f:
+            md_content = f.read()
+    count("read", files=1, bytes_read=len(md_content))
+    
+    output_file = output_path / "index.html"
+    index_file = output_path / INDEX_NAME
+    cache = RenderCache.load(root)
+    md_key = markdown_key(md_content)
+    key = digest(md_key, writer.key)
+    if cache.is_current(output_file, key) and index_file.exists():
+        logger.info(f"{output_file} is up to date")
+        return output_file
     
     # Convert README
     logger.info("Converting README to HTML")
-    with readme_path.open() as f:
-        md_content = f.read()
-        html_content = markdown2.markdown(
-            md_content,
-            extras=['fenced-code-blocks', 'tables', 'header-ids']
-        )
-    
-    # Generate final HTML
-    logger.debug("Generating final HTML")
-    final_html = template.replace('{{content}}', html_content)
+    with phase("render"):
+        converted = cache.converted(md_key)
+        if converted is None:
+            converted = convert(md_content)
+            cache.store(md_key, *converted)
+        html_content, sections = converted
     
     # Write output
-    output_file = output_path / "index.html"
     logger.info(f"Writing site to: {output_file}")
-    with output_file.open('w') as f:
-        f.write(final_html)
+    with phase("render"):
+        writer.write(output_file, content=html_content, nav="", root="")
+    writer.write_data(index_file, build_index([("./", "Home", sections)]))
+    writer.finish()
+    cache.record(output_file, key, md_key)
+    cache.save()
     
     logger.success("Site generation complete")
+    return output_file
 
 if __name__ == "__main__":
     build_site()
@@ -0,0 +1,168 @@
+"""Optional optimization of site output: shared CSS asset, minification, gzip."""
+import gzip
+import hashlib
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from project_utils.outputs import write_if_changed
+
+ASSETS_DIR = "assets"
+STYLESHEET_PREFIX = "site."
+
+STYLE = re.compile(r'[ \t]*<style>(.*?)</style>\s*', re.S)
+# Elements whose content is kept as it is, apart from indentation in scripts
+PRESERVED = re.compile(r'(<(pre|textarea|script)\b.*?</\2\s*>)', re.S | re.I)
+COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+
+# Suffixes of files that get a precompressed .gz sibling
+COMPRESSED_SUFFIXES = {".html", ".css", ".json"}
+
+
+def minify_css(css: str) -> str:
+    """Remove comments and whitespace that does not affect a stylesheet."""
+    css = CSS_COMMENT.sub('', css)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_html(html: str) -> str:
+    """Remove comments and indentation and collapse whitespace runs.
+
+    A whitespace run containing a line break becomes one line break and
+    any other run one space, so inline text renders as before. The
+    content of ``pre`` and ``textarea`` elements is left untouched and
+    scripts only lose their indentation.
+
+    Args:
+        html: Page to minify
+
+    Returns:
+        Minified page
+    """
+    parts = PRESERVED.split(html)
+    minified = []
+    # split yields text, then each preserved element followed by its tag name
+    for i in range(0, len(parts), 3):
+        text = COMMENT.sub('', parts[i])
+        text = re.sub(r'[ \t]*\n\s*', '\n', text)
+        minified.append(re.sub(r'[ \t]{2,}', ' ', text))
+        if i + 1 < len(parts):
+            element = parts[i + 1]
+            if parts[i + 2].lower() == 'script':
+                element = re.sub(r'\n[ \t]+', '\n', element)
+            minified.append(element)
+    return ''.join(minified).strip() + '\n'
+
+
+def remove_stylesheets(output_path: Path, keep: Optional[str] = None) -> None:
+    """Remove hashed stylesheets and their ``.gz`` siblings left by earlier builds.
+
+    Args:
+        output_path: Directory the site is written to
+        keep: Name of the stylesheet the current build links, if any
+    """
+    assets = output_path / ASSETS_DIR
+    for old in assets.glob(f"{STYLESHEET_PREFIX}*.css*"):
+        if keep is None or old.name not in (keep, keep + ".gz"):
+            old.unlink()
+    if keep is None and assets.is_dir() and not any(assets.iterdir()):
+        assets.rmdir()
+
+
+def compress(data: bytes) -> bytes:
+    """Gzip data reproducibly, with no timestamp or file name in the header."""
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+@dataclass
+class SizeReport:
+    """Bytes written by the optimization stage, before and after."""
+    files: int = 0
+    original: int = 0
+    optimized: int = 0
+    compressed: int = 0
+
+    def add(self, original: int, optimized: int, compressed: int) -> None:
+        """Count one optimized file."""
+        self.files += 1
+        self.original += original
+        self.optimized += optimized
+        self.compressed += compressed
+
+    def summary(self) -> str:
+        """Describe the savings in one line."""
+        saved = 1 - self.optimized / self.original if self.original else 0.0
+        return (
+            f"Optimized {self.files} files: {self.original} -> {self.optimized} bytes "
+            f"({saved:.0%} smaller), {self.compressed} bytes gzipped"
+        )
+
+
+class Optimizer:
+    """Writes site files minified and with precompressed siblings.
+
+    Usage::
+
+        optimizer = Optimizer(Path("_site"))
+        template_text = optimizer.extract_styles(template_text)
+        optimizer.write(Path("_site/index.html"), page, original_size)
+        logger.info(optimizer.report.summary())
+    """
+
+    def __init__(self, output_path: Path):
+        """Initialize for a site directory.
+
+        Args:
+            output_path: Directory the site is written to
+        """
+        self.output_path = output_path
+        self.report = SizeReport()
+
+    def extract_styles(self, template_text: str) -> str:
+        """Move a template's inline styles into one content-hashed stylesheet.
+
+        The stylesheet is named after its hash, so browsers can cache it
+        for good; stylesheets from earlier builds are removed.
+
+        Args:
+            template_text: Template with ``<style>`` blocks
+
+        Returns:
+            Template linking the stylesheet relative to ``{{root}}``, or
+            the template unchanged if it has no styles
+        """
+        blocks = STYLE.findall(template_text)
+        if not blocks:
+            remove_stylesheets(self.output_path)
+            return template_text
+        css = minify_css('\n'.join(blocks))
+        name = f"{STYLESHEET_PREFIX}{hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]}.css"
+        assets = self.output_path / ASSETS_DIR
+        self.write(assets / name, css, len(''.join(blocks).encode('utf-8')))
+        remove_stylesheets(self.output_path, keep=name)
+
+        link = f'<link rel="stylesheet" href="{{{{root}}}}{ASSETS_DIR}/{name}">\n'
+        first = STYLE.search(template_text)
+        return template_text[:first.start()] + link + STYLE.sub('', template_text[first.start():])
+
+    def write(self, path: Path, content: str, original: Optional[int] = None) -> None:
+        """Write a site file minified, plus a ``.gz`` sibling.
+
+        Args:
+            path: File to write
+            content: Content before minification of HTML
+            original: Size of the unoptimized file in bytes, for the report;
+                defaults to the size of content
+        """
+        if path.suffix == ".html":
+            content = minify_html(content)
+        data = content.encode('utf-8')
+        write_if_changed(path, data)
+        compressed = compress(data)
+        if path.suffix in COMPRESSED_SUFFIXES:
+            write_if_changed(path.with_name(path.name + ".gz"), compressed)
+        self.report.add(len(data) if original is None else original, len(data), len(compressed))
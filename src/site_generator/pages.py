@@ -0,0 +1,267 @@
+"""Multi-page site built from every README and the special summaries."""
+import html
+import os
+import posixpath
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from project_utils.context import get_project_context
+from project_utils.path_filter import get_path_filter
+from project_utils.report import count, phase
+
+from .cache import RenderCache, digest
+from .generator import PageWriter, convert, get_project_root, markdown_key
+from .search import INDEX_NAME, Section, build_index
+
+# Used when pyproject.toml has no [tool.site] ignore_patterns
+DEFAULT_IGNORE_PATTERNS = (
+    ".git", ".venv", "venv", "node_modules", "__pycache__", "*.egg-info",
+    ".pytest_cache", ".summary_cache", ".readme_cache", ".site_cache", "_site",
+)
+
+SUMMARIES_DIR = "SUMMARIES"
+
+# Chunks per worker process, so uneven page sizes still balance out
+CHUNKS_PER_JOB = 4
+
+# Fewer pages than this are converted in-process; starting workers would cost more
+MIN_PARALLEL_PAGES = 8
+
+# Relative links in rendered HTML, split into target and fragment
+LINK = re.compile(r'href="(?![a-zA-Z][\w+.-]*:|/|#)([^"#]*)(#[^"]*)?"')
+
+CURRENT = ' aria-current="page"'
+
+
+@dataclass(frozen=True)
+class Page:
+    """A markdown source and where its HTML goes, both relative to their roots."""
+    source: PurePosixPath
+    output: PurePosixPath
+    title: str
+
+
+def page_output(source: PurePosixPath) -> PurePosixPath:
+    """Map a source to its page: READMEs become ``index.html`` of their directory."""
+    if source.name == "README.md":
+        return source.parent / "index.html"
+    return source.with_suffix(".html")
+
+
+def find_sources(root: Path, ignore_patterns: Sequence[str]) -> List[PurePosixPath]:
+    """Find every included README.md plus the markdown files in SUMMARIES/.
+
+    Args:
+        root: Project root
+        ignore_patterns: ``.gitignore``-style patterns of paths to skip
+
+    Returns:
+        Root-relative sources: the root README first, then the other
+        READMEs and then the summaries, each sorted by path
+    """
+    path_filter = get_path_filter(tuple(ignore_patterns))
+    readmes, summaries = [], []
+    with phase("scan"):
+        for directory, dirnames, filenames in os.walk(root):
+            relative = PurePosixPath(Path(directory).relative_to(root).as_posix())
+            dirnames[:] = sorted(
+                name for name in dirnames
+                if path_filter.is_included((*relative.parts, name), is_dir=True)
+            )
+            if "README.md" in filenames and path_filter.is_included((*relative.parts, "README.md")):
+                readmes.append(relative / "README.md")
+            if relative == PurePosixPath(SUMMARIES_DIR):
+                summaries.extend(relative / name for name in filenames if name.endswith(".md"))
+    count("scan", files=len(readmes) + len(summaries))
+    readmes.sort(key=lambda source: (len(source.parts) > 1, source))
+    return readmes + sorted(summaries)
+
+
+def page_title(source: PurePosixPath, md_content: str) -> str:
+    """Get a page's title from its first top-level heading, or its path."""
+    in_code = False
+    for line in md_content.splitlines():
+        if line.startswith("```"):
+            in_code = not in_code
+        elif not in_code and line.startswith("# ") and line[2:].strip():
+            return line[2:].strip()
+    if source.name != "README.md":
+        return source.stem
+    return "Home" if source.parent == PurePosixPath(".") else source.parent.as_posix()
+
+
+def relative_href(page: PurePosixPath, target: PurePosixPath) -> str:
+    """Link from one page to another by a relative URL."""
+    href = posixpath.relpath(target.as_posix(), page.parent.as_posix())
+    return href[:-len("index.html")] or "./" if target.name == "index.html" else href
+
+
+def relative_root(page: PurePosixPath) -> str:
+    """Prefix leading from a page to the site root, empty for top-level pages."""
+    return "../" * (len(page.parts) - 1)
+
+
+def convert_all(sources: List[str], jobs: int = 1) -> Iterator[Tuple[str, List[Section]]]:
+    """Convert markdown to HTML and search sections, optionally across processes.
+
+    Args:
+        sources: Markdown of each page
+        jobs: Number of worker processes; 1 runs in-process, less than 1
+            uses every CPU. Never more processes than chunks of pages are
+            started, and fewer than ``MIN_PARALLEL_PAGES`` pages are
+            converted in-process.
+
+    Yields:
+        HTML and search sections of each page, in input order
+    """
+    jobs = jobs if jobs >= 1 else os.cpu_count() or 1
+    if jobs == 1 or len(sources) < MIN_PARALLEL_PAGES:
+        yield from map(convert, sources)
+        return
+    chunk_size = max(1, -(-len(sources) // (jobs * CHUNKS_PER_JOB)))
+    workers = min(jobs, -(-len(sources) // chunk_size))
+    logger.debug(f"Rendering {len(sources)} pages in chunks of {chunk_size} over {workers} processes")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map preserves input order, keeping the output deterministic
+        yield from executor.map(convert, sources, chunksize=chunk_size)
+
+
+class Navigation:
+    """Links to every page, rendered for each page's position in the site."""
+
+    def __init__(self, pages: List[Page]):
+        """Initialize for the site's pages, in navigation order."""
+        self.pages = pages
+        self._titles = [html.escape(page.title) for page in pages]
+        self._hrefs: Dict[PurePosixPath, List[str]] = {}
+
+    def render(self, current: Page) -> str:
+        """Render the navigation list with the current page marked."""
+        # Pages in the same directory share their relative links
+        directory = current.output.parent
+        if directory not in self._hrefs:
+            self._hrefs[directory] = [
+                html.escape(relative_href(current.output, page.output)) for page in self.pages
+            ]
+        items = [
+            f'<li><a href="{href}"{CURRENT if page is current else ""}>{title}</a></li>'
+            for page, href, title in zip(self.pages, self._hrefs[directory], self._titles)
+        ]
+        return '<ul>' + ''.join(items) + '</ul>'
+
+
+def rewrite_links(page: Page, html_content: str, outputs: Dict[PurePosixPath, PurePosixPath]) -> str:
+    """Point relative links to markdown sources at the pages built from them."""
+    def replace(match: re.Match) -> str:
+        target, fragment = match.group(1), match.group(2) or ""
+        resolved = PurePosixPath(posixpath.normpath(posixpath.join(page.source.parent.as_posix(), target)))
+        output = outputs.get(resolved) or outputs.get(resolved / "README.md")
+        if output is None:
+            return match.group(0)
+        return f'href="{relative_href(page.output, output)}{fragment}"'
+    return LINK.sub(replace, html_content)
+
+
+def build_pages(
+    output_dir: Optional[str] = None,
+    root: Optional[Path] = None,
+    jobs: int = 0,
+    optimize: bool = False
+) -> List[Path]:
+    """Build a page for every README.md and SUMMARIES/*.md file.
+
+    Markdown is converted in a process pool; the template is parsed once
+    and filled in for each page together with the navigation. A search
+    index of every page's sections is written as ``search.json``. Only pages
+    whose source, template or site structure changed are rebuilt, and
+    converted markdown is reused from ``.site_cache/`` where possible, so
+    an unchanged site touches no files.
+
+    Args:
+        output_dir: Directory for site output. Defaults to '_site'.
+        root: Project root. Defaults to the project containing this package.
+        jobs: Number of rendering processes; less than 1 uses every CPU
+        optimize: Move the template's styles into a hashed stylesheet,
+            minify pages and write precompressed ``.gz`` siblings
+
+    Returns:
+        Paths of all pages, whether rebuilt or not
+    """
+    root = root or get_project_root()
+    output_path = Path(output_dir or "_site")
+    template_path = root / "docs" / "site" / "template.html"
+    if not template_path.exists():
+        logger.error(f"Template not found: {template_path}")
+        raise FileNotFoundError(f"Template not found: {template_path}")
+    writer = PageWriter.load(template_path, output_path, optimize)
+
+    patterns = get_project_context(root).tool_config("site").get("ignore_patterns", DEFAULT_IGNORE_PATTERNS)
+    if output_path.absolute().is_relative_to(root.absolute()):
+        patterns = [*patterns, "/" + output_path.absolute().relative_to(root.absolute()).as_posix()]
+    sources = find_sources(root, patterns)
+    logger.info(f"Building {len(sources)} pages")
+
+    with phase("read"):
+        contents = [(root / source).read_text(encoding="utf-8") for source in sources]
+    count("read", files=len(contents), bytes_read=sum(map(len, contents)))
+    pages = [
+        Page(source, page_output(source), page_title(source, content))
+        for source, content in zip(sources, contents)
+    ]
+    outputs = {page.source: page.output for page in pages}
+    navigation = Navigation(pages)
+
+    # Navigation and rewritten links depend on every page's location and title
+    structure = digest(*(f"{page.source}\n{page.output}\n{page.title}" for page in pages))
+    cache = RenderCache.load(root)
+    md_keys = [markdown_key(content) for content in contents]
+    keys = [digest(md_key, writer.key, structure) for md_key in md_keys]
+    stale = [
+        i for i, (page, key) in enumerate(zip(pages, keys))
+        if not cache.is_current(output_path / page.output, key)
+    ]
+    logger.info(f"{len(pages) - len(stale)} pages up to date, {len(stale)} to build")
+
+    # Skipped pages still contribute their cached sections to the search index
+    converted = {md_key: cache.converted(md_key) for md_key in md_keys}
+    missing = [md_key for md_key, entry in converted.items() if entry is None]
+    with phase("render"):
+        sources_by_key = dict(zip(md_keys, contents))
+        for md_key, entry in zip(missing, convert_all([sources_by_key[key] for key in missing], jobs)):
+            converted[md_key] = entry
+            cache.store(md_key, *entry)
+
+    for i in stale:
+        page = pages[i]
+        output_file = output_path / page.output
+        with phase("render"):
+            writer.write(
+                output_file,
+                content=rewrite_links(page, converted[md_keys[i]][0], outputs),
+                nav=navigation.render(page),
+                root=relative_root(page.output)
+            )
+        cache.record(output_file, keys[i], md_keys[i])
+
+    writer.write_data(output_path / INDEX_NAME, build_index([
+        (relative_href(PurePosixPath("index.html"), page.output), page.title, converted[md_key][1])
+        for page, md_key in zip(pages, md_keys)
+    ]))
+
+    # Remove pages whose sources are gone
+    written = [output_path / page.output for page in pages]
+    removed = set(cache.outputs_under(output_path)) - {path.absolute() for path in written}
+    for output_file in removed:
+        output_file.unlink(missing_ok=True)
+        output_file.with_name(output_file.name + ".gz").unlink(missing_ok=True)
+    cache.forget(removed)
+    cache.save()
+    writer.finish()
+
+    logger.success(f"Built {len(stale)} of {len(written)} pages in {output_path}")
+    return written
@@ -0,0 +1,84 @@
+"""Prebuilt inverted index for client-side search of the site."""
+import html
+import json
+import re
+from typing import Dict, List, Sequence, Tuple
+
+INDEX_NAME = "search.json"
+INDEX_VERSION = 2
+
+# Headings with the ids markdown2's header-ids extra adds
+HEADING = re.compile(r'<h[1-6] id="([^"]*)">(.*?)</h[1-6]>', re.S)
+TAG = re.compile(r'<[^>]+>')
+# Unicode letters, digits and underscores, as the template's /[\p{L}\p{N}_]{2,}/gu finds them
+TERM = re.compile(r'\w{2,}')
+
+# (anchor, heading text, terms) of each part of a page; the part before the first heading has no anchor
+Section = Tuple[str, str, List[str]]
+
+
+def terms(text: str) -> List[str]:
+    """Split text into distinct lowercase terms, in order of first use."""
+    return list(dict.fromkeys(TERM.findall(text.lower())))
+
+
+def _text(fragment: str) -> str:
+    return html.unescape(TAG.sub(" ", fragment))
+
+
+def extract_sections(html_content: str) -> List[Section]:
+    """Split converted markdown at its headings and collect each part's terms.
+
+    Args:
+        html_content: HTML converted with the header-ids extra
+
+    Returns:
+        Sections in page order, skipping a leading part without text
+    """
+    sections: List[Section] = []
+    anchor, heading, start = "", "", 0
+    for match in HEADING.finditer(html_content):
+        body = _text(html_content[start:match.start()])
+        if anchor or body.strip():
+            sections.append((anchor, heading, terms(heading + " " + body)))
+        anchor, heading, start = match.group(1), " ".join(_text(match.group(2)).split()), match.end()
+    body = _text(html_content[start:])
+    if anchor or body.strip():
+        sections.append((anchor, heading, terms(heading + " " + body)))
+    return sections
+
+
+def build_index(pages: Sequence[Tuple[str, str, List[Section]]]) -> str:
+    """Build the search index as compact JSON.
+
+    ``pages`` lists each page's URL and title and ``sections`` each
+    section's page number, anchor and heading. ``terms`` lists every term
+    in the order of JavaScript string comparison, so the search box can
+    find all terms with a prefix by binary search, and ``postings`` holds
+    the sorted numbers of the sections containing each term.
+
+    Args:
+        pages: URL relative to the site root, title and sections of each page
+
+    Returns:
+        Serialized index
+    """
+    page_list, section_list = [], []
+    postings: Dict[str, List[int]] = {}
+    for page_number, (url, title, sections) in enumerate(pages):
+        page_list.append([url, title])
+        for anchor, heading, section_terms in sections:
+            section_number = len(section_list)
+            section_list.append([page_number, anchor, heading])
+            for term in section_terms:
+                postings.setdefault(term, []).append(section_number)
+    # UTF-16 code units order strings the way JavaScript compares them
+    ordered = sorted(postings, key=lambda term: term.encode('utf-16-be'))
+    data = {
+        "version": INDEX_VERSION,
+        "pages": page_list,
+        "sections": section_list,
+        "terms": ordered,
+        "postings": [postings[term] for term in ordered],
+    }
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
@@ -6,5 +6,6 @@ __version__ = "0.1.0"
 
 # Re-export main functionality
 from .generator import SummaryGenerator
+from .pack import PackReader
 
-__all__ = ["SummaryGenerator"]
+__all__ = ["PackReader", "SummaryGenerator"]
@@ -1,112 +1,175 @@
-import subprocess
+"""CLI entry point for summary generator."""
+import sys
 from pathlib import Path
 from typing import Optional
-
-def commit_and_push(
-    message: str,
-    branch: str,
-    paths: list[str | Path],
-    base_branch: Optional[str] = None,
-    force: bool = False
-) -> None:
-    """Commit changes and push to specified branch.
-    
-    Args:
-        message: Commit message
-        branch: Branch to push to
-        paths: List of paths to commit
-        base_branch: Optional base branch to create new branch from
-        force: If True, create fresh branch and force push (for generated content)
-    """
-    # Convert paths to strings
-    path_strs = [str(p) for p in paths]
-    
-    # Set up git config
-    subprocess.run(["git", "config", "--local", "user.email", "github-actions[bot]@users.noreply.github.com"])
-    subprocess.run(["git", "config", "--local", "user.name", "github-actions[bot]"])
-    
-    if force:
-        # Create fresh branch from base_branch or HEAD
-        base = base_branch or "HEAD"
-        logger.info(f"Creating fresh branch {branch} from {base}")
-        subprocess.run(["git", "checkout", "-B", branch, base])
-    else:
-        # Normal branch handling
-        if base_branch:
-            logger.info(f"Creating new branch {branch} from {base_branch}")
-            subprocess.run(["git", "checkout", "-b", branch, base_branch])
-        else:
-            logger.info(f"Switching to branch {branch}")
-            subprocess.run(["git", "checkout", "-b", branch])
-            subprocess.run(["git", "pull", "origin", branch], capture_output=True)
-    
-    # Stage and commit changes
-    subprocess.run(["git", "add", *path_strs])
-    
-    # Only commit if there are changes
-    result = subprocess.run(
-        ["git", "diff", "--staged", "--quiet"],
-        capture_output=True
-    )
-    if result.returncode == 1:  # Changes exist
-        logger.info("Committing changes")
-        subprocess.run(["git", "commit", "-m", message])
-        
-        # Push changes
-        if force:
-            logger.info(f"Force pushing {branch} branch")
-            subprocess.run(["git", "push", "-f", "origin", branch])
-        else:
-            logger.info("Pushing changes")
-            subprocess.run(["git", "push", "origin", branch])
-    else:
-        logger.info("No changes to commit")
-
-
-"""CLI entry point for summary generator."""
 import fire
 from loguru import logger
-from pathlib import Path
+from project_utils.git import commit_and_push
+from project_utils.profiling import profiling
+from project_utils.report import phase, reporting
 from . import generator
-#from readme_generator.utils import commit_and_push
 from . import special_summaries
+from .changes import affected_directories, changed_files
+from .manifest import CACHE_DIR
+from .signature_cache import SignatureCache
+from .watch import WatchSession, watch as watch_session
 
+OUTPUT_FORMATS = ("files", "pack", "both")
 
-def generate(root_dir: str = ".", push: bool = True) -> list[Path]:
+
+def generate(
+    root_dir: str = ".",
+    push: bool = True,
+    incremental: bool = True,
+    since: Optional[str] = None,
+    jobs: int = 1,
+    no_cache: bool = False,
+    clear_cache: bool = False,
+    streaming: bool = False,
+    layout: str = "linked",
+    output_format: str = "files",
+    report: Optional[str] = None,
+    profile: bool | str = False,
+    profile_top: int = 0
+) -> list[Path]:
     """Generate directory summaries and special summaries.
     
     Args:
         root_dir: Root directory to generate summaries for
         push: Whether to commit and push changes
+        incremental: Only rebuild summaries whose inputs changed since the last run
+        since: Git ref; if given, only summaries affected by files changed
+            since this ref are regenerated. Everything is regenerated when
+            the summaries of an earlier incremental run are not on disk.
+        jobs: Number of processes parsing Python files and of threads
+            reading inputs and writing summaries; 0 picks a default for each
+        no_cache: Parse every Python file instead of using the signature cache
+        clear_cache: Empty the signature cache before generating
+        streaming: Stream file bodies into SUMMARY files to bound memory use
+        layout: "linked" inlines each directory's own files and links to the
+            SUMMARY files below it; "inline" inlines every file beneath it
+        output_format: "files" writes a SUMMARY per directory, "pack" writes
+            SUMMARIES/pack.bin with a pack.json offset index instead, and
+            "both" writes both
+        report: Path of a JSON file to write per-phase timings and counters to
+        profile: Write a cProfile ``.pstats`` file and collapsed stacks;
+            pass a path or use ``profile.pstats``
+        profile_top: Print this many of the hottest functions
         
     Returns:
         List of paths to generated summary files
     """
-    logger.info(f"Generating summaries for {root_dir}")
-    
-    # Generate regular directory summaries
-    gen = generator.SummaryGenerator(root_dir)
-    summary_files = gen.generate_all_summaries()
-    
-    # Generate special summaries
-    special_files = special_summaries.generate_special_summaries(root_dir)
-    all_files = summary_files + special_files
-    
-    if push:
-        logger.info("Committing and pushing changes")
-        commit_and_push(
-            message="Update directory summaries and special summaries",
-            branch="summaries",
-            paths=all_files,
-            base_branch="main",
-            force=True  # Use force push for generated content
+    with reporting(report, "summary_generator"), profiling(profile, profile_top):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format {output_format!r}, expected one of {OUTPUT_FORMATS}")
+        logger.info(f"Generating summaries for {root_dir}")
+        cache = SignatureCache(Path(root_dir) / CACHE_DIR / "signatures")
+        if clear_cache:
+            cache.clear()
+        if no_cache:
+            cache = None
+        
+        gen = generator.SummaryGenerator(
+            root_dir, incremental=incremental, streaming=streaming, layout=layout,
+            jobs=jobs
         )
+        
+        changed = None
+        summary_files = []
+        if since is not None:
+            if output_format != "pack" and not gen.has_earlier_outputs():
+                # Committing only the affected summaries would drop the rest from the branch
+                logger.info(f"Summaries of an earlier run are missing, ignoring --since {since}")
+            else:
+                changed = changed_files(since, root_dir)
+                logger.info(f"{len(changed)} files changed since {since}")
+        if output_format != "pack":
+            if changed is None:
+                # Generate regular directory summaries
+                summary_files = gen.generate_all_summaries()
+            else:
+                # Regenerate only the ancestors of files changed since the ref
+                summary_files = gen.generate_summaries(affected_directories(changed, root_dir))
+        if output_format != "files":
+            summary_files += gen.generate_pack()
+        
+        # Generate special summaries from the same scan and file contents
+        special_files = special_summaries.generate_special_summaries(
+            root_dir, incremental=incremental, changed=changed, jobs=jobs, cache=cache,
+            summaries=gen
+        )
+        all_files = summary_files + special_files
+        
+        if push:
+            logger.info("Committing and pushing changes")
+            committed = all_files
+            if changed is not None:
+                # The branch is rebuilt from main, so it needs every output,
+                # not just the ones this run regenerated
+                committed = sorted({
+                    *all_files,
+                    *(gen.summary_paths() if output_format != "pack" else []),
+                    *special_summaries.special_summary_paths(root_dir)
+                })
+            with phase("git"):
+                result = commit_and_push(
+                    committed,
+                    message="Update directory summaries and special summaries",
+                    branch="summaries",
+                    base_branch="main",
+                    force=True,  # Use force push for generated content
+                    root=root_dir
+                )
+            logger.debug(f"git timings: {result.timings}")
+        
+        return all_files
+
+def watch(
+    root_dir: str = ".",
+    interval: float = 0.5,
+    debounce: float = 0.2,
+    readme: bool = True,
+    site: bool = True,
+    site_dir: str = "_site",
+    jobs: int = 1,
+    streaming: bool = False,
+    layout: str = "linked"
+) -> None:
+    """Keep summaries, README.md and the site up to date until interrupted.
+    
+    The tree is polled by comparing file stats; nothing is committed.
     
-    return all_files
+    Args:
+        root_dir: Root directory to generate summaries for
+        interval: Seconds between polls while nothing changes
+        debounce: Seconds without further changes before rebuilding
+        readme: Regenerate README.md when its templates or pyproject.toml change
+        site: Rebuild the site when README.md or the site template changes
+        site_dir: Output directory of the site
+        jobs: Number of processes parsing Python files and of I/O threads
+        streaming: Stream file bodies into SUMMARY files
+        layout: "linked" or "inline" SUMMARY layout
+    """
+    session = WatchSession(
+        root_dir, readme=readme, site=site, site_dir=site_dir,
+        jobs=jobs, streaming=streaming, layout=layout
+    )
+    try:
+        watch_session(session, interval=interval, debounce=debounce)
+    except KeyboardInterrupt:
+        logger.info("Stopped watching")
+
+COMMANDS = {"generate": generate, "watch": watch}
 
-def main():
-    """CLI entry point."""
-    fire.Fire(generate)
+def main(argv: Optional[list[str]] = None):
+    """CLI entry point.
+    
+    Without a subcommand, arguments go to ``generate`` as they always have.
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in COMMANDS:
+        argv = ["generate", *argv]
+    fire.Fire(COMMANDS, command=argv)
 
 if __name__ == "__main__":
     main()
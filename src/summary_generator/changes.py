@@ -0,0 +1,68 @@
+"""Map git changes since a ref to the summaries they affect."""
+import subprocess
+from pathlib import Path
+from typing import Iterable, List, Set
+from loguru import logger
+
+# Generated files, which show up as untracked wherever they are not committed
+OUTPUT_NAMES = {"SUMMARY", "SUMMARIES"}
+
+
+def _git_paths(root_dir: Path, *args: str) -> List[str]:
+    """Run a git command printing NUL-separated paths and return them."""
+    result = subprocess.run(
+        ["git", "-C", str(root_dir), *args],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        logger.error(f"git {args[0]} failed: {result.stderr.strip()}")
+        raise RuntimeError(f"git {args[0]} failed in {root_dir}")
+    return [path for path in result.stdout.split("\0") if path]
+
+
+def changed_files(since: str, root_dir: str | Path = ".") -> List[Path]:
+    """List files changed between a git ref and the working tree.
+
+    Paths are read NUL-separated, so git does not quote unusual names.
+
+    Args:
+        since: Git ref to diff against
+        root_dir: Root directory; paths outside it are ignored
+
+    Returns:
+        Changed paths (including deleted ones) and untracked files that
+        are not ignored, under root_dir
+    """
+    root_dir = Path(root_dir)
+    try:
+        changed = _git_paths(root_dir, "diff", "-z", "--name-only", "--relative", since, "--")
+    except RuntimeError:
+        raise RuntimeError(f"Could not list changes since {since}")
+    untracked = [
+        path for path in _git_paths(root_dir, "ls-files", "-z", "--others", "--exclude-standard")
+        if OUTPUT_NAMES.isdisjoint(Path(path).parts)
+    ]
+    return [root_dir / path for path in dict.fromkeys([*changed, *untracked])]
+
+
+def affected_directories(paths: Iterable[Path], root_dir: str | Path) -> Set[Path]:
+    """Collect every directory between the changed paths and the root.
+
+    Args:
+        paths: Changed file paths under root_dir
+        root_dir: Root directory
+
+    Returns:
+        Set of directories whose summaries may include the changed paths
+    """
+    root_dir = Path(root_dir)
+    directories = set()
+    for path in paths:
+        for parent in path.parents:
+            if parent in directories:
+                break
+            directories.add(parent)
+            if parent == root_dir:
+                break
+    return directories
@@ -1,18 +1,100 @@
 """Core summary generation functionality."""
+import os
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from loguru import logger
+from project_utils import report
+from project_utils.context import get_project_context
+from project_utils.path_filter import PathFilter
+from project_utils.outputs import write_atomic
+from .io_pool import IOMap, io_pool
+from .layout import INLINE, LAYOUTS, LINKED, SubdirectoryLink, format_links, nearest_descendants
+from .limits import FileLimits
+from .manifest import CACHE_DIR, DirectoryRecord, Manifest
+from .pack import write_pack
+from .python_summary import is_summarized_python_file
+from .scanner import FileIndex, scan_tree
+from .writer import StreamingSummaryWriter
 
 class SummaryGenerator:
     """Generate summary files for each directory in the project."""
     
-    def __init__(self, root_dir: str | Path):
+    # Skip common files we don't want to summarize
+    EXCLUDED_FILES = {
+        '.git', '.gitignore', '.pytest_cache', '__pycache__',
+        'SUMMARY', '.coverage', '.env', '.venv', '.idea', '.vscode',
+        CACHE_DIR
+    }
+    EXCLUDED_DIRS = {
+        '.git', '__pycache__', '.pytest_cache',
+        '.venv', '.idea', '.vscode'
+    }
+    TEXT_EXTENSIONS = {'.py', '.md', '.txt', '.yml', '.yaml', '.toml', 
+                       '.json', '.html', '.css', '.js', '.j2'}
+    # Skip .github/workflows directory at any depth
+    EXCLUDED_PATTERNS = ['**/.github/workflows']
+    # Indexed for the special summaries even where other files are excluded:
+    # every README, and the Python files PYTHON.md selects by its own rules
+    README_NAME = 'README.md'
+    
+    def __init__(
+        self,
+        root_dir: str | Path,
+        incremental: bool = True,
+        streaming: bool = False,
+        ignore_patterns: Optional[Iterable[str]] = None,
+        limits: Optional[FileLimits] = None,
+        layout: str = LINKED,
+        jobs: int = 1
+    ):
         """Initialize generator with root directory.
         
         Args:
             root_dir: Root directory to generate summaries for
+            incremental: Reuse summaries whose inputs are unchanged since the
+                last run, as recorded in the content-hash manifest
+            streaming: Copy file bodies straight into SUMMARY files instead
+                of building each summary in memory
+            ignore_patterns: Extra exclusion patterns; defaults to
+                ``[tool.summary] ignore_patterns`` from the project's pyproject.toml
+            limits: Per-file size caps; defaults to ``[tool.summary]
+                max_file_bytes`` and ``max_file_bytes_by_suffix``
+            layout: ``"linked"`` inlines only each directory's own files and
+                lists the nearest SUMMARYs below it; ``"inline"`` inlines
+                every file beneath the directory
+            jobs: Number of threads reading inputs and writing summaries;
+                less than 1 picks a default for I/O
         """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout {layout!r}, expected one of {LAYOUTS}")
         self.root_dir = Path(root_dir)
+        self.layout = layout
+        self.incremental = incremental
+        self.streaming = streaming
+        self.jobs = jobs
+        if ignore_patterns is None or limits is None:
+            config = get_project_context(self.root_dir).tool_config("summary")
+            if ignore_patterns is None:
+                ignore_patterns = config.get("ignore_patterns", [])
+            if limits is None:
+                limits = FileLimits.from_config(config)
+        self.limits = limits
+        extra = [*self.EXCLUDED_PATTERNS, *ignore_patterns]
+        self.file_filter = PathFilter(
+            [*sorted(self.EXCLUDED_FILES), *extra], root=self.root_dir
+        )
+        self.directory_filter = PathFilter(
+            [*sorted(self.EXCLUDED_DIRS), *extra], root=self.root_dir
+        )
+        self._index: Optional[FileIndex] = None
+        # Set while the index covers only the subtrees of a --since run
+        self._partial = False
+        self._descendants: Optional[Dict[Path, List[Path]]] = None
+        # Set while the index holds only the affected directories' own files;
+        # the rest of the tree comes from the manifest's directory records
+        self._totals: Optional[Dict[Path, Tuple[int, int]]] = None
+        self._summarized: Optional[Set[Path]] = None
+        self._writer = StreamingSummaryWriter(self.root_dir, self.limits)
         
     def should_include_file(self, file_path: Path) -> bool:
         """Determine if a file should be included in the summary.
@@ -23,24 +105,9 @@ class SummaryGenerator:
         Returns:
             True if file should be included in summary
         """
-        # Skip common files we don't want to summarize
-        excluded_files = {
-            '.git', '.gitignore', '.pytest_cache', '__pycache__',
-            'SUMMARY', '.coverage', '.env', '.venv', '.idea', '.vscode'
-        }
-        
-        # Skip excluded directories and files
-        if any(part in excluded_files for part in file_path.parts):
-            return False
-            
-        # Skip .github/workflows directory
-        if '.github/workflows' in str(file_path):
-            return False
-            
-        # Only include text files
-        text_extensions = {'.py', '.md', '.txt', '.yml', '.yaml', '.toml', 
-                         '.json', '.html', '.css', '.js', '.j2'}
-        return file_path.suffix in text_extensions
+        # Only include text files outside excluded directories
+        return (file_path.suffix in self.TEXT_EXTENSIONS and
+                self.file_filter.is_included(file_path))
     
     def should_include_directory(self, directory: Path) -> bool:
         """Determine if a directory should have a summary generated.
@@ -51,17 +118,83 @@ class SummaryGenerator:
         Returns:
             True if directory should have a summary
         """
-        # Skip .github/workflows directory
-        if '.github/workflows' in str(directory):
-            return False
+        return self.directory_filter.is_included(directory, is_dir=True)
+    
+    def _should_descend(self, directory: Path) -> bool:
+        """Determine if a directory can contain files to summarize.
+        
+        Args:
+            directory: Directory to check
             
-        # Skip other excluded directories
-        excluded_dirs = {
-            '.git', '__pycache__', '.pytest_cache',
-            '.venv', '.idea', '.vscode'
-        }
+        Returns:
+            False if every file beneath the directory would be excluded
+        """
+        return self.file_filter.is_included(directory, is_dir=True)
+    
+    def _get_index(self) -> FileIndex:
+        """Get the file index, scanning the tree on first use.
+        
+        Returns:
+            Index of all files to summarize
+        """
+        if self._index is None:
+            self._rescan()
+        return self._index
+    
+    @property
+    def index(self) -> FileIndex:
+        """Index of the whole tree, scanning it if needed.
+        
+        Other outputs of the same run read their inputs through this
+        index, so each file is read from disk at most once.
+        """
+        if self._index is None or self._partial:
+            self._rescan()
+        return self._index
+    
+    def refresh(self) -> None:
+        """Rescan the tree after files changed, e.g. in a long-running process.
+        
+        Content of files whose stat is unchanged stays cached.
+        """
+        self._rescan()
+    
+    def _rescan(self, directories: Optional[Iterable[Path]] = None) -> None:
+        """Replace the index with a fresh scan of the tree or some subtrees.
         
-        return not any(part in excluded_dirs for part in directory.parts)
+        Args:
+            directories: Non-overlapping subtrees to scan
+        """
+        self._index = self._scan(directories)
+        self._partial = directories is not None
+        self._descendants = None
+        self._totals = self._summarized = None
+    
+    def _scan(self, directories: Optional[Iterable[Path]] = None) -> FileIndex:
+        """Scan the whole tree, or only the given subtrees, into an index.
+        
+        Args:
+            directories: Non-overlapping subtrees to scan
+            
+        Returns:
+            Index of the files to summarize, carrying over unchanged
+            content from the previous index
+        """
+        index = scan_tree(
+            self.root_dir,
+            include_file=self.should_include_file,
+            include_directory=self._should_descend,
+            directories=directories,
+            limits=self.limits,
+            extra_file=lambda path: path.name == self.README_NAME or is_summarized_python_file(path),
+            # READMEs in excluded paths like .github/workflows still document the project
+            extra_directory=lambda path: path.name not in self.EXCLUDED_DIRS,
+            # PYTHON.md parses whole files, so capped reads of them fetch everything once
+            read_whole=is_summarized_python_file
+        )
+        if self._index is not None:
+            index.reuse(self._index)
+        return index
     
     def _collect_directories(self) -> Set[Path]:
         """Collect all directories containing files to summarize.
@@ -69,13 +202,95 @@ class SummaryGenerator:
         Returns:
             Set of directory paths
         """
-        directories = set()
-        for file_path in self.root_dir.rglob('*'):
-            if (file_path.is_file() and 
-                self.should_include_file(file_path) and
-                self.should_include_directory(file_path.parent)):
-                directories.add(file_path.parent)
-        return directories
+        if self._summarized is not None:
+            return self._summarized
+        return {
+            file_path.parent for file_path in self._get_index().files
+            if self.should_include_directory(file_path.parent)
+        }
+        
+    def summary_paths(self) -> List[Path]:
+        """Get the SUMMARY path of every summarized directory.
+        
+        Includes summaries left untouched by an incremental or ``--since``
+        run, so the set is complete after ``generate_all_summaries`` or
+        ``generate_summaries`` of the directories affected by a change.
+        
+        Returns:
+            List of SUMMARY paths in sorted order
+        """
+        return [directory / 'SUMMARY' for directory in sorted(self._collect_directories())]
+        
+    def has_earlier_outputs(self) -> bool:
+        """Check whether every SUMMARY recorded by an earlier run is on disk.
+        
+        Regenerating only the summaries affected by a change is enough only
+        when the others are already there; a fresh checkout of a branch
+        they were never committed to has none of them.
+        
+        Returns:
+            False if not incremental, with no recorded run, or with any
+            recorded SUMMARY missing
+        """
+        manifest = self._load_manifest()
+        if manifest is None or not manifest.directories:
+            return False
+        return all(
+            (self.root_dir / key / 'SUMMARY').exists()
+            for key, record in manifest.directories.items() if record.summarized
+        )
+        
+    def _summary_files(self, directory: Path) -> List[Path]:
+        """Get the files inlined into a directory's summary, in order."""
+        index = self._get_index()
+        if self.layout == INLINE:
+            return index.files_under(directory)
+        return index.files_in(directory)
+    
+    def _links(self, directory: Path) -> List[SubdirectoryLink]:
+        """Get the subdirectory summaries a linked summary refers to.
+        
+        Args:
+            directory: Directory being summarized
+            
+        Returns:
+            Links to the nearest summarized directories below it
+        """
+        if self.layout == INLINE:
+            return []
+        self._prepare_links()
+        children = self._descendants.get(directory)
+        if children is None:
+            # Not summarized itself, e.g. a directory holding only subdirectories
+            children = nearest_descendants({*self._descendants, directory})[directory]
+        links = []
+        for child in children:
+            files, size = self._subtree(child)
+            links.append(SubdirectoryLink(
+                path=(child / 'SUMMARY').relative_to(directory).as_posix(),
+                files=files,
+                size=size
+            ))
+        return links
+    
+    def _subtree(self, directory: Path) -> Tuple[int, int]:
+        """Get the number and total size of the files beneath a directory."""
+        if self._totals is not None:
+            return self._totals.get(directory, (0, 0))
+        index = self._get_index()
+        return len(index.files_under(directory)), index.size_under(directory)
+    
+    def _prepare_links(self) -> None:
+        """Build the lookups behind links up front, before threads share them."""
+        if self.layout == INLINE or self._descendants is not None:
+            return
+        self._descendants = nearest_descendants(self._collect_directories())
+        self._get_index().size_under(self.root_dir)
+    
+    def _trailer(self, directory: Path) -> str:
+        """Get the text that follows a summary's file entries."""
+        links = self._links(directory)
+        return format_links(links) if links else ''
         
     def generate_directory_summary(self, directory: Path) -> str:
         """Generate a summary for a single directory.
@@ -87,59 +302,397 @@ class SummaryGenerator:
             Generated summary text
         """
         logger.debug(f"Generating summary for {directory}")
+        with report.phase("render"):
+            return self._render_summary(directory)
+    
+    def _render_summary(self, directory: Path) -> str:
+        """Build a directory's summary text from the index."""
+        index = self._get_index()
         summary = []
         
-        # Process all files in the directory
-        for file_path in sorted(directory.rglob('*')):
-            if not file_path.is_file() or not self.should_include_file(file_path):
+        # Process the directory's files, or all files beneath it if inlined
+        for file_path in self._summary_files(directory):
+            content = index.read(file_path)
+            if content is None:
                 continue
                 
-            try:
-                # Get relative path from root for the header
-                rel_path = file_path.relative_to(self.root_dir)
-                
-                # Read file content
-                content = file_path.read_text(encoding='utf-8')
-                
-                # Add to summary with clear separation
-                summary.extend([
-                    '=' * 80,
-                    f'File: {rel_path}',
-                    '=' * 80,
-                    content,
-                    '\n'  # Extra newline for separation
-                ])
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-                
-        return '\n'.join(summary)
+            # Get relative path from root for the header
+            rel_path = file_path.relative_to(self.root_dir)
+            
+            # Add to summary with clear separation
+            summary.extend([
+                '=' * 80,
+                f'File: {rel_path}',
+                '=' * 80,
+                content,
+                '\n'  # Extra newline for separation
+            ])
+        
+        text = '\n'.join(summary)
+        trailer = self._trailer(directory)
+        if trailer:
+            text = f"{text}\n{trailer}" if summary else trailer
+        return text
+        
+    def _file_hashes(self, manifest: Manifest, io_map: IOMap = map) -> Dict[Path, Optional[str]]:
+        """Hash every indexed file, reading only files whose stat changed.
+        
+        Args:
+            manifest: Manifest holding hashes from the previous run
+            io_map: ``map`` to run the reads with, e.g. from ``io_pool``
+            
+        Returns:
+            Mapping of file path to content hash
+        """
+        index = self._get_index()
+        
+        def file_hash(file_path: Path) -> Optional[str]:
+            return manifest.file_hash(
+                file_path,
+                index.stat(file_path),
+                lambda: index.read(file_path, cache=not self.streaming)
+            )
+        
+        return dict(zip(index.files, io_map(file_hash, index.files)))
         
     def generate_all_summaries(self) -> List[Path]:
         """Generate summary files for all directories.
         
+        In incremental mode, summaries whose inputs are unchanged are left
+        untouched and summaries whose content is unchanged are not rewritten.
+        Their paths are still returned.
+        
         Returns:
             List of paths to generated summary files
         """
         logger.info("Starting summary generation")
-        summary_files = []
+        
+        # Scan the tree once; each file is read once and shared by all
+        # of its ancestors' summaries
+        self._rescan()
         
         # Collect directories
         directories = self._collect_directories()
         logger.info(f"Found {len(directories)} directories to process")
         
-        # Generate summaries
-        for directory in sorted(directories):
-            if not self.should_include_directory(directory):
+        return self._write_summaries(directories, self._load_manifest())
+    
+    def generate_pack(self, output_dir: Optional[Path] = None) -> List[Path]:
+        """Pack every file to summarize into a single file with an index.
+        
+        Args:
+            output_dir: Directory for ``pack.bin`` and ``pack.json``;
+                defaults to ``SUMMARIES/`` under the root
+            
+        Returns:
+            Paths of the pack and its index
+        """
+        output_dir = output_dir or self.root_dir / "SUMMARIES"
+        self._rescan()
+        index = self._index
+        # Leave out earlier outputs, including the pack's own index
+        files = [path for path in index.files if output_dir not in path.parents]
+        manifest = self._load_manifest()
+        inputs = None
+        if manifest is not None:
+            with io_pool(self.jobs) as io_map:
+                hashes = self._file_hashes(manifest, io_map)
+            inputs = manifest.digest(
+                ((path.relative_to(self.root_dir).as_posix(), hashes[path]) for path in files),
+                salt=f'PACK;{self.limits.key()}'
+            )
+        paths = write_pack(index, files, output_dir, manifest, inputs)
+        if manifest is not None:
+            manifest.save()
+        return paths
+    
+    def generate_summaries(self, directories: Iterable[Path]) -> List[Path]:
+        """Generate summary files for the given directories only.
+        
+        With the linked layout, an incremental manifest from an earlier run
+        and directories that include all of their ancestors up to the root
+        (as ``affected_directories`` returns them), only the files directly
+        inside the given directories are scanned; everything else below
+        them is taken from the manifest's record of the tree. Otherwise the
+        subtrees beneath the given directories are scanned. Directories
+        without files to summarize are skipped, and their SUMMARY files,
+        e.g. left behind by deleted files, are removed.
+        
+        Args:
+            directories: Directories whose summaries should be regenerated
+            
+        Returns:
+            List of paths to generated summary files
+        """
+        affected = set(directories)
+        requested = {
+            directory for directory in affected
+            if directory.is_dir() and
+            (directory == self.root_dir or self._should_descend(directory))
+        }
+        manifest = self._load_manifest()
+        if (self.layout == LINKED and manifest is not None and manifest.directories and
+                self.root_dir in affected and
+                all(directory.parent in affected
+                    for directory in affected if directory != self.root_dir)):
+            logger.info(f"Scanning {len(requested)} directories without their subdirectories")
+            self._rescan_shallow(affected, requested, manifest)
+        else:
+            # Scan only the outermost requested directories
+            subtrees = [
+                directory for directory in sorted(requested)
+                if not any(parent in requested for parent in directory.parents)
+            ]
+            logger.info(f"Scanning {len(subtrees)} subtrees for {len(requested)} directories")
+            self._rescan(subtrees)
+        
+        summarized = self._collect_directories()
+        self._remove_summaries(
+            (directory for directory in affected if directory not in summarized), manifest
+        )
+        directories = {directory for directory in summarized if directory in requested}
+        logger.info(f"Found {len(directories)} directories to process")
+        
+        return self._write_summaries(directories, manifest)
+    
+    def _remove_summaries(self, directories: Iterable[Path], manifest: Optional[Manifest]) -> None:
+        """Delete the SUMMARY files of directories that no longer have files to summarize."""
+        for directory in directories:
+            summary_path = directory / 'SUMMARY'
+            if summary_path.is_file():
+                logger.info(f"Removing summary for {directory}, which has no files left")
+                summary_path.unlink()
+            if manifest is not None:
+                manifest.outputs.pop(summary_path.relative_to(self.root_dir).as_posix(), None)
+    
+    def _rescan_shallow(
+        self,
+        affected: Set[Path],
+        existing: Set[Path],
+        manifest: Manifest
+    ) -> None:
+        """Index only the files directly inside some directories.
+        
+        The file counts and sizes beneath the affected directories are
+        rebuilt bottom-up from their own files and the recorded totals of
+        their unaffected subdirectories, which are not entered.
+        
+        Args:
+            affected: Directories whose content may have changed, including
+                every ancestor of each up to the root
+            existing: The affected directories that still exist and can
+                contain files to summarize
+            manifest: Manifest holding the tree recorded by the last run
+        """
+        index = scan_tree(
+            self.root_dir,
+            include_file=self.should_include_file,
+            include_directory=lambda path: False,
+            directories=sorted(existing),
+            limits=self.limits
+        )
+        if self._index is not None:
+            index.reuse(self._index)
+        
+        totals: Dict[Path, Tuple[int, int]] = {}
+        summarized: Set[Path] = set()
+        pending: Dict[Path, List[int]] = {}
+        for key, record in manifest.directories.items():
+            directory = self.root_dir / key
+            if directory in affected:
                 continue
-                
+            totals[directory] = (record.files, record.size)
+            if record.summarized:
+                summarized.add(directory)
+            if directory.parent in affected:
+                sums = pending.setdefault(directory.parent, [0, 0])
+                sums[0] += record.files
+                sums[1] += record.size
+        
+        # Deepest first, so each directory's subdirectories are done before it
+        for directory in sorted(affected, key=lambda path: len(path.parts), reverse=True):
+            direct = index.files_in(directory)
+            files, size = pending.get(directory, [0, 0])
+            files += len(direct)
+            size += sum(index.stat(file_path).st_size for file_path in direct)
+            if not files:
+                continue
+            totals[directory] = (files, size)
+            if direct and self.should_include_directory(directory):
+                summarized.add(directory)
+            if directory != self.root_dir:
+                sums = pending.setdefault(directory.parent, [0, 0])
+                sums[0] += files
+                sums[1] += size
+        
+        self._index = index
+        self._partial = True
+        self._descendants = None
+        self._totals = totals
+        self._summarized = summarized
+    
+    def _record_tree(self, manifest: Manifest) -> None:
+        """Record the file counts and sizes beneath every directory for later runs."""
+        if self._totals is None:
+            index = self._get_index()
+            # Only a scan from the root describes the whole tree; records
+            # of rescanned subtrees would otherwise be left stale
+            if self.root_dir not in index.spans:
+                manifest.directories = {}
+                return
+            totals = {
+                directory: (len(index.files_under(directory)), index.size_under(directory))
+                for directory in index.spans
+            }
+        else:
+            totals = self._totals
+        summarized = self._collect_directories()
+        manifest.directories = {
+            directory.relative_to(self.root_dir).as_posix(): DirectoryRecord(
+                files, size, directory in summarized
+            )
+            for directory, (files, size) in sorted(totals.items())
+            if files
+        }
+    
+    def _load_manifest(self) -> Optional[Manifest]:
+        """Load the manifest in incremental mode."""
+        return Manifest.load(self.root_dir) if self.incremental else None
+        
+    def _stream_summary(
+        self,
+        directory: Path,
+        summary_path: Path,
+        manifest: Optional[Manifest],
+        inputs: Optional[str]
+    ) -> bool:
+        """Stream a directory's summary to disk without holding it in memory.
+        
+        Args:
+            directory: Directory to summarize
+            summary_path: Path of the SUMMARY file
+            manifest: Manifest to record the output in, if incremental
+            inputs: Digest of the summary's inputs, if incremental
+            
+        Returns:
+            True if the SUMMARY file was written
+        """
+        files = self._summary_files(directory)
+        trailer = self._trailer(directory)
+        staged_path = summary_path.with_name('SUMMARY.tmp')
+        self._writer.write(files, staged_path, trailer)
+        if manifest is None:
+            os.replace(staged_path, summary_path)
+            return True
+        return manifest.commit_output(summary_path, staged_path, inputs)
+    
+    def _write_summary(
+        self,
+        directory: Path,
+        manifest: Optional[Manifest],
+        inputs: Optional[str]
+    ) -> bool | Exception:
+        """Render and atomically write one directory's summary.
+        
+        Runs on the I/O pool, so errors are returned rather than raised.
+        
+        Args:
+            directory: Directory to summarize
+            manifest: Manifest to record the output in, if incremental
+            inputs: Digest of the summary's inputs, if incremental
+            
+        Returns:
+            True if the SUMMARY file was written, False if it was unchanged,
+            or the error that stopped it
+        """
+        summary_path = directory / 'SUMMARY'
+        try:
+            if self.streaming:
+                return self._stream_summary(directory, summary_path, manifest, inputs)
             summary_content = self.generate_directory_summary(directory)
-            summary_path = directory / 'SUMMARY'
+            if manifest is not None:
+                return manifest.write_output(summary_path, summary_content, inputs)
+            data = summary_content.encode('utf-8')
+            with report.phase("write"):
+                write_atomic(summary_path, data)
+            report.count("write", files=1, bytes_written=len(data))
+            return True
+        except Exception as e:
+            return e
+    
+    def _write_summaries(self, directories: Set[Path], manifest: Optional[Manifest]) -> List[Path]:
+        """Write the summaries for a set of directories from the current index.
+        
+        Reads and writes run on a pool of ``jobs`` threads. Summaries are
+        planned and reported in sorted order, so the result does not
+        depend on which thread finishes first.
+        
+        Args:
+            directories: Directories to write summaries for
+            manifest: Manifest to check and record outputs in, if incremental
+            
+        Returns:
+            List of paths to generated summary files
+        """
+        summary_files = []
+        self._writer = StreamingSummaryWriter(self.root_dir, self.limits)
+        
+        with io_pool(self.jobs) as io_map:
+            hashes = self._file_hashes(manifest, io_map) if manifest else {}
             
-            try:
-                summary_path.write_text(summary_content, encoding='utf-8')
+            # Decide which summaries are stale before doing any work
+            plan = []
+            for directory in sorted(directories):
+                if not self.should_include_directory(directory):
+                    continue
+                
+                summary_path = directory / 'SUMMARY'
+                inputs = None
+                if manifest is not None:
+                    files = [
+                        (file_path.relative_to(self.root_dir).as_posix(), hashes[file_path])
+                        for file_path in self._summary_files(directory)
+                    ]
+                    links = [
+                        (link.path, f"{link.files}:{link.size}")
+                        for link in self._links(directory)
+                    ]
+                    inputs = manifest.digest(
+                        files + links,
+                        salt=f'SUMMARY;{self.layout};{self.limits.key()}'
+                    )
+                    if manifest.is_current(summary_path, inputs):
+                        logger.debug(f"Summary for {directory} is up to date")
+                        report.count("render", cache_hits=1)
+                        plan.append((directory, inputs, False))
+                        continue
+                    report.count("render", cache_misses=1)
+                plan.append((directory, inputs, True))
+            
+            stale = [(directory, inputs) for directory, inputs, rebuild in plan if rebuild]
+            if not self.streaming:
+                self._get_index().prefetch(
+                    (file_path for directory, _ in stale
+                     for file_path in self._summary_files(directory)),
+                    io_map
+                )
+            self._prepare_links()
+            results = io_map(lambda task: self._write_summary(task[0], manifest, task[1]), stale)
+            written = dict(zip((directory for directory, _ in stale), results))
+        
+        for directory, _, rebuild in plan:
+            if rebuild:
+                result = written[directory]
+                if isinstance(result, Exception):
+                    logger.error(f"Error writing summary for {directory}: {result}")
+                    continue
+                if not result:
+                    logger.debug(f"Summary for {directory} is unchanged")
                 logger.info(f"Generated summary for {directory}")
-                summary_files.append(summary_path)
-            except Exception as e:
-                logger.error(f"Error writing summary for {directory}: {e}")
+            summary_files.append(directory / 'SUMMARY')
+        
+        if manifest is not None:
+            self._record_tree(manifest)
+            manifest.save()
                 
         return summary_files
@@ -0,0 +1,46 @@
+"""Bounded thread pool for the file reads and writes of a run."""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+
+# Threads mostly wait on the disk, so the default runs more of them than CPUs
+MAX_IO_WORKERS = 32
+
+IOMap = Callable[[Callable, Iterable], Iterator]
+
+
+def io_workers(jobs: int) -> int:
+    """Get the number of I/O threads for a ``--jobs`` value.
+
+    Args:
+        jobs: Requested concurrency; less than 1 picks a default
+
+    Returns:
+        Number of threads to run
+    """
+    if jobs < 1:
+        return min(MAX_IO_WORKERS, (os.cpu_count() or 1) + 4)
+    return jobs
+
+
+@contextmanager
+def io_pool(jobs: int = 1) -> Iterator[IOMap]:
+    """Provide an order-preserving ``map`` backed by a bounded thread pool.
+
+    Results come back in input order however the work interleaves, so
+    output built from them stays deterministic. With one job, work runs
+    serially in the calling thread.
+
+    Args:
+        jobs: Number of threads; less than 1 picks a default for I/O
+
+    Yields:
+        Function with the signature of the builtin ``map``
+    """
+    workers = io_workers(jobs)
+    if workers == 1:
+        yield map
+        return
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary-io") as executor:
+        yield executor.map
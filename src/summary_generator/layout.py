@@ -0,0 +1,48 @@
+"""SUMMARY layouts: direct files with subdirectory links, or fully inlined."""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List
+from .writer import SEPARATOR
+
+# Each SUMMARY inlines its own files and links to the nearest SUMMARYs below
+LINKED = "linked"
+# Each SUMMARY inlines every file beneath its directory
+INLINE = "inline"
+LAYOUTS = (LINKED, INLINE)
+
+
+@dataclass(frozen=True)
+class SubdirectoryLink:
+    """Reference from a SUMMARY to a descendant directory's SUMMARY."""
+    path: str
+    files: int
+    size: int
+
+
+def nearest_descendants(directories: Iterable[Path]) -> Dict[Path, List[Path]]:
+    """Map each directory to the nearest directories of the set below it.
+
+    Directories in between that are not in the set are skipped, so every
+    directory is linked from exactly one ancestor, if it has one.
+
+    Args:
+        directories: Directories that have summaries
+
+    Returns:
+        Mapping of directory to its nearest descendants, in sorted order
+    """
+    directories = set(directories)
+    children: Dict[Path, List[Path]] = {directory: [] for directory in directories}
+    for directory in sorted(directories):
+        for parent in directory.parents:
+            if parent in directories:
+                children[parent].append(directory)
+                break
+    return children
+
+
+def format_links(links: List[SubdirectoryLink]) -> str:
+    """Format the subdirectory section appended to a linked SUMMARY."""
+    lines = [SEPARATOR, "Subdirectories", SEPARATOR]
+    lines.extend(f"- {link.path}: {link.files} files, {link.size} bytes" for link in links)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,130 @@
+"""Per-file size caps and binary detection for summarized files."""
+import codecs
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+SNIFF_BYTES = 8 * 1024
+
+
+class BinaryFileError(ValueError):
+    """Raised when a file looks binary and should not be summarized."""
+
+
+def is_binary(head: bytes) -> bool:
+    """Check whether the start of a file contains a NUL byte."""
+    return b'\0' in head[:SNIFF_BYTES]
+
+
+def truncation_marker(limit: int, size: int) -> str:
+    """Text appended to a file cut off at its size cap."""
+    return f"\n[... truncated: showing the first {limit} of {size} bytes ...]"
+
+
+def translate_newlines(text: str) -> str:
+    """Apply the universal newline translation ``read_text`` performs."""
+    if '\r' not in text:
+        return text
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+@dataclass(frozen=True)
+class FileLimits:
+    """Size caps applied when reading files into summaries.
+
+    Files over their cap contribute only their first bytes, cut back to a
+    whole UTF-8 character and followed by a truncation marker. A cap of 0
+    disables truncation.
+    """
+    max_bytes: int = DEFAULT_MAX_BYTES
+    by_suffix: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, config: dict) -> "FileLimits":
+        """Build limits from a ``[tool.summary]`` table.
+
+        Args:
+            config: Table with optional ``max_file_bytes`` and
+                ``max_file_bytes_by_suffix`` keys
+
+        Returns:
+            Configured limits
+        """
+        return cls(
+            max_bytes=config.get("max_file_bytes", DEFAULT_MAX_BYTES),
+            by_suffix=dict(config.get("max_file_bytes_by_suffix", {})),
+        )
+
+    def cap(self, path: Path) -> Optional[int]:
+        """Get the byte cap for a file, or None if it is uncapped."""
+        limit = self.by_suffix.get(path.suffix, self.max_bytes)
+        return limit if limit > 0 else None
+
+    def read_size(self, path: Path, size: int) -> int:
+        """Get the number of bytes ``read`` takes from a file of the given size."""
+        limit = self.cap(path)
+        return size if limit is None else min(size, limit)
+
+    def key(self) -> str:
+        """Describe the limits, for invalidating outputs built under others."""
+        suffixes = ",".join(f"{suffix}={limit}" for suffix, limit in sorted(self.by_suffix.items()))
+        return f"max={self.max_bytes};{suffixes}"
+
+    def read(self, path: Path, size: int) -> str:
+        """Read a file as ``read_text`` would, applying the cap.
+
+        Args:
+            path: File to read
+            size: File size from a previous ``stat``
+
+        Returns:
+            File content, with a truncation marker if it was cut off
+
+        Raises:
+            BinaryFileError: If the file looks binary
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        limit = self.cap(path)
+        truncated = limit is not None and size > limit
+        with open(path, 'rb') as f:
+            # Sniff before reading the rest, so a large binary costs one small read
+            head = f.read(min(SNIFF_BYTES, limit) if truncated else SNIFF_BYTES)
+            if is_binary(head):
+                raise BinaryFileError(f"{path} looks binary")
+            data = head + (f.read(limit - len(head)) if truncated else f.read())
+        return _decode(data, limit if truncated else None, size)
+
+    def read_whole(self, path: Path, size: int) -> Tuple[str, str]:
+        """Read a whole file once, returning it both in full and capped.
+
+        Args:
+            path: File to read
+            size: File size from a previous ``stat``
+
+        Returns:
+            Full content, and the content ``read`` would return
+
+        Raises:
+            BinaryFileError: If the file looks binary
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        with open(path, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+            if is_binary(head):
+                raise BinaryFileError(f"{path} looks binary")
+            data = head + f.read()
+        limit = self.cap(path)
+        whole = _decode(data, None, size)
+        if limit is None or size <= limit:
+            return whole, whole
+        return whole, _decode(data[:limit], limit, size)
+
+
+def _decode(data: bytes, limit: Optional[int], size: int) -> str:
+    """Decode file content as ``read_text`` would, marking it if cut off at limit."""
+    if limit is None:
+        return translate_newlines(data.decode('utf-8'))
+    # Drop a multi-byte character cut in half by the cap
+    text = codecs.getincrementaldecoder('utf-8')().decode(data, final=False)
+    return translate_newlines(text) + truncation_marker(limit, size)
@@ -0,0 +1,260 @@
+"""Content-hash manifest for incremental summary regeneration."""
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+from loguru import logger
+from project_utils import report
+from project_utils.outputs import hash_file, write_atomic
+
+CACHE_DIR = ".summary_cache"
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclass
+class FileRecord:
+    """Stat fingerprint and content hash of a file."""
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    def matches(self, stat: os.stat_result) -> bool:
+        """Check whether a stat result still describes the recorded file."""
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+
+@dataclass
+class OutputRecord(FileRecord):
+    """Fingerprint of a generated file plus the digest of its inputs."""
+    inputs: str
+
+
+@dataclass
+class DirectoryRecord:
+    """File count and size beneath a directory, and whether it has a SUMMARY."""
+    files: int
+    size: int
+    summarized: bool
+
+
+def hash_text(content: str) -> str:
+    """Hash text content as it is written to disk."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class Manifest:
+    """Persisted per-file and per-output hashes for a project tree."""
+
+    VERSION = 1
+
+    def __init__(self, root_dir: str | Path):
+        """Initialize an empty manifest for a root directory.
+
+        Args:
+            root_dir: Root directory the manifest describes
+        """
+        self.root_dir = Path(root_dir)
+        self.path = self.root_dir / CACHE_DIR / MANIFEST_NAME
+        self.files: Dict[str, FileRecord] = {}
+        self.outputs: Dict[str, OutputRecord] = {}
+        # Shape of the tree at the last run, so a --since run can skip unchanged subtrees
+        self.directories: Dict[str, DirectoryRecord] = {}
+        # Keys of the files and outputs used since loading, which are known to exist
+        self._seen: Set[str] = set()
+
+    @classmethod
+    def load(cls, root_dir: str | Path) -> "Manifest":
+        """Load the manifest for a root directory, or start a fresh one.
+
+        Args:
+            root_dir: Root directory the manifest describes
+
+        Returns:
+            Loaded manifest, empty if missing, stale or unreadable
+        """
+        manifest = cls(root_dir)
+        try:
+            data = json.loads(manifest.path.read_text(encoding='utf-8'))
+            if data.get("version") != cls.VERSION:
+                return manifest
+            manifest.files = {
+                key: FileRecord(**record) for key, record in data["files"].items()
+            }
+            manifest.outputs = {
+                key: OutputRecord(**record) for key, record in data["outputs"].items()
+            }
+            manifest.directories = {
+                key: DirectoryRecord(**record)
+                for key, record in data.get("directories", {}).items()
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable manifest {manifest.path}: {e}")
+        return manifest
+
+    def save(self) -> None:
+        """Write the manifest to disk, dropping records of deleted files.
+
+        Records not used since loading are kept only while their file is
+        still on disk: a ``--since`` run or the special summaries use just
+        part of the tree, and the rest stays valid for later runs.
+        """
+        for records in (self.files, self.outputs):
+            for key in [key for key in records if key not in self._seen and not self._exists(key)]:
+                del records[key]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": self.VERSION,
+            "files": {key: vars(record) for key, record in sorted(self.files.items())},
+            "outputs": {key: vars(record) for key, record in sorted(self.outputs.items())},
+            "directories": {key: vars(record) for key, record in sorted(self.directories.items())},
+        }
+        # Compact output keeps to the C encoder, which matters for long-running watch sessions
+        self.path.write_text(json.dumps(data, separators=(',', ':')), encoding='utf-8')
+
+    def _key(self, path: Path) -> str:
+        return path.relative_to(self.root_dir).as_posix()
+
+    def _exists(self, key: str) -> bool:
+        """Check whether the file of a record, with or without a variant suffix, exists."""
+        path, variant, _ = key.rpartition('#')
+        return os.path.lexists(self.root_dir / key) or (
+            bool(variant) and os.path.lexists(self.root_dir / path)
+        )
+
+    def file_hash(
+        self,
+        file_path: Path,
+        stat: os.stat_result,
+        read: Callable[[], Optional[str]],
+        variant: str = "",
+    ) -> Optional[str]:
+        """Get a file's content hash, reading it only if its stat changed.
+
+        Args:
+            file_path: Path to the input file
+            stat: Current stat result for the file
+            read: Callable returning the file's content, or None on error
+            variant: Name of a different way of reading the file, such as
+                untruncated, whose hash is recorded apart from the default
+
+        Returns:
+            Content hash, or None if the file could not be read
+        """
+        key = self._key(file_path) + (f"#{variant}" if variant else "")
+        self._seen.add(key)
+        record = self.files.get(key)
+        if record is not None and record.matches(stat):
+            report.count("read", cache_hits=1)
+            return record.sha256
+
+        report.count("read", cache_misses=1)
+        content = read()
+        if content is None:
+            self.files.pop(key, None)
+            return None
+        sha = hash_text(content)
+        self.files[key] = FileRecord(stat.st_size, stat.st_mtime_ns, sha)
+        return sha
+
+    @staticmethod
+    def digest(inputs: Iterable[Tuple[str, Optional[str]]], salt: str = "") -> str:
+        """Combine (name, hash) pairs into one digest describing an output.
+
+        Args:
+            inputs: Ordered (name, content hash) pairs
+            salt: Extra text that also affects the output, such as options
+
+        Returns:
+            Hex digest of the inputs
+        """
+        digest = hashlib.sha256(salt.encode('utf-8'))
+        for name, sha in inputs:
+            digest.update(f"{name}\0{sha}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_current(self, output_path: Path, inputs: str) -> bool:
+        """Check whether an output is on disk and was built from these inputs.
+
+        Args:
+            output_path: Path to the generated file
+            inputs: Digest of the output's inputs
+
+        Returns:
+            True if the output can be reused as-is
+        """
+        key = self._key(output_path)
+        self._seen.add(key)
+        record = self.outputs.get(key)
+        if record is None or record.inputs != inputs:
+            return False
+        try:
+            return record.matches(output_path.stat())
+        except OSError:
+            return False
+
+    def write_output(self, output_path: Path, content: str, inputs: str) -> bool:
+        """Write an output file unless identical content is already on disk.
+
+        Args:
+            output_path: Path to the generated file
+            content: Content to write
+            inputs: Digest of the output's inputs
+
+        Returns:
+            True if the file was written
+        """
+        data = content.encode('utf-8')
+        sha = hashlib.sha256(data).hexdigest()
+        unchanged = self._is_unchanged(output_path, len(data), sha)
+        if not unchanged:
+            with report.phase("write"):
+                write_atomic(output_path, data)
+            report.count("write", files=1, bytes_written=len(data))
+        self._record_output(output_path, sha, inputs)
+        return not unchanged
+
+    def commit_output(self, output_path: Path, staged_path: Path, inputs: str) -> bool:
+        """Move a fully written temporary file into place unless identical.
+
+        Args:
+            output_path: Path to the generated file
+            staged_path: Temporary file holding the new content
+            inputs: Digest of the output's inputs
+
+        Returns:
+            True if the output was replaced
+        """
+        sha = hash_file(staged_path)
+        unchanged = self._is_unchanged(output_path, staged_path.stat().st_size, sha)
+        if unchanged:
+            staged_path.unlink()
+        else:
+            os.replace(staged_path, output_path)
+        self._record_output(output_path, sha, inputs)
+        return not unchanged
+
+    def _is_unchanged(self, output_path: Path, size: int, sha: str) -> bool:
+        """Check whether an output on disk already has the given content."""
+        try:
+            stat = output_path.stat()
+        except OSError:
+            return False
+        if stat.st_size != size:
+            return False
+        record = self.outputs.get(self._key(output_path))
+        if record is not None and record.matches(stat):
+            return record.sha256 == sha
+        return hash_file(output_path) == sha
+
+    def _record_output(self, output_path: Path, sha: str, inputs: str) -> None:
+        """Record the fingerprint of an output as it is now on disk."""
+        stat = output_path.stat()
+        key = self._key(output_path)
+        self._seen.add(key)
+        self.outputs[key] = OutputRecord(
+            stat.st_size, stat.st_mtime_ns, sha, inputs
+        )
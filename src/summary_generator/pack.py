@@ -0,0 +1,157 @@
+"""Single-file packed summary output with an offset index."""
+import hashlib
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+from loguru import logger
+from project_utils import report
+from .manifest import Manifest
+from .scanner import FileIndex
+
+PACK_NAME = "pack.bin"
+INDEX_NAME = "pack.json"
+PACK_VERSION = 1
+
+
+def write_pack(
+    index: FileIndex,
+    files: List[Path],
+    output_dir: Path,
+    manifest: Optional[Manifest] = None,
+    inputs: Optional[str] = None
+) -> List[Path]:
+    """Write every indexed file's content into one pack plus a JSON index.
+
+    The pack is the files' UTF-8 content back to back, in summary order.
+    The index maps each root-relative path to its offset, length and
+    SHA-256 in the pack. Unreadable and binary files are left out.
+
+    Args:
+        index: Index the files are read through
+        files: Files to pack, in order
+        output_dir: Directory to write ``pack.bin`` and ``pack.json`` to
+        manifest: Manifest to record the pack in, if incremental
+        inputs: Digest of the pack's inputs, if incremental
+
+    Returns:
+        Paths of the pack and its index
+    """
+    output_dir.mkdir(exist_ok=True)
+    pack_path = output_dir / PACK_NAME
+    index_path = output_dir / INDEX_NAME
+    if manifest is not None and index_path.exists() and manifest.is_current(pack_path, inputs):
+        logger.debug(f"{pack_path} is up to date")
+        report.count("render", cache_hits=1)
+        return [pack_path, index_path]
+
+    entries: Dict[str, dict] = {}
+    staged_path = pack_path.with_name(PACK_NAME + ".tmp")
+    with report.phase("write"):
+        with open(staged_path, 'wb') as f:
+            for file_path in files:
+                content = index.read(file_path, cache=False)
+                if content is None:
+                    continue
+                data = content.encode('utf-8')
+                entries[file_path.relative_to(index.root).as_posix()] = {
+                    "offset": f.tell(),
+                    "length": len(data),
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                }
+                f.write(data)
+            size = f.tell()
+    report.count("write", files=2, bytes_written=size)
+
+    if manifest is None:
+        os.replace(staged_path, pack_path)
+    elif not manifest.commit_output(pack_path, staged_path, inputs):
+        logger.debug(f"{pack_path} is unchanged")
+
+    # The index goes last, so it never points into a pack that is not there yet
+    staged_index = index_path.with_name(INDEX_NAME + ".tmp")
+    staged_index.write_text(format_index(entries), encoding='utf-8')
+    os.replace(staged_index, index_path)
+    logger.info(f"Packed {len(entries)} files into {pack_path}")
+    return [pack_path, index_path]
+
+
+def format_index(entries: Dict[str, dict]) -> str:
+    """Serialize a pack index as JSON with one line per file, for small diffs."""
+    lines = [
+        f"{json.dumps(path)}:{json.dumps(entry, separators=(',', ':'))}"
+        for path, entry in entries.items()
+    ]
+    header = json.dumps({"version": PACK_VERSION, "pack": PACK_NAME})[:-1]
+    return header + ', "files": {\n' + ",\n".join(lines) + "\n}}\n"
+
+
+class PackReader:
+    """Random access to packed files through a memory map.
+
+    Usage::
+
+        with PackReader("SUMMARIES") as pack:
+            source = pack.read("src/summary_generator/pack.py")
+    """
+
+    def __init__(self, directory: str | Path):
+        """Open a pack and its index.
+
+        Args:
+            directory: Directory containing ``pack.bin`` and ``pack.json``
+        """
+        directory = Path(directory)
+        data = json.loads((directory / INDEX_NAME).read_text(encoding='utf-8'))
+        if data.get("version") != PACK_VERSION:
+            raise ValueError(f"Unsupported pack version {data.get('version')}")
+        self.entries: Dict[str, dict] = data["files"]
+        self._file = open(directory / data["pack"], 'rb')
+        # Empty files cannot be mapped
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def __enter__(self) -> "PackReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.entries
+
+    def paths(self) -> List[str]:
+        """Get the packed paths, in pack order."""
+        return list(self.entries)
+
+    def read_bytes(self, path: str, verify: bool = False) -> bytes:
+        """Read a packed file's bytes.
+
+        Args:
+            path: Root-relative POSIX path of the file
+            verify: Check the bytes against the recorded SHA-256
+
+        Returns:
+            The file's content as packed
+
+        Raises:
+            KeyError: If the path is not in the pack
+            ValueError: If verification fails
+        """
+        entry = self.entries[path]
+        start = entry["offset"]
+        data = self._map[start:start + entry["length"]] if self._map is not None else b''
+        if verify and hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            raise ValueError(f"Packed content of {path} does not match its hash")
+        return data
+
+    def read(self, path: str, verify: bool = False) -> str:
+        """Read a packed file as text."""
+        return self.read_bytes(path, verify).decode('utf-8')
+
+    def close(self) -> None:
+        """Release the memory map and file."""
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
@@ -0,0 +1,208 @@
+"""Project-wide Python structure summary built from extracted signatures."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from loguru import logger
+from project_utils import report
+from project_utils.path_filter import PathFilter
+from .scanner import FileIndex, scan_tree
+from .signature_cache import SignatureCache
+from .signature_extractor import Signature, SignatureExtractor
+
+# Each worker gets several chunks so uneven file sizes still balance out
+CHUNKS_PER_JOB = 4
+
+ExtractResult = Tuple[Optional[List[Signature]], Optional[str]]
+
+# Hidden and bytecode cache directories are never summarized
+PYTHON_FILTER = PathFilter(['.*', '__pycache__'])
+
+
+def find_python_files(root_dir: str | Path) -> List[Path]:
+    """Find the Python files included in the project structure summary.
+
+    Excluded directories are pruned rather than walked.
+
+    Args:
+        root_dir: Root directory of the project
+
+    Returns:
+        Sorted list of Python file paths
+    """
+    return scan_python_files(root_dir).files
+
+def scan_python_files(root_dir: str | Path) -> FileIndex:
+    """Index the Python files included in the project structure summary.
+
+    Args:
+        root_dir: Root directory of the project
+
+    Returns:
+        Index of the Python files, without size caps
+    """
+    return scan_tree(
+        root_dir,
+        include_file=is_summarized_python_file,
+        include_directory=lambda path: PYTHON_FILTER.is_included(path, is_dir=True)
+    )
+
+def is_summarized_python_file(file: Path) -> bool:
+    """Check whether a Python file belongs in the project structure summary.
+
+    Args:
+        file: Path to check
+
+    Returns:
+        True for .py files outside hidden and __pycache__ directories
+    """
+    return file.suffix == '.py' and PYTHON_FILTER.is_included(file)
+
+def indexed_python_files(index: FileIndex) -> List[Path]:
+    """Get the Python files of an index the project structure summary includes.
+
+    Args:
+        index: Index whose files and extra files are searched
+
+    Returns:
+        Sorted list of Python file paths
+    """
+    return sorted(
+        file for file in (*index.files, *index.extra_files) if is_summarized_python_file(file)
+    )
+
+def _extract_chunk(
+    sources: List[str],
+    cache: Optional[SignatureCache] = None
+) -> List[ExtractResult]:
+    """Extract signatures for a chunk of sources.
+
+    Runs in worker processes, so results are plain picklable values.
+
+    Args:
+        sources: Source of each file
+        cache: Optional cache consulted before parsing
+
+    Returns:
+        (signatures, error) pair per file, in input order
+    """
+    extractor = SignatureExtractor()
+    results = []
+    for source in sources:
+        try:
+            signatures = cache.get(source) if cache is not None else None
+            if signatures is None:
+                with report.phase("parse"):
+                    signatures = extractor.extract_signatures(source)
+                report.count("parse", files=1, cache_misses=int(cache is not None))
+                if cache is not None:
+                    cache.put(source, signatures)
+            else:
+                report.count("parse", cache_hits=1)
+            results.append((signatures, None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+def _extract_chunk_measured(
+    sources: List[str],
+    cache: Optional[SignatureCache] = None
+) -> Tuple[List[ExtractResult], dict]:
+    """Extract a chunk in a worker and return its report counters too."""
+    with report.isolated_report() as worker_report:
+        results = _extract_chunk(sources, cache)
+    return results, worker_report.counters()
+
+def extract_all(
+    sources: List[str],
+    jobs: int = 1,
+    cache: Optional[SignatureCache] = None
+) -> Iterator[ExtractResult]:
+    """Extract signatures for many files, optionally across processes.
+
+    Sources are read by the caller, so workers never touch the disk.
+
+    Args:
+        sources: Source of each file
+        jobs: Number of worker processes; 1 runs in-process, less than 1
+            uses every CPU
+        cache: Optional cache consulted before parsing
+
+    Yields:
+        (signatures, error) pair per file, in input order
+    """
+    if jobs < 1:
+        jobs = os.cpu_count() or 1
+    if jobs == 1 or len(sources) < 2:
+        yield from _extract_chunk(sources, cache)
+        return
+
+    chunk_size = max(1, -(-len(sources) // (jobs * CHUNKS_PER_JOB)))
+    chunks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+    logger.debug(f"Extracting {len(sources)} files in {len(chunks)} chunks over {jobs} processes")
+    parent_report = report.current_report()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        if parent_report is None:
+            # map preserves input order, keeping the output deterministic
+            for results in executor.map(_extract_chunk, chunks, [cache] * len(chunks)):
+                yield from results
+            return
+        for results, counters in executor.map(
+            _extract_chunk_measured, chunks, [cache] * len(chunks)
+        ):
+            parent_report.merge(counters)
+            yield from results
+
+def generate_python_summary(
+    root_dir: str | Path,
+    jobs: int = 1,
+    cache: Optional[SignatureCache] = None,
+    index: Optional[FileIndex] = None
+) -> str:
+    """Generate enhanced Python project structure summary.
+
+    Args:
+        root_dir: Root directory of the project
+        jobs: Number of processes used to parse files
+        cache: Optional signature cache; unchanged files skip parsing
+        index: Index to take the Python files and their sources from,
+            sharing reads with other outputs; defaults to a scan of the
+            Python files alone
+
+    Returns:
+        Formatted markdown string of Python signatures
+    """
+    root_dir = Path(root_dir)
+    extractor = SignatureExtractor()
+    content = ["# Python Project Structure\n"]
+    if index is None:
+        index = scan_python_files(root_dir)
+    # Parsing needs whole files, whatever the summaries' size caps;
+    # unreadable files were already logged by the index
+    files, sources = [], []
+    for file in indexed_python_files(index):
+        source = index.read(file, truncate=False)
+        if source is not None:
+            files.append(file)
+            sources.append(source)
+
+    for file, (signatures, error) in zip(files, extract_all(sources, jobs, cache)):
+        if error is not None:
+            logger.error(f"Error processing {file}: {error}")
+            continue
+
+        # Only include files that have actual content
+        if signatures:
+            content.append(f"## {file.relative_to(root_dir)}")
+            content.append("```python")
+
+            # Format each signature
+            for sig in signatures:
+                content.extend(extractor.format_signature(sig))
+                content.append("")  # Add spacing between top-level items
+
+            content.append("```\n")
+
+    if cache is not None:
+        cache.evict()
+    return "\n".join(content)
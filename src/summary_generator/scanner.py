@@ -0,0 +1,262 @@
+"""Single-pass directory scanning with a per-run file content cache."""
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from loguru import logger
+from project_utils import report
+from .limits import BinaryFileError, FileLimits
+
+
+@dataclass
+class FileIndex:
+    """In-memory index of the files beneath a root directory.
+
+    Files are stored in summary order (sorted by path parts), so the files
+    beneath any directory occupy one contiguous slice of ``files``. If
+    ``limits`` is set, reads skip binary files and truncate large ones;
+    files matching ``read_whole`` are read in full once even then, and
+    both views are kept. ``extra_files`` holds files the same scan found
+    for other outputs; they are not part of any directory's span.
+    """
+    root: Path
+    limits: Optional[FileLimits] = None
+    read_whole: Optional[Callable[[Path], bool]] = field(default=None, repr=False)
+    files: List[Path] = field(default_factory=list)
+    extra_files: List[Path] = field(default_factory=list)
+    spans: Dict[Path, Tuple[int, int]] = field(default_factory=dict)
+    direct: Dict[Path, List[Path]] = field(default_factory=dict, repr=False)
+    contents: Dict[Path, Optional[str]] = field(default_factory=dict, repr=False)
+    whole_contents: Dict[Path, Optional[str]] = field(default_factory=dict, repr=False)
+    stats: Dict[Path, os.stat_result] = field(default_factory=dict, repr=False)
+    _offsets: Optional[List[int]] = field(default=None, repr=False)
+
+    def files_under(self, directory: Path) -> List[Path]:
+        """Get all indexed files beneath a directory, in summary order.
+
+        Args:
+            directory: Directory to list files for
+
+        Returns:
+            List of file paths, empty if the directory was not scanned
+        """
+        start, end = self.spans.get(directory, (0, 0))
+        return self.files[start:end]
+
+    def files_in(self, directory: Path) -> List[Path]:
+        """Get the indexed files directly inside a directory, in summary order.
+
+        Args:
+            directory: Directory to list files for
+
+        Returns:
+            List of file paths, excluding files in subdirectories
+        """
+        return self.direct.get(directory, [])
+
+    def size_under(self, directory: Path) -> int:
+        """Get the total size of the indexed files beneath a directory.
+
+        Args:
+            directory: Directory to measure
+
+        Returns:
+            Sum of the files' sizes in bytes
+        """
+        if self._offsets is None:
+            # Running totals, so any directory's span is one subtraction;
+            # built aside so concurrent callers never see a partial list
+            offsets = [0]
+            for path in self.files:
+                offsets.append(offsets[-1] + self.stat(path).st_size)
+            self._offsets = offsets
+        start, end = self.spans.get(directory, (0, 0))
+        return self._offsets[end] - self._offsets[start]
+
+    def stat(self, file_path: Path) -> os.stat_result:
+        """Stat a file, hitting the disk at most once per file.
+
+        Args:
+            file_path: Path to file to stat
+
+        Returns:
+            Stat result for the file
+        """
+        if file_path not in self.stats:
+            self.stats[file_path] = file_path.stat()
+        return self.stats[file_path]
+
+    def read(self, file_path: Path, cache: bool = True, truncate: bool = True) -> Optional[str]:
+        """Read a file's content, hitting the disk at most once per file.
+
+        Args:
+            file_path: Path to file to read
+            cache: Keep the content for later reads
+            truncate: Apply the size caps. Without them, files over their
+                cap are read in full, and only cached if they match
+                ``read_whole``; other files are shared with capped reads.
+
+        Returns:
+            File content, or None if the file could not be read
+        """
+        if self.is_truncated(file_path):
+            whole = self.read_whole is not None and self.read_whole(file_path)
+            if not truncate or whole:
+                return self._read_whole(file_path, truncate, cache and whole)
+        if file_path in self.contents:
+            return self.contents[file_path]
+        limits = self.limits
+        with report.phase("read"):
+            try:
+                size = self.stat(file_path).st_size
+                if limits is None:
+                    content = file_path.read_text(encoding='utf-8')
+                else:
+                    content = limits.read(file_path, size)
+                    # Truncated files are only read up to their cap
+                    size = limits.read_size(file_path, size)
+                report.count("read", files=1, bytes_read=size)
+            except BinaryFileError:
+                logger.debug("Skipping binary file {}", file_path)
+                content = None
+            except Exception as e:
+                logger.error(f"Error processing {file_path}: {e}")
+                content = None
+        if cache:
+            self.contents[file_path] = content
+        return content
+
+    def _read_whole(self, file_path: Path, truncate: bool, cache: bool) -> Optional[str]:
+        """Read a file over its cap in full once, keeping the full and the capped content."""
+        cached = self.contents if truncate else self.whole_contents
+        if file_path in cached:
+            return cached[file_path]
+        with report.phase("read"):
+            try:
+                size = self.stat(file_path).st_size
+                whole, capped = self.limits.read_whole(file_path, size)
+                report.count("read", files=1, bytes_read=size)
+            except BinaryFileError:
+                logger.debug("Skipping binary file {}", file_path)
+                whole = capped = None
+            except Exception as e:
+                logger.error(f"Error processing {file_path}: {e}")
+                whole = capped = None
+        if cache:
+            self.whole_contents[file_path] = whole
+            self.contents[file_path] = capped
+        return capped if truncate else whole
+
+    def prefetch(self, files: Iterable[Path], io_map: Callable = map) -> None:
+        """Read and cache files ahead of use.
+
+        Args:
+            files: Files that are about to be read; duplicates are read once
+            io_map: ``map`` to run the reads with, e.g. from ``io_pool``
+        """
+        pending = [path for path in dict.fromkeys(files) if path not in self.contents]
+        for _ in io_map(self.read, pending):
+            pass
+
+    def is_truncated(self, file_path: Path) -> bool:
+        """Check whether capped reads of a file are cut off at its size cap."""
+        if self.limits is None:
+            return False
+        try:
+            cap = self.limits.cap(file_path)
+            return cap is not None and self.stat(file_path).st_size > cap
+        except OSError:
+            return False
+
+    def reuse(self, previous: "FileIndex") -> None:
+        """Adopt content an earlier index of the same tree already read.
+
+        Content is carried over only while the file's size and modification
+        time are unchanged, so rescanning within a run does not read
+        unchanged files again.
+
+        Args:
+            previous: Index from an earlier scan with the same limits
+        """
+        for file_path, content in previous.contents.items():
+            before = previous.stats.get(file_path)
+            if before is None:
+                continue
+            try:
+                after = file_path.stat()
+            except OSError:
+                continue
+            if (after.st_size, after.st_mtime_ns) == (before.st_size, before.st_mtime_ns):
+                self.stats[file_path] = after
+                self.contents[file_path] = content
+                if file_path in previous.whole_contents:
+                    self.whole_contents[file_path] = previous.whole_contents[file_path]
+
+
+def scan_tree(
+    root: str | Path,
+    include_file: Callable[[Path], bool],
+    include_directory: Callable[[Path], bool] = lambda path: True,
+    directories: Optional[Iterable[Path]] = None,
+    limits: Optional[FileLimits] = None,
+    extra_file: Optional[Callable[[Path], bool]] = None,
+    extra_directory: Callable[[Path], bool] = lambda path: False,
+    read_whole: Optional[Callable[[Path], bool]] = None,
+) -> FileIndex:
+    """Walk a tree once with ``os.scandir`` and index the included files.
+
+    Entries are visited in name order and subdirectories are entered in
+    place, which yields files in the same order as ``sorted(root.rglob('*'))``.
+    Like ``rglob``, symlinked directories are listed but not followed.
+
+    Args:
+        root: Root directory to scan
+        include_file: Predicate deciding whether a file is indexed
+        include_directory: Predicate deciding whether a directory is entered
+        directories: Non-overlapping subtrees to scan instead of the whole root
+        limits: Size caps and binary detection applied when reading files
+        extra_file: Predicate for files to list in ``extra_files`` instead
+        extra_directory: Predicate deciding whether a directory that is not
+            entered for indexed files is still searched for extra files
+        read_whole: Predicate for files that are also needed in full, so
+            reads over their size cap fetch the whole file once
+
+    Returns:
+        Populated file index
+    """
+    index = FileIndex(root=Path(root), limits=limits, read_whole=read_whole)
+
+    def walk(directory: Path, extra_only: bool = False) -> None:
+        start = len(index.files)
+        direct = []
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.error(f"Error scanning {directory}: {e}")
+            entries = []
+
+        for entry in entries:
+            path = directory / entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if not extra_only and include_directory(path):
+                    walk(path)
+                elif extra_file is not None and extra_directory(path):
+                    walk(path, extra_only=True)
+            elif not entry.is_file():
+                continue
+            elif not extra_only and include_file(path):
+                index.files.append(path)
+                direct.append(path)
+            elif extra_file is not None and extra_file(path):
+                index.extra_files.append(path)
+
+        if not extra_only:
+            index.spans[directory] = (start, len(index.files))
+            index.direct[directory] = direct
+
+    with report.phase("scan"):
+        for directory in ([index.root] if directories is None else directories):
+            walk(directory)
+    report.count("scan", files=len(index.files))
+    return index
@@ -0,0 +1,137 @@
+"""Persistent on-disk cache of extracted signatures keyed by content hash."""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+from loguru import logger
+from .signature_extractor import Signature, SignatureExtractor
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _to_signature(data: dict) -> Signature:
+    """Rebuild a signature, including nested methods, from its dict form."""
+    return Signature(**{**data, "methods": [_to_signature(m) for m in data["methods"]]})
+
+
+class SignatureCache:
+    """Cache of ``Signature`` lists stored as one JSON file per source.
+
+    Entries are keyed by the source's content hash and the extractor version.
+    Each hit refreshes the entry's mtime, so eviction can drop the least
+    recently used entries once the cache grows past its size cap. Entries
+    seen by this process are also kept in memory, so a long-lived process
+    such as ``watch`` skips reading and decoding them again. The cache is plain
+    data and can be shared with worker processes; the memory layer stays
+    behind.
+    """
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize cache in a directory.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Total size above which old entries are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._memory: Dict[str, List[Signature]] = {}
+
+    def __getstate__(self) -> dict:
+        # Workers look entries up on disk rather than receiving every one
+        return {**self.__dict__, "_memory": {}}
+
+    def _key(self, source: str) -> str:
+        return hashlib.sha256(
+            f"{SignatureExtractor.VERSION}\0{source}".encode('utf-8')
+        ).hexdigest()
+
+    def _entry_path(self, source: str) -> Path:
+        key = self._key(source)
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, source: str) -> Optional[List[Signature]]:
+        """Look up the signatures extracted from a source.
+
+        Args:
+            source: Python source code
+
+        Returns:
+            Cached signatures, or None on a miss
+        """
+        key = self._key(source)
+        path = self.cache_dir / key[:2] / f"{key}.json"
+        if key in self._memory:
+            try:
+                # Keep the entry's recency current for eviction
+                os.utime(path)
+                return self._memory[key]
+            except FileNotFoundError:
+                # Evicted since, possibly by another process
+                del self._memory[key]
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+        signatures = [_to_signature(item) for item in data]
+        self._memory[key] = signatures
+        return signatures
+
+    def put(self, source: str, signatures: List[Signature]) -> None:
+        """Store the signatures extracted from a source.
+
+        Args:
+            source: Python source code
+            signatures: Signatures extracted from it
+        """
+        path = self._entry_path(source)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent workers never see partial entries
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump([asdict(sig) for sig in signatures], f)
+        os.replace(tmp, path)
+        self._memory[self._key(source)] = signatures
+
+    def evict(self) -> int:
+        """Remove least recently used entries until under the size cap.
+
+        Returns:
+            Number of entries removed
+        """
+        if not self.cache_dir.exists():
+            return 0
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._memory.pop(path.stem, None)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Evicted {removed} signature cache entries")
+        return removed
+
+    def clear(self) -> None:
+        """Delete every cache entry."""
+        logger.info(f"Clearing signature cache {self.cache_dir}")
+        self._memory.clear()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
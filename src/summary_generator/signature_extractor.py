@@ -1,8 +1,7 @@
 """Extracts and formats Python code signatures with proper nesting."""
 import ast
 from dataclasses import dataclass
-from pathlib import Path
-from typing import List, Dict
+from typing import List, Optional
 from loguru import logger
 
 @dataclass
@@ -16,18 +15,60 @@ class Signature:
     decorators: list[str]
     methods: list['Signature']  # For storing class methods
 
-class ParentNodeTransformer(ast.NodeTransformer):
-    """Add parent references to all nodes in the AST."""
+class ScopeVisitor(ast.NodeVisitor):
+    """Collect signatures in one pass, tracking the enclosing scopes.
     
-    def visit(self, node: ast.AST) -> ast.AST:
-        """Visit a node and add parent references to all its children."""
-        for child in ast.iter_child_nodes(node):
-            child.parent = node
-        return super().visit(node)
+    Only statement bodies are traversed; expressions are never visited.
+    Functions defined in a class body are recorded as its methods. Every
+    other definition, including closures and classes nested in classes
+    or functions, is recorded at module level in the order it appears.
+    """
+    
+    # Statement fields that can hold definitions at module or class scope
+    BODY_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+    
+    def __init__(self, extractor: 'SignatureExtractor'):
+        """Initialize visitor with the extractor used to build signatures."""
+        self.extractor = extractor
+        self.signatures: List[Signature] = []
+        # Enclosing definitions, innermost last: a class's signature, or None for a function
+        self.scope: List[Optional[Signature]] = []
+    
+    def _visit_body(self, node: ast.AST, sig: Optional[Signature]) -> None:
+        """Collect the definitions in a body with its definition as the innermost scope."""
+        self.scope.append(sig)
+        self.generic_visit(node)
+        self.scope.pop()
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        """Record a function or method and the definitions in its body."""
+        owner = self.scope[-1] if self.scope else None
+        if owner is None:
+            self.signatures.append(self.extractor.function_signature(node, 'function'))
+        else:
+            owner.methods.append(self.extractor.function_signature(node, 'method'))
+        self._visit_body(node, None)
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        """Record a class and collect the definitions in its body."""
+        sig = self.extractor.class_signature(node)
+        self.signatures.append(sig)
+        self._visit_body(node, sig)
+    
+    def generic_visit(self, node: ast.AST) -> None:
+        """Visit nested statements, such as the branches of ``if`` or ``try``."""
+        for field in self.BODY_FIELDS:
+            for child in getattr(node, field, ()):
+                self.visit(child)
 
 class SignatureExtractor:
     """Extracts detailed signatures from Python files."""
     
+    # Bump when extraction output changes to invalidate cached signatures
+    VERSION = 3
+    
     def get_type_annotation(self, node: ast.AST) -> str:
         """Convert AST annotation node to string representation."""
         if isinstance(node, ast.Name):
@@ -55,78 +96,66 @@ class SignatureExtractor:
             arg_str += f": {type_str}"
         return arg_str
 
+    def function_signature(
+        self,
+        node: ast.FunctionDef | ast.AsyncFunctionDef,
+        kind: str
+    ) -> Signature:
+        """Build the signature of a function or method definition."""
+        args = []
+        for arg in node.args.args:
+            args.append(self.get_arg_string(arg))
+        
+        returns = None
+        if node.returns:
+            returns = self.get_type_annotation(node.returns)
+        
+        decorators = []
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Name):
+                decorators.append(f"@{decorator.id}")
+            elif isinstance(decorator, ast.Call):
+                if isinstance(decorator.func, ast.Name):
+                    decorators.append(f"@{decorator.func.id}(...)")
+        
+        return Signature(
+            name=node.name,
+            kind=kind,
+            args=args,
+            returns=returns,
+            docstring=ast.get_docstring(node),
+            decorators=decorators,
+            methods=[]
+        )
+    
+    def class_signature(self, node: ast.ClassDef) -> Signature:
+        """Build the signature of a class definition, without its methods."""
+        bases = []
+        for base in node.bases:
+            if isinstance(base, ast.Name):
+                bases.append(base.id)
+        
+        decorators = []
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Name):
+                decorators.append(f"@{decorator.id}")
+        
+        return Signature(
+            name=node.name,
+            kind='class',
+            args=bases,
+            returns=None,
+            docstring=ast.get_docstring(node),
+            decorators=decorators,
+            methods=[]
+        )
+
     def extract_signatures(self, source: str) -> List[Signature]:
         """Extract all function and class signatures from source code."""
         try:
-            # Parse and add parent references
-            tree = ast.parse(source)
-            transformer = ParentNodeTransformer()
-            transformer.visit(tree)
-            
-            signatures: List[Signature] = []
-            classes: Dict[ast.ClassDef, Signature] = {}
-            
-            for node in ast.walk(tree):
-                # Handle functions
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    args = []
-                    for arg in node.args.args:
-                        args.append(self.get_arg_string(arg))
-                    
-                    returns = None
-                    if node.returns:
-                        returns = self.get_type_annotation(node.returns)
-                    
-                    decorators = []
-                    for decorator in node.decorator_list:
-                        if isinstance(decorator, ast.Name):
-                            decorators.append(f"@{decorator.id}")
-                        elif isinstance(decorator, ast.Call):
-                            if isinstance(decorator.func, ast.Name):
-                                decorators.append(f"@{decorator.func.id}(...)")
-                    
-                    sig = Signature(
-                        name=node.name,
-                        kind='method' if hasattr(node, 'parent') and isinstance(node.parent, ast.ClassDef) else 'function',
-                        args=args,
-                        returns=returns,
-                        docstring=ast.get_docstring(node),
-                        decorators=decorators,
-                        methods=[]
-                    )
-                    
-                    # Add to appropriate parent
-                    if hasattr(node, 'parent') and isinstance(node.parent, ast.ClassDef) and node.parent in classes:
-                        classes[node.parent].methods.append(sig)
-                    else:
-                        signatures.append(sig)
-                
-                # Handle classes
-                elif isinstance(node, ast.ClassDef):
-                    bases = []
-                    for base in node.bases:
-                        if isinstance(base, ast.Name):
-                            bases.append(base.id)
-                    
-                    decorators = []
-                    for decorator in node.decorator_list:
-                        if isinstance(decorator, ast.Name):
-                            decorators.append(f"@{decorator.id}")
-                    
-                    class_sig = Signature(
-                        name=node.name,
-                        kind='class',
-                        args=bases,
-                        returns=None,
-                        docstring=ast.get_docstring(node),
-                        decorators=decorators,
-                        methods=[]
-                    )
-                    
-                    classes[node] = class_sig
-                    signatures.append(class_sig)
-                    
-            return signatures
+            visitor = ScopeVisitor(self)
+            visitor.visit(ast.parse(source))
+            return visitor.signatures
         except Exception as e:
             logger.error(f"Error parsing source: {e}")
             return []
@@ -170,47 +199,3 @@ class SignatureExtractor:
                 lines.append("")  # Add spacing between methods
         
         return lines
-
-def generate_python_summary(root_dir: str | Path) -> str:
-    """Generate enhanced Python project structure summary.
-    
-    Args:
-        root_dir: Root directory of the project
-        
-    Returns:
-        Formatted markdown string of Python signatures
-    """
-    root_dir = Path(root_dir)
-    extractor = SignatureExtractor()
-    content = ["# Python Project Structure\n"]
-    
-    for file in sorted(root_dir.rglob("*.py")):
-        if any(part.startswith('.') for part in file.parts):
-            continue
-        if '__pycache__' in file.parts:
-            continue
-            
-        try:
-            # Get relative path
-            rel_path = file.relative_to(root_dir)
-            
-            # Read and extract signatures
-            source = file.read_text()
-            signatures = extractor.extract_signatures(source)
-            
-            # Only include files that have actual content
-            if signatures:
-                content.append(f"## {rel_path}")
-                content.append("```python")
-                
-                # Format each signature
-                for sig in signatures:
-                    content.extend(extractor.format_signature(sig))
-                    content.append("")  # Add spacing between top-level items
-                
-                content.append("```\n")
-            
-        except Exception as e:
-            logger.error(f"Error processing {file}: {e}")
-    
-    return "\n".join(content)
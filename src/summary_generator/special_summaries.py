@@ -1,75 +1,215 @@
 """Special summary generators for project-wide summaries."""
 from pathlib import Path
-from typing import List
+from typing import Callable, Iterable, List, Optional
 from loguru import logger
-from .signature_extractor import SignatureExtractor, generate_python_summary  # New import
+from project_utils import report
+from .generator import SummaryGenerator
+from .manifest import Manifest
+from .python_summary import generate_python_summary, indexed_python_files, is_summarized_python_file
+from .scanner import FileIndex
+from .signature_cache import SignatureCache
+from .signature_extractor import SignatureExtractor
+
+# Files written to SUMMARIES/ by generate_special_summaries
+SPECIAL_SUMMARIES = ("READMEs.md", "README_SUBs.md", "PYTHON.md")
 
 class SpecialSummariesGenerator:
     """Generate special project-wide summary files."""
-    
-    def __init__(self, root_dir: str | Path):
-        """Initialize generator with root directory."""
+
+    def __init__(
+        self,
+        root_dir: str | Path,
+        incremental: bool = True,
+        jobs: int = 1,
+        cache: Optional[SignatureCache] = None,
+        summaries: Optional[SummaryGenerator] = None
+    ):
+        """Initialize generator with root directory.
+
+        Args:
+            root_dir: Root directory to generate summaries for
+            incremental: Skip summaries whose inputs are unchanged since the
+                last run, as recorded in the content-hash manifest
+            jobs: Number of processes used to parse Python files
+            cache: Optional cache of extracted Python signatures
+            summaries: Directory summary generator of the same run, whose
+                scan and file contents are shared; defaults to a new one
+        """
         self.root_dir = Path(root_dir)
         self.summaries_dir = self.root_dir / "SUMMARIES"
         self.signature_extractor = SignatureExtractor()  # New instance
-    
+        self.incremental = incremental
+        self.jobs = jobs
+        self.cache = cache
+        self.summaries = summaries or SummaryGenerator(self.root_dir, incremental=False)
+        self._manifest: Optional[Manifest] = None
+
+    @property
+    def index(self) -> FileIndex:
+        """Index of the project's files, shared with the directory summaries."""
+        return self.summaries.index
+
     def _find_readmes(self, include_root: bool = True) -> List[Path]:
         """Find all README files in the project."""
-        readmes = []
-        for file in self.root_dir.rglob("README.md"):
-            if not include_root and file.parent == self.root_dir:
+        index = self.index
+        return sorted(
+            file for file in [*index.files, *index.extra_files]
+            if file.name == "README.md" and (include_root or file.parent != self.root_dir)
+        )
+
+    def _concat_readmes(self, readmes: List[Path]) -> str:
+        """Concatenate README files with path headers."""
+        content = []
+        for readme in readmes:
+            text = self.index.read(readme)
+            if text is None:
                 continue
-            readmes.append(file)
-        return sorted(readmes)
-    
-    def generate_special_summaries(self) -> List[Path]:
+            rel_path = readme.relative_to(self.root_dir)
+            content.extend([
+                "=" * 80,
+                f"# {rel_path}",
+                "=" * 80,
+                text,
+                "\n"
+            ])
+        return "\n".join(content)
+
+    def _write_summary(
+        self,
+        output_path: Path,
+        inputs: List[Path],
+        build: Callable[[], str],
+        truncate: bool = True,
+        salt: str = ""
+    ) -> None:
+        """Write a summary file, skipping the build if its inputs are unchanged.
+
+        Args:
+            output_path: Path to the summary file
+            inputs: Files the summary is built from
+            build: Callable producing the summary content
+            truncate: Whether the build reads its inputs with the size caps;
+                if not, inputs over their cap are hashed in full
+            salt: Extra text that also affects the output, such as the
+                version of the code building it
+        """
+        manifest = self._manifest
+        if manifest is None:
+            with report.phase("render"):
+                content = build()
+            with report.phase("write"):
+                size = output_path.write_text(content)
+            report.count("write", files=1, bytes_written=size)
+            return
+
+        index = self.index
+
+        def file_hash(path: Path) -> Optional[str]:
+            if not truncate and index.is_truncated(path):
+                return manifest.file_hash(
+                    path, index.stat(path), lambda: index.read(path, truncate=False), variant="full"
+                )
+            return manifest.file_hash(path, index.stat(path), lambda: index.read(path))
+
+        digest = manifest.digest(
+            ((path.relative_to(self.root_dir).as_posix(), file_hash(path)) for path in inputs),
+            salt=f"{output_path.name};{salt}" if salt else output_path.name
+        )
+        if manifest.is_current(output_path, digest):
+            logger.debug(f"{output_path.name} is up to date")
+            report.count("render", cache_hits=1)
+            return
+        report.count("render", cache_misses=1)
+        with report.phase("render"):
+            content = build()
+        if not manifest.write_output(output_path, content, digest):
+            logger.debug(f"{output_path.name} is unchanged")
+
+    def _is_stale(
+        self,
+        output_path: Path,
+        changed: Optional[List[Path]],
+        relevant: Callable[[Path], bool]
+    ) -> bool:
+        """Check whether an output needs rebuilding given the changed paths.
+
+        Args:
+            output_path: Path to the summary file
+            changed: Changed paths, or None to rebuild everything
+            relevant: Predicate selecting changed paths the output depends on
+
+        Returns:
+            True if the output is missing or one of its inputs changed
+        """
+        if changed is None or not output_path.exists():
+            return True
+        return any(relevant(path) for path in changed)
+
+    def generate_special_summaries(self, changed: Optional[Iterable[Path]] = None) -> List[Path]:
         """Generate all special summary files.
-        
+
+        Args:
+            changed: Paths changed since the last run. If given, only the
+                summaries that depend on them (or are missing) are rebuilt.
+
         Returns:
             List of paths to generated summary files
         """
         self.summaries_dir.mkdir(exist_ok=True)
+        self._manifest = Manifest.load(self.root_dir) if self.incremental else None
+        changed = None if changed is None else list(changed)
         generated_files = []
-        
+
         # Generate READMEs.md
         readmes_path = self.summaries_dir / "READMEs.md"
-        readme_content = []
-        for readme in self._find_readmes(include_root=True):
-            rel_path = readme.relative_to(self.root_dir)
-            readme_content.extend([
-                "=" * 80,
-                f"# {rel_path}",
-                "=" * 80,
-                readme.read_text(),
-                "\n"
-            ])
-        readmes_path.write_text("\n".join(readme_content))
-        generated_files.append(readmes_path)
-        
+        if self._is_stale(readmes_path, changed, lambda path: path.name == "README.md"):
+            readmes = self._find_readmes(include_root=True)
+            self._write_summary(readmes_path, readmes, lambda: self._concat_readmes(readmes))
+            generated_files.append(readmes_path)
+
         # Generate README_SUBs.md
         subs_path = self.summaries_dir / "README_SUBs.md"
-        subs_content = []
-        for readme in self._find_readmes(include_root=False):
-            rel_path = readme.relative_to(self.root_dir)
-            subs_content.extend([
-                "=" * 80,
-                f"# {rel_path}",
-                "=" * 80,
-                readme.read_text(),
-                "\n"
-            ])
-        subs_path.write_text("\n".join(subs_content))
-        generated_files.append(subs_path)
-        
+        if self._is_stale(subs_path, changed,
+                          lambda path: path.name == "README.md" and path.parent != self.root_dir):
+            subs = self._find_readmes(include_root=False)
+            self._write_summary(subs_path, subs, lambda: self._concat_readmes(subs))
+            generated_files.append(subs_path)
+
         # Generate enhanced PYTHON.md
         python_path = self.summaries_dir / "PYTHON.md"
-        python_content = generate_python_summary(self.root_dir)  # Using new generator
-        python_path.write_text(python_content)
-        generated_files.append(python_path)
-        
+        if self._is_stale(python_path, changed, is_summarized_python_file):
+            self._write_summary(
+                python_path,
+                indexed_python_files(self.index),
+                lambda: generate_python_summary(
+                    self.root_dir, jobs=self.jobs, cache=self.cache, index=self.index
+                ),
+                # Python files are parsed in full, past any size cap
+                truncate=False,
+                salt=f"extractor={SignatureExtractor.VERSION}"
+            )
+            generated_files.append(python_path)
+
+        if self._manifest is not None:
+            self._manifest.save()
+
         return generated_files
 
-def generate_special_summaries(root_dir: str | Path = ".") -> List[Path]:
+def generate_special_summaries(
+    root_dir: str | Path = ".",
+    incremental: bool = True,
+    changed: Optional[Iterable[Path]] = None,
+    jobs: int = 1,
+    cache: Optional[SignatureCache] = None,
+    summaries: Optional[SummaryGenerator] = None
+) -> List[Path]:
     """Generate special summaries for the project."""
-    generator = SpecialSummariesGenerator(root_dir)
-    return generator.generate_special_summaries()
+    generator = SpecialSummariesGenerator(
+        root_dir, incremental=incremental, jobs=jobs, cache=cache, summaries=summaries
+    )
+    return generator.generate_special_summaries(changed=changed)
+
+def special_summary_paths(root_dir: str | Path = ".") -> List[Path]:
+    """List the special summaries on disk, whether or not this run wrote them."""
+    summaries_dir = Path(root_dir) / "SUMMARIES"
+    return [summaries_dir / name for name in SPECIAL_SUMMARIES if (summaries_dir / name).exists()]
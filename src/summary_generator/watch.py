@@ -0,0 +1,162 @@
+"""Keep summaries, the README and the site up to date while files change."""
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+from loguru import logger
+from project_utils.context import CONFIG_NAME, get_project_context
+from project_utils.watch import Snapshot, SnapshotWatcher, take_snapshot
+from readme_generator.generators.readme_generator import generate_readme
+from readme_generator.generators.section_cache import CACHE_DIR as README_CACHE_DIR
+from site_generator.cache import CACHE_DIR as SITE_CACHE_DIR
+from .changes import affected_directories
+from .generator import SummaryGenerator
+from .layout import LINKED
+from .manifest import CACHE_DIR
+from .signature_cache import SignatureCache
+from .special_summaries import generate_special_summaries
+
+
+class WatchSession:
+    """Incremental rebuilds that keep the generators' caches warm between runs.
+
+    The summary generator, its file index and the signature cache live as
+    long as the session, so a rebuild only reads the files that changed.
+    """
+
+    def __init__(
+        self,
+        root_dir: str | Path = ".",
+        readme: bool = True,
+        site: bool = True,
+        site_dir: str | Path = "_site",
+        jobs: int = 1,
+        streaming: bool = False,
+        layout: str = LINKED,
+        cache: Optional[SignatureCache] = None
+    ):
+        """Initialize a session for a root directory.
+
+        Args:
+            root_dir: Root directory to generate summaries for
+            readme: Regenerate README.md when its templates or config change
+            site: Rebuild the site when README.md or its template changes
+            site_dir: Output directory of the site
+            jobs: Number of processes and threads used by the summary generator
+            streaming: Stream file bodies into SUMMARY files
+            layout: SUMMARY layout, ``"linked"`` or ``"inline"``
+            cache: Signature cache for PYTHON.md; defaults to the one in
+                ``.summary_cache/``
+        """
+        self.root_dir = Path(root_dir).absolute()
+        self.readme = readme
+        self.site = site
+        self.site_dir = Path(site_dir).absolute()
+        self.jobs = jobs
+        self.cache = cache or SignatureCache(self.root_dir / CACHE_DIR / "signatures")
+        self.generator = SummaryGenerator(
+            self.root_dir, streaming=streaming, layout=layout, jobs=jobs
+        )
+
+    def _watch_directory(self, directory: Path) -> bool:
+        return (directory.name not in SummaryGenerator.EXCLUDED_DIRS and
+                directory.name not in (CACHE_DIR, README_CACHE_DIR, SITE_CACHE_DIR) and
+                directory != self.site_dir)
+
+    @staticmethod
+    def _watch_file(file: Path) -> bool:
+        # SUMMARY files are outputs only; .tmp files are outputs being written
+        return file.name != 'SUMMARY' and file.suffix != '.tmp'
+
+    def snapshot(self) -> Snapshot:
+        """Stat the files a rebuild may depend on."""
+        return take_snapshot(self.root_dir, self._watch_directory, self._watch_file)
+
+    def rebuild(self, changed: Optional[Iterable[Path]] = None) -> List[Path]:
+        """Regenerate the outputs affected by changed files.
+
+        Stages run in dependency order: the README, the special summaries,
+        the SUMMARY files (including those covering the new special
+        summaries) and finally the site. A failing stage is logged and
+        the later ones still run.
+
+        Args:
+            changed: Changed paths, or None to bring every output up to date
+
+        Returns:
+            Paths of the outputs that were checked or written
+        """
+        changed: Optional[Set[Path]] = None if changed is None else set(changed)
+        context = get_project_context(self.root_dir)
+        readme_path = context.root / "README.md"
+        outputs: List[Path] = []
+
+        if self.readme and (changed is None or any(
+            path == context.root / CONFIG_NAME or context.readme_template_dir in path.parents
+            for path in changed
+        )):
+            try:
+                outputs.append(readme_path)
+                if generate_readme(push=False, root=self.root_dir) and changed is not None:
+                    changed.add(readme_path)
+            except Exception as e:
+                logger.error(f"Error generating README: {e}")
+
+        special: List[Path] = []
+        try:
+            if changed is not None:
+                self.generator.refresh()
+            special = generate_special_summaries(
+                self.root_dir, changed=changed, jobs=self.jobs, cache=self.cache,
+                summaries=self.generator
+            )
+            outputs.extend(special)
+        except Exception as e:
+            logger.error(f"Error generating special summaries: {e}")
+
+        try:
+            if changed is None:
+                outputs.extend(self.generator.generate_all_summaries())
+            else:
+                directories = affected_directories([*changed, *special], self.root_dir)
+                outputs.extend(self.generator.generate_summaries(directories))
+        except Exception as e:
+            logger.error(f"Error generating summaries: {e}")
+
+        site_inputs = {readme_path, context.site_template_dir / "template.html"}
+        if self.site and (changed is None or not changed.isdisjoint(site_inputs)):
+            try:
+                # markdown2 is only installed with the site extra
+                from site_generator.generator import build_site
+                outputs.append(build_site(str(self.site_dir), root=context.root))
+            except Exception as e:
+                logger.error(f"Error building site: {e}")
+
+        return outputs
+
+
+def watch(
+    session: WatchSession,
+    interval: float = 0.5,
+    debounce: float = 0.2,
+    cycles: Optional[int] = None
+) -> None:
+    """Bring every output up to date, then rebuild after each burst of changes.
+
+    Args:
+        session: Session doing the rebuilds
+        interval: Seconds between polls while nothing changes
+        debounce: Seconds without changes before a rebuild starts
+        cycles: Stop after this many rebuilds; None watches until interrupted
+    """
+    session.rebuild()
+    watcher = SnapshotWatcher(session.snapshot, interval=interval, debounce=debounce)
+    logger.info(f"Watching {session.root_dir} for changes")
+    rebuilds = 0
+    while cycles is None or rebuilds < cycles:
+        changed = watcher.wait()
+        logger.info(f"{len(changed)} files changed, rebuilding")
+        start = time.perf_counter()
+        outputs = session.rebuild(changed)
+        watcher.absorb(outputs)
+        rebuilds += 1
+        logger.info(f"Rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms")
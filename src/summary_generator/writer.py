@@ -0,0 +1,165 @@
+"""Streaming SUMMARY writer that copies file bodies without loading them."""
+import codecs
+import os
+import shutil
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Set
+from loguru import logger
+from project_utils import report
+from .limits import SNIFF_BYTES, BinaryFileError, FileLimits, is_binary, truncation_marker
+
+SEPARATOR = '=' * 80
+CHUNK_SIZE = 64 * 1024
+
+
+class StreamingSummaryWriter:
+    """Write SUMMARY files by streaming each file body into the output.
+
+    Output is byte-identical to ``SummaryGenerator.generate_directory_summary``.
+    The first copy of a file validates it as UTF-8 and applies the universal
+    newline translation ``read_text`` would; files that needed no translation
+    are remembered and later copies into ancestor summaries go straight from
+    source to destination with ``os.sendfile``. Peak memory is one chunk,
+    whatever the size of the tree. With limits, binary files are skipped and
+    files over their cap are cut off exactly as ``FileLimits.read`` does.
+    """
+
+    def __init__(self, root_dir: str | Path, limits: Optional[FileLimits] = None):
+        """Initialize writer with the root used for relative file headers.
+
+        Args:
+            root_dir: Root directory summaries are generated for
+            limits: Size caps and binary detection applied to file bodies
+        """
+        self.root_dir = Path(root_dir)
+        self.limits = limits
+        self._verbatim: Set[Path] = set()
+        self._unreadable: Set[Path] = set()
+
+    def write(self, files: List[Path], output_path: Path, trailer: str = '') -> None:
+        """Stream a summary of the given files to a path.
+
+        Args:
+            files: Files to include, in summary order
+            output_path: Path to write the summary to
+            trailer: Text written after the file entries
+        """
+        with report.phase("write"):
+            written = self._write(files, output_path, trailer)
+        report.count("write", files=1, bytes_written=written)
+
+    def _write(self, files: List[Path], output_path: Path, trailer: str) -> int:
+        """Write the summary entries and return the number of bytes written."""
+        first = True
+        with open(output_path, 'wb') as dst:
+            for file_path in files:
+                if file_path in self._unreadable:
+                    continue
+
+                start = dst.tell()
+                rel_path = file_path.relative_to(self.root_dir)
+                prefix = '' if first else '\n'
+                header = f"{prefix}{SEPARATOR}\nFile: {rel_path}\n{SEPARATOR}\n"
+                dst.write(header.encode('utf-8'))
+                body_start = dst.tell()
+                try:
+                    self._copy_body(file_path, dst)
+                except Exception as e:
+                    # Drop the partial entry, as if the file had been skipped
+                    if isinstance(e, BinaryFileError):
+                        logger.debug("Skipping binary file {}", file_path)
+                    else:
+                        logger.error(f"Error processing {file_path}: {e}")
+                    self._unreadable.add(file_path)
+                    dst.seek(start)
+                    dst.truncate()
+                    continue
+                report.count("read", files=1, bytes_read=dst.tell() - body_start)
+                dst.write(b'\n\n')
+                first = False
+            if trailer:
+                dst.write(trailer.encode('utf-8') if first else b'\n' + trailer.encode('utf-8'))
+            return dst.tell()
+
+    def _copy_body(self, file_path: Path, dst: BinaryIO) -> None:
+        """Copy a file body, verbatim if it is known to need no translation."""
+        limit = self.limits.cap(file_path) if self.limits is not None else None
+        if limit is not None:
+            size = os.stat(file_path).st_size
+            if size > limit:
+                self._copy_translated(file_path, dst, limit)
+                dst.write(truncation_marker(limit, size).encode('utf-8'))
+                return
+        if file_path in self._verbatim:
+            self._copy_verbatim(file_path, dst)
+        elif self._copy_translated(file_path, dst):
+            self._verbatim.add(file_path)
+
+    def _copy_verbatim(self, file_path: Path, dst: BinaryIO) -> None:
+        """Copy raw bytes from source to destination, in-kernel where possible."""
+        with open(file_path, 'rb') as src:
+            dst.flush()
+            start = dst.tell()
+            try:
+                size = os.fstat(src.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except (AttributeError, OSError):
+                # No sendfile on this platform or file system
+                dst.seek(start)
+                dst.truncate()
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            else:
+                # sendfile moved the descriptor's offset behind the buffer's back
+                dst.seek(0, os.SEEK_END)
+
+    def _copy_translated(
+        self,
+        file_path: Path,
+        dst: BinaryIO,
+        limit: Optional[int] = None
+    ) -> bool:
+        """Copy a file chunk by chunk, validating UTF-8 and translating newlines.
+
+        Args:
+            file_path: File to copy
+            dst: Output to copy into
+            limit: Copy only this many bytes, dropping a trailing partial
+                character
+
+        Returns:
+            True if the bytes were copied unchanged
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        verbatim = True
+        pending_cr = False
+        remaining = limit
+        with open(file_path, 'rb') as src:
+            if self.limits is not None:
+                if is_binary(src.read(SNIFF_BYTES if limit is None else min(SNIFF_BYTES, limit))):
+                    raise BinaryFileError(f"{file_path} looks binary")
+                src.seek(0)
+            while chunk := src.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)):
+                if remaining is not None:
+                    remaining -= len(chunk)
+                decoder.decode(chunk)
+                if pending_cr and chunk.startswith(b'\n'):
+                    chunk = chunk[1:]
+                pending_cr = chunk.endswith(b'\r')
+                if b'\r' in chunk:
+                    verbatim = False
+                    chunk = chunk.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+                dst.write(chunk)
+        if limit is None:
+            decoder.decode(b'', final=True)
+        else:
+            # Undo the bytes of a character cut in half by the limit
+            partial = len(decoder.getstate()[0])
+            if partial:
+                dst.seek(-partial, os.SEEK_CUR)
+                dst.truncate()
+        return verbatim
@@ -0,0 +1,36 @@
+"""Tests for the benchmark harness."""
+from benchmarks import RepoSpec, build_repo
+from benchmarks.runner import compare
+from benchmarks.timing import measure
+
+def snapshot(root):
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob("*")) if path.is_file()
+    }
+
+def test_build_repo_is_deterministic(tmp_path):
+    """Test the same spec always builds the same tree."""
+    spec = RepoSpec(files=40, depth=2, fanout=3, file_size=256, classes=1, methods=2)
+    paths = build_repo(tmp_path / "a", spec)
+    build_repo(tmp_path / "b", spec)
+    assert len(paths) == 40
+    assert sum(path.suffix == ".py" for path in paths) == 16
+    assert snapshot(tmp_path / "a") == snapshot(tmp_path / "b")
+    assert (tmp_path / "a" / "src" / "dir0_2" / "dir1_1").is_dir()
+    assert (tmp_path / "a" / "docs" / "readme" / "base.md.j2").exists()
+
+def test_compare_flags_regressions():
+    """Test only slowdowns beyond the tolerance count as regressions."""
+    baseline = {"results": {"1k": {"tree": {"wall_s": 1.0}, "site": {"wall_s": 1.0}}}}
+    results = {"results": {"1k": {"tree": {"wall_s": 1.05}, "site": {"wall_s": 1.5},
+                                  "readme": {"wall_s": 9.0}}}}
+    regressions = compare(results, baseline, tolerance=0.1)
+    assert len(regressions) == 1
+    assert "site" in regressions[0]
+
+def test_measure_runs_setup_before_each_run():
+    """Test setup runs untimed before every repeat, so caches can be cleared."""
+    calls = []
+    measure(lambda: calls.append("run"), 3, setup=lambda: calls.append("setup"))
+    assert calls == ["setup", "run"] * 3
@@ -22,3 +22,44 @@ def test_project_root(mock_repo, monkeypatch):
     monkeypatch.chdir(mock_repo)
     root = get_project_root()
     assert root.samefile(mock_repo)
+
+def test_unchanged_outputs_skip_write_and_git(tmp_path, monkeypatch, capsys):
+    """Test that regenerating identical output touches neither the file nor git"""
+    import subprocess
+    from benchmarks import RepoSpec, build_repo
+    from readme_generator.__main__ import ReadmeGenerator
+    from readme_generator.generators import readme_generator, structure_generator
+    root = tmp_path / "repo"
+    build_repo(root, RepoSpec(files=4, depth=1, fanout=1, file_size=64))
+    monkeypatch.chdir(root)
+    commands = []
+    monkeypatch.setattr(subprocess, "run", lambda args, **kwargs: commands.append(args))
+    commits = []
+    record = lambda paths, message, **kwargs: commits.append(message)
+    monkeypatch.setattr(readme_generator, "commit_and_push", record)
+    
+    assert generate_readme(push=True)
+    assert commits == ["Update README.md"]
+    readme = root / "README.md"
+    mtime = readme.stat().st_mtime_ns
+    commits.clear()
+    
+    assert not generate_readme(push=True)
+    assert commits == commands == []
+    assert readme.stat().st_mtime_ns == mtime
+    
+    # The first run adds structure.md.j2 itself to the tree
+    structure_generator.update_structure(push=False)
+    assert structure_generator.update_structure(push=False)
+    assert commits == commands == []
+    monkeypatch.setattr(structure_generator, "commit_and_push", record)
+    assert not structure_generator.update_structure()
+    assert commits == commands == []
+    
+    # The new structure section changes the README once
+    assert generate_readme(push=False)
+    output = tmp_path / "github_output"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+    ReadmeGenerator().readme()
+    assert output.read_text() == "changed=false\n"
+    assert "changed=false" in capsys.readouterr().out
@@ -0,0 +1,84 @@
+"""Tests for the plumbing-based commit and push."""
+import subprocess
+import pytest
+from project_utils.git import commit_and_push
+
+def git(cwd, *args):
+    """Run git with a test identity and return its stripped output."""
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a clone with one commit on main and a local bare repo as origin."""
+    remote = tmp_path / "remote.git"
+    work = tmp_path / "work"
+    git(tmp_path, "init", "-q", "--bare", "-b", "main", str(remote))
+    git(tmp_path, "init", "-q", "-b", "main", str(work))
+    (work / "keep.txt").write_text("keep\n")
+    (work / "old.txt").write_text("old\n")
+    git(work, "add", ".")
+    git(work, "commit", "-q", "-m", "Initial commit")
+    git(work, "remote", "add", "origin", str(remote))
+    git(work, "push", "-q", "origin", "main")
+    return work, remote
+
+def test_commit_to_current_branch(repo):
+    """Test that files are committed and pushed, leaving a clean working tree."""
+    work, remote = repo
+    (work / "README.md").write_text("# Generated\n")
+    (work / "old.txt").unlink()
+
+    result = commit_and_push([work / "README.md", work / "old.txt"], "Update README.md", root=work)
+
+    assert result.changed and result.pushed and result.branch == "main"
+    assert git(remote, "rev-parse", "main") == result.commit == git(work, "rev-parse", "HEAD")
+    assert git(remote, "show", "main:README.md") == "# Generated"
+    assert git(remote, "ls-tree", "--name-only", "main").split() == ["README.md", "keep.txt"]
+    assert git(remote, "log", "-1", "--format=%an %s", "main") == "github-actions[bot] Update README.md"
+    assert git(work, "status", "--porcelain") == ""
+    assert result.timings["push"] > 0
+
+def test_unchanged_files_make_no_commit(repo):
+    """Test that committing files identical to the parent stops before commit-tree."""
+    work, remote = repo
+    head = git(work, "rev-parse", "HEAD")
+
+    result = commit_and_push([work / "keep.txt"], "No-op", root=work)
+
+    assert not result.changed and not result.pushed
+    assert set(result.timings) == {"rev-parse", "hash-object", "update-index", "write-tree"}
+    assert git(work, "rev-parse", "HEAD") == head
+
+def test_force_push_generated_branch(repo):
+    """Test that a generated branch is rebuilt on its base without a checkout."""
+    work, remote = repo
+    summary = work / "SUMMARY"
+    summary.write_text("first\n")
+    first = commit_and_push([summary], "Summaries", branch="summaries", base_branch="main",
+                            force=True, root=work)
+    summary.write_text("second\n")
+    second = commit_and_push([summary], "Summaries", branch="summaries", base_branch="main",
+                             force=True, root=work)
+
+    main = git(work, "rev-parse", "main")
+    assert git(remote, "rev-parse", "summaries") == second.commit != first.commit
+    assert git(remote, "rev-parse", "summaries^") == main
+    assert git(remote, "show", "summaries:SUMMARY") == "second"
+    assert git(work, "symbolic-ref", "--short", "HEAD") == "main"
+    assert git(work, "status", "--porcelain") == "?? SUMMARY"
+
+def test_existing_branch_is_extended(repo):
+    """Test that without force a commit builds on the branch's own history."""
+    work, remote = repo
+    notes = work / "notes.md"
+    notes.write_text("one\n")
+    first = commit_and_push([notes], "Notes", branch="notes", remote=None, root=work)
+    notes.write_text("two\n")
+    second = commit_and_push([notes], "Notes", branch="notes", root=work)
+
+    assert not first.pushed
+    assert git(work, "rev-parse", "notes^") == first.commit
+    assert git(remote, "rev-parse", "notes") == second.commit
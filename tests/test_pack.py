@@ -0,0 +1,40 @@
+"""Tests for packed summary output."""
+import json
+import pytest
+from summary_generator import PackReader, SummaryGenerator
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a small project with nested, CRLF and binary files."""
+    (tmp_path / "README.md").write_text("# Project")
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "main.py").write_text("print('é')\n")
+    (tmp_path / "src" / "pkg" / "crlf.txt").write_bytes(b"a\r\nb\r\n")
+    (tmp_path / "src" / "pkg" / "blob.json").write_bytes(b"\0\1\2")
+    return tmp_path
+
+def test_pack_round_trip(project):
+    """Test every packed file can be read back through the index."""
+    paths = SummaryGenerator(project).generate_pack()
+    
+    assert paths == [project / "SUMMARIES/pack.bin", project / "SUMMARIES/pack.json"]
+    json.loads(paths[1].read_text())
+    with PackReader(project / "SUMMARIES") as pack:
+        assert pack.paths() == ["README.md", "src/main.py", "src/pkg/crlf.txt"]
+        assert pack.read("src/main.py", verify=True) == "print('é')\n"
+        assert pack.read("src/pkg/crlf.txt") == "a\nb\n"
+        assert "src/pkg/blob.json" not in pack
+
+def test_pack_is_incremental(project):
+    """Test an unchanged tree leaves the pack alone and changes rebuild it."""
+    pack_path, index_path = SummaryGenerator(project).generate_pack()
+    mtime = pack_path.stat().st_mtime_ns
+    
+    SummaryGenerator(project).generate_pack()
+    assert pack_path.stat().st_mtime_ns == mtime
+    
+    (project / "src" / "main.py").write_text("print('changed')\n")
+    SummaryGenerator(project).generate_pack()
+    with PackReader(project / "SUMMARIES") as pack:
+        assert pack.read("src/main.py", verify=True) == "print('changed')\n"
+        assert "SUMMARIES/pack.json" not in pack
@@ -0,0 +1,52 @@
+"""Tests for the shared path filter."""
+from pathlib import Path
+from project_utils.path_filter import PathFilter, translate
+
+def test_component_patterns_exclude_whole_directories():
+    """Test that unanchored patterns match any path component."""
+    path_filter = PathFilter([".git", "__pycache__", "*.pyc"])
+    
+    assert path_filter.is_excluded(".git/config")
+    assert path_filter.is_excluded(Path("foo/__pycache__/bar.py"))
+    assert path_filter.is_excluded("test.pyc")
+    assert path_filter.is_included(".github/workflows/test.yml")
+    assert path_filter.is_included("my_cache/file.txt")
+
+def test_anchored_and_recursive_patterns():
+    """Test patterns containing slashes are anchored to the root."""
+    path_filter = PathFilter(["/docs/*.tmp", ".github/workflows", "**/generated"])
+    
+    assert path_filter.is_excluded("docs/draft.tmp")
+    assert path_filter.is_included("src/docs/draft.tmp")
+    assert path_filter.is_included("docs/nested/draft.tmp")
+    assert path_filter.is_excluded(".github/workflows/build.yml")
+    assert path_filter.is_included("sub/.github/workflows/build.yml")
+    assert path_filter.is_excluded("a/b/generated/out.py")
+
+def test_directory_only_patterns():
+    """Test that a trailing slash only matches directories."""
+    path_filter = PathFilter(["build/"])
+    
+    assert path_filter.is_excluded("build", is_dir=True)
+    assert path_filter.is_excluded("build/lib/module.py")
+    assert path_filter.is_included("build")
+
+def test_negated_patterns():
+    """Test that later negations re-include paths, except inside excluded directories."""
+    path_filter = PathFilter(["*.log", "!keep.log", "logs/"])
+    
+    assert path_filter.is_excluded("debug.log")
+    assert path_filter.is_included("src/keep.log")
+    assert path_filter.is_excluded("logs/keep.log")
+
+def test_paths_are_relative_to_root(tmp_path):
+    """Test that anchored patterns apply to paths under the given root."""
+    path_filter = PathFilter(["/out"], root=tmp_path)
+    
+    assert path_filter.is_excluded(tmp_path / "out" / "file.txt")
+    assert path_filter.is_included(tmp_path / "src" / "out")
+
+def test_translate_character_classes():
+    """Test glob translation keeps wildcards within one component."""
+    assert translate("*.py") == r"[^/]*\.py"
+    assert translate("[!a-c]?") == r"[^a-c][^/]"
@@ -0,0 +1,72 @@
+"""Tests for the cProfile wrapper."""
+import pstats
+from project_utils.profiling import MAX_DEPTH, collapsed_stacks, profiling
+
+def inner():
+    return sum(i * i for i in range(20000))
+
+def outer():
+    return [inner() for _ in range(3)]
+
+def test_profiling_writes_pstats_and_collapsed(tmp_path, capsys):
+    """Test a profile run writes both files and prints the top functions."""
+    path = tmp_path / "run.pstats"
+    with profiling(str(path), top=5):
+        outer()
+
+    assert pstats.Stats(str(path)).total_calls > 0
+    lines = (tmp_path / "run.collapsed").read_text().splitlines()
+    stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+    assert any("outer (" in stack and "inner (" in stack for stack in stacks)
+    assert all(value > 0 for value in stacks.values())
+    assert "cumulative" in capsys.readouterr().out
+
+def test_profiling_disabled_by_default(tmp_path, monkeypatch):
+    """Test nothing is written when profiling is not requested."""
+    monkeypatch.chdir(tmp_path)
+    with profiling() as profiler:
+        outer()
+    assert profiler is None
+    assert not list(tmp_path.iterdir())
+
+class FakeStats:
+    """Profile statistics built from (caller, callee, cumulative seconds) calls."""
+    
+    def __init__(self, own, calls):
+        callers = {func: {} for func in own}
+        cumulative = dict(own)
+        for caller, callee, edge in calls:
+            callers[callee][caller] = (1, 1, 0.0, edge)
+            cumulative[caller] += edge
+        self.stats = {func: (1, 1, seconds, cumulative[func], callers[func]) for func, seconds in own.items()}
+
+def total_microseconds(lines):
+    return sum(int(line.rsplit(" ", 1)[1]) for line in lines)
+
+def test_collapsed_stacks_bounded_for_many_paths():
+    """Test that a profile with exponentially many call paths stays small and keeps its time."""
+    levels = 40
+    funcs = [[("mod.py", level, f"f{level}{side}") for side in "ab"] for level in range(levels)]
+    own = {func: 0.001 for level in funcs for func in level}
+    calls = []
+    for level in range(levels - 1, 0, -1):
+        cumulative = 0.001 * (levels - level)
+        calls += [(caller, callee, cumulative / 2) for caller in funcs[level - 1] for callee in funcs[level]]
+    
+    lines = collapsed_stacks(FakeStats(own, calls))
+    
+    assert len(lines) < 100000
+    expected = round(1e6 * sum(FakeStats(own, calls).stats[root][3] for root in funcs[0]))
+    assert abs(total_microseconds(lines) - expected) < expected * 0.01
+
+def test_collapsed_stacks_deep_chain():
+    """Test that a call chain deeper than the recursion limit is cut off at MAX_DEPTH frames."""
+    funcs = [("mod.py", depth, f"f{depth}") for depth in range(2000)]
+    own = {func: 0.001 for func in funcs}
+    calls = [(caller, callee, 0.001 * (len(funcs) - depth))
+             for depth, (caller, callee) in enumerate(zip(funcs, funcs[1:]), start=1)]
+    
+    lines = collapsed_stacks(FakeStats(own, calls))
+    
+    assert max(line.count(";") + 1 for line in lines) == MAX_DEPTH
+    assert total_microseconds(lines) == 2000 * 1000
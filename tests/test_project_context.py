@@ -0,0 +1,50 @@
+"""Tests for the shared project context."""
+import os
+import pytest
+from project_utils.context import clear_cache, find_project_root, get_project_context
+from summary_generator import SummaryGenerator
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a project with a nested package and summary config."""
+    clear_cache()
+    (tmp_path / "pyproject.toml").write_text(
+        '[project]\nname = "demo"\n\n'
+        '[tool.summary]\nignore_patterns = ["generated"]\n'
+    )
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    yield tmp_path
+    clear_cache()
+
+def test_root_found_from_subdirectory(project):
+    """Test the root is found by walking up from a nested directory."""
+    assert find_project_root(project / "src" / "pkg") == project
+    assert get_project_context(project / "src").config["project"]["name"] == "demo"
+
+def test_config_parsed_once(project):
+    """Test the parsed config is reused while the file is unchanged."""
+    first = get_project_context(project)
+    second = get_project_context(project / "src")
+    assert first.config is second.config
+    assert first.readme_template_dir == project / "docs" / "readme"
+
+def test_config_invalidated_by_mtime(project):
+    """Test editing pyproject.toml is picked up without clearing the cache."""
+    config_path = project / "pyproject.toml"
+    get_project_context(project)
+    config_path.write_text('[project]\nname = "renamed"\n')
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert get_project_context(project).config["project"]["name"] == "renamed"
+
+def test_summary_reads_ignore_patterns(project):
+    """Test summary generation honors [tool.summary] ignore_patterns."""
+    (project / "src" / "pkg" / "keep.py").write_text("x = 1")
+    (project / "src" / "generated").mkdir()
+    (project / "src" / "generated" / "out.py").write_text("y = 2")
+    gen = SummaryGenerator(project)
+    assert gen.should_include_file(project / "src" / "pkg" / "keep.py")
+    assert not gen.should_include_file(project / "src" / "generated" / "out.py")
+    assert SummaryGenerator(project, ignore_patterns=[]).should_include_file(
+        project / "src" / "generated" / "out.py"
+    )
@@ -0,0 +1,122 @@
+"""Tests for Python signature extraction and the PYTHON.md summary."""
+import pytest
+from pathlib import Path
+from summary_generator.python_summary import generate_python_summary
+
+@pytest.fixture
+def python_project(tmp_path):
+    """Create a project with several Python modules."""
+    for i in range(6):
+        package = tmp_path / f"pkg{i}"
+        package.mkdir()
+        (package / "module.py").write_text(f'''
+class Widget{i}(Base):
+    """Widget number {i}."""
+
+    def render(self, size: int = 1) -> str:
+        """Render the widget."""
+        return str(size)
+
+def helper{i}(value: list[str]) -> str | None:
+    return None
+''')
+    (tmp_path / "broken.py").write_text("def broken(:\n")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden/skip.py").write_text("def skipped(): pass")
+    return tmp_path
+
+def test_generate_python_summary(python_project):
+    """Test that signatures are grouped per file with class methods nested."""
+    summary = generate_python_summary(python_project)
+    
+    assert summary.startswith("# Python Project Structure\n")
+    assert "## pkg0/module.py" in summary
+    assert "class Widget0(Base)" in summary
+    assert "    def render(self, size: int) -> str" in summary
+    assert "def helper0(value: list[str]) -> str | None" in summary
+    assert "skipped" not in summary
+    assert "broken.py" not in summary
+
+def test_generate_python_summary_parallel_matches_serial(python_project):
+    """Test that parallel extraction produces identical, ordered output."""
+    serial = generate_python_summary(python_project, jobs=1)
+    parallel = generate_python_summary(python_project, jobs=3)
+    
+    assert parallel == serial
+
+def test_signature_cache_skips_parsing(python_project, tmp_path, monkeypatch):
+    """Test that a repeat run reuses cached signatures instead of parsing."""
+    from summary_generator.signature_cache import SignatureCache
+    from summary_generator.signature_extractor import SignatureExtractor
+    
+    cache = SignatureCache(tmp_path / "cache")
+    first = generate_python_summary(python_project, cache=cache)
+    
+    def fail(self, source):
+        raise AssertionError("source was parsed despite a cache hit")
+    monkeypatch.setattr(SignatureExtractor, "extract_signatures", fail)
+    
+    assert generate_python_summary(python_project, cache=cache) == first
+
+def test_signature_cache_evicts_least_recently_used(tmp_path):
+    """Test that eviction drops the oldest entries first."""
+    import os
+    from summary_generator.signature_cache import SignatureCache
+    from summary_generator.signature_extractor import SignatureExtractor
+    
+    cache = SignatureCache(tmp_path / "cache")
+    extractor = SignatureExtractor()
+    sources = [f"def f{i}(): pass" for i in range(3)]
+    for i, source in enumerate(sources):
+        cache.put(source, extractor.extract_signatures(source))
+        entry = cache._entry_path(source)
+        os.utime(entry, ns=(i * 10**9, i * 10**9))
+    cache.get(sources[0])  # Refresh the oldest entry
+    
+    entry_size = cache._entry_path(sources[2]).stat().st_size
+    cache.max_bytes = entry_size * 2
+    assert cache.evict() == 1
+    
+    assert cache.get(sources[1]) is None
+    assert cache.get(sources[0])[0].name == "f0"
+    assert cache.get(sources[2])[0].name == "f2"
+    
+    cache.clear()
+    assert cache.get(sources[0]) is None
+
+def test_extract_nested_classes_and_closures():
+    """Test that only class-level functions nest; other definitions are listed at module level."""
+    from summary_generator.signature_extractor import SignatureExtractor
+    
+    source = '''
+def outer():
+    def closure(): pass
+    class Local: pass
+    return closure
+
+class Outer:
+    class Inner:
+        def inner_method(self): pass
+
+    if True:
+        def conditional(self): pass
+
+    def method(self):
+        def helper(): pass
+
+try:
+    def guarded(): pass
+except ImportError:
+    pass
+'''
+    signatures = SignatureExtractor().extract_signatures(source)
+    
+    assert [(sig.name, sig.kind) for sig in signatures] == [
+        ("outer", "function"), ("closure", "function"), ("Local", "class"), ("Outer", "class"),
+        ("Inner", "class"), ("helper", "function"), ("guarded", "function")
+    ]
+    assert [(sig.name, sig.kind) for sig in signatures[3].methods] == [
+        ("conditional", "method"), ("method", "method")
+    ]
+    assert [sig.name for sig in signatures[4].methods] == ["inner_method"]
+    assert signatures[0].methods == []
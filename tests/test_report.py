@@ -0,0 +1,55 @@
+"""Tests for run reports."""
+import json
+from project_utils import report
+from summary_generator import SummaryGenerator
+
+def test_phases_are_noops_without_report():
+    """Test phases and counters do nothing when no report is active."""
+    assert report.current_report() is None
+    with report.phase("scan"):
+        report.count("scan", files=1)
+    assert report.current_report() is None
+
+def test_reporting_writes_json(tmp_path):
+    """Test a report records phases and is written on exit."""
+    path = tmp_path / "out" / "report.json"
+    with report.reporting(path, "test") as run:
+        with report.phase("read"):
+            report.count("read", files=2, bytes_read=10, cache_hits=1)
+        with report.phase("read"):
+            pass
+        run.merge({"read": {"files": 3, "cpu_s": 0.5}})
+    data = json.loads(path.read_text())
+    assert data["command"] == "test"
+    read = data["phases"]["read"]
+    assert read["calls"] == 2
+    assert read["files"] == 5
+    assert read["bytes_read"] == 10
+    assert read["cache_hits"] == 1
+    assert read["cpu_s"] >= 0.5
+    assert report.current_report() is None
+
+def test_summary_generation_reports_phases(tmp_path):
+    """Test summary generation records scan, read, render and write phases."""
+    project = tmp_path / "project"
+    (project / "pkg").mkdir(parents=True)
+    (project / "pkg" / "module.py").write_text("x = 1\n")
+    with report.reporting(tmp_path / "report.json") as run:
+        SummaryGenerator(project, incremental=False).generate_all_summaries()
+    phases = run.phases
+    assert phases["scan"].files == 1
+    assert phases["read"].bytes_read == 6
+    assert phases["render"].calls == 1
+    assert phases["write"].files == 1
+
+def test_truncated_reads_count_bytes_read(tmp_path):
+    """Test files cut off at their size cap count only the bytes read."""
+    from summary_generator.limits import FileLimits
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "big.txt").write_text("x" * 100)
+    (project / "small.txt").write_text("y" * 5)
+    with report.reporting(tmp_path / "report.json") as run:
+        SummaryGenerator(project, incremental=False,
+                         limits=FileLimits(max_bytes=10)).generate_all_summaries()
+    assert run.phases["read"].bytes_read == 15
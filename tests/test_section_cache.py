@@ -0,0 +1,62 @@
+"""Tests for cached README section rendering."""
+import jinja2
+import pytest
+from benchmarks import RepoSpec, build_repo
+from readme_generator.generators.readme_generator import generate_readme
+from readme_generator.generators.section_cache import variable_paths
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a synthetic project with three section templates."""
+    root = tmp_path / "repo"
+    build_repo(root, RepoSpec(files=4, depth=1, fanout=1, file_size=64))
+    return root
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Record the name of every template rendered."""
+    names = []
+    render = jinja2.Template.render
+
+    def record(self, *args, **kwargs):
+        names.append(self.name)
+        return render(self, *args, **kwargs)
+
+    monkeypatch.setattr(jinja2.Template, "render", record)
+    return names
+
+def test_variable_paths():
+    """Test that lookups are found and dynamic templates are not memoized."""
+    env = jinja2.Environment()
+    ast = env.parse("{{ project.name }} {{ project['version'] }} {% for x in readme.items %}{{ x }}{% endfor %}")
+    assert variable_paths(ast) == [("project", "name"), ("project", "version"), ("readme", "items")]
+    assert variable_paths(env.parse('{% include "other.j2" %}')) is None
+    assert variable_paths(env.parse("{{ get_section_templates() }}")) is None
+
+def test_sections_render_only_when_their_inputs_change(project, rendered):
+    """Test that a config change re-renders just the sections reading it."""
+    readme = project / "README.md"
+    assert generate_readme(push=False, root=project)
+    first = readme.read_text()
+    assert rendered.count("base.md.j2") == 1
+    assert sum(name.startswith("sections/") for name in rendered) == 3
+
+    rendered.clear()
+    assert not generate_readme(push=False, root=project)
+    assert readme.read_text() == first
+    assert rendered == ["base.md.j2"]
+
+    sections = project / "docs" / "readme" / "sections"
+    (sections / "usage.md.j2").write_text("## Usage\n\nSee {{ readme.title }}.\n")
+    rendered.clear()
+    generate_readme(push=False, root=project)
+    assert rendered == ["base.md.j2", "sections/usage.md.j2"]
+
+    config = project / "pyproject.toml"
+    config.write_text(config.read_text().replace("Synthetic repository", "Changed repository"))
+    rendered.clear()
+    assert generate_readme(push=False, root=project)
+    output = readme.read_text()
+    assert sorted(rendered) == ["base.md.j2", "sections/development.md.j2", "sections/introduction.md.j2"]
+    assert output.count("Changed repository") == 2
+    assert "See Synthetic Project." in output
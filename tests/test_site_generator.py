@@ -1,4 +1,5 @@
 """Tests for site generation functionality."""
+import json
 import pytest
 from pathlib import Path
 
@@ -66,3 +67,191 @@ def test_build_site_missing_readme(temp_site_dir, mock_template, monkeypatch):
     
     with pytest.raises(FileNotFoundError, match="README not found"):
         build_site(str(temp_site_dir))
+
+@pytest.fixture
+def docs_tree(tmp_path):
+    """Create a project with nested READMEs, summaries and an ignored directory."""
+    root = tmp_path / "project"
+    (root / "docs" / "site").mkdir(parents=True)
+    (root / "docs" / "site" / "template.html").write_text(
+        '<html><nav data-root="{{root}}">{{nav}}</nav><main>{{content}}</main>{{unused}}</html>'
+    )
+    (root / "pyproject.toml").write_text('[project]\nname = "docs"\n\n[tool.site]\nignore_patterns = [".venv"]\n')
+    (root / "README.md").write_text("# Home Page\n\nSee [the package](pkg/README.md#usage).\n")
+    (root / "pkg" / "sub").mkdir(parents=True)
+    (root / "pkg" / "README.md").write_text("# Package\n\n## Usage\n\nBack [home](../README.md), [sub](sub/).\n")
+    (root / "pkg" / "sub" / "README.md").write_text("No heading here.\n")
+    (root / "SUMMARIES").mkdir()
+    (root / "SUMMARIES" / "PYTHON.md").write_text("# Python\n\n[External](https://example.com)\n")
+    (root / ".venv").mkdir()
+    (root / ".venv" / "README.md").write_text("# Ignored\n")
+    return root
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_build_pages(docs_tree, tmp_path, jobs):
+    """Test that every README and summary becomes a linked page."""
+    from site_generator.pages import build_pages
+    site = tmp_path / "site"
+    
+    written = build_pages(str(site), root=docs_tree, jobs=jobs)
+    
+    assert sorted(path.relative_to(site).as_posix() for path in written) == [
+        "SUMMARIES/PYTHON.html", "index.html", "pkg/index.html", "pkg/sub/index.html"
+    ]
+    home = (site / "index.html").read_text()
+    assert '<a href="pkg/#usage">the package</a>' in home
+    assert '<a href="./" aria-current="page">Home Page</a>' in home
+    assert "{{unused}}" in home
+    
+    package = (site / "pkg" / "index.html").read_text()
+    assert '<h2 id="usage">Usage</h2>' in package
+    assert '<a href="../">home</a>' in package and '<a href="sub/">sub</a>' in package
+    assert '<a href="../SUMMARIES/PYTHON.html">Python</a>' in package
+    assert '<a href="sub/">pkg/sub</a>' in package
+    assert "Ignored" not in package
+    assert 'href="https://example.com"' in (site / "SUMMARIES" / "PYTHON.html").read_text()
+
+def test_convert_all_worker_count(monkeypatch):
+    """Test that few pages convert in-process and workers never outnumber chunks."""
+    from concurrent.futures import ProcessPoolExecutor
+    from site_generator import pages
+    from site_generator.generator import convert
+    started = []
+    class RecordingExecutor(ProcessPoolExecutor):
+        def __init__(self, max_workers):
+            started.append(max_workers)
+            super().__init__(max_workers=max_workers)
+    monkeypatch.setattr(pages, "ProcessPoolExecutor", RecordingExecutor)
+    sources = [f"# Page {i}\n\nText.\n" for i in range(pages.MIN_PARALLEL_PAGES)]
+    
+    assert list(pages.convert_all(sources[:3], jobs=0)) == [convert(source) for source in sources[:3]]
+    assert started == []
+    
+    assert list(pages.convert_all(sources, jobs=64)) == [convert(source) for source in sources]
+    assert started == [len(sources)]
+
+def snapshot(directory):
+    """Map each file under a directory to its mtime."""
+    return {path: path.stat().st_mtime_ns for path in directory.rglob("*") if path.is_file()}
+
+def test_build_pages_is_incremental(docs_tree, tmp_path, monkeypatch):
+    """Test that only changed pages are converted and rewritten."""
+    from site_generator import generator, pages
+    site = tmp_path / "site"
+    pages.build_pages(str(site), root=docs_tree, jobs=1)
+    converted = []
+    render = generator.render_markdown
+    monkeypatch.setattr(generator, "render_markdown", lambda md: converted.append(md) or render(md))
+    before = snapshot(site)
+    cache_mtime = (docs_tree / ".site_cache" / "pages.json").stat().st_mtime_ns
+    
+    pages.build_pages(str(site), root=docs_tree, jobs=1)
+    assert converted == []
+    assert snapshot(site) == before
+    assert (docs_tree / ".site_cache" / "pages.json").stat().st_mtime_ns == cache_mtime
+    
+    entries = snapshot(docs_tree / ".site_cache" / "markdown")
+    assert len(entries) == 4
+    
+    (docs_tree / "pkg" / "README.md").write_text("# Package\n\nEdited.\n")
+    pages.build_pages(str(site), root=docs_tree, jobs=1)
+    after = snapshot(site)
+    assert converted == ["# Package\n\nEdited.\n"]
+    # Only the edited page's converted markdown is written; the old entry is removed
+    edited = snapshot(docs_tree / ".site_cache" / "markdown")
+    assert len(edited) == 4 and len(set(edited.items()) - set(entries.items())) == 1
+    assert {path for path in after if after[path] != before[path]} == {
+        site / "pkg" / "index.html", site / "search.json"
+    }
+    assert "edited" in json.loads((site / "search.json").read_text())["terms"]
+    
+    # A new page changes every page's navigation, but no other page is converted again
+    converted.clear()
+    (docs_tree / "SUMMARIES" / "TESTS.md").write_text("# Tests\n")
+    pages.build_pages(str(site), root=docs_tree, jobs=1)
+    assert converted == ["# Tests\n"]
+    assert "TESTS.html" in (site / "index.html").read_text()
+    
+    (docs_tree / "SUMMARIES" / "TESTS.md").unlink()
+    pages.build_pages(str(site), root=docs_tree, jobs=1)
+    assert not (site / "SUMMARIES" / "TESTS.html").exists()
+
+def test_build_site_skips_unchanged(temp_site_dir, mock_readme, mock_template, monkeypatch):
+    """Test that an unchanged README and template leave the page untouched."""
+    from site_generator import generator
+    monkeypatch.setattr(generator, "get_project_root", lambda: mock_readme.parent)
+    page = build_site(str(temp_site_dir))
+    mtime = page.stat().st_mtime_ns
+    monkeypatch.setattr(generator, "render_markdown", lambda md: pytest.fail("converted again"))
+    
+    assert build_site(str(temp_site_dir)) == page
+    assert page.stat().st_mtime_ns == mtime
+    
+    # A template change reuses the converted README
+    mock_template.write_text("<html><main>{{content}}</main></html>")
+    build_site(str(temp_site_dir))
+    assert page.read_text().startswith("<html><main><h1")
+
+def test_search_index(docs_tree, tmp_path):
+    """Test that terms map to the page sections containing them."""
+    from site_generator.pages import build_pages
+    from site_generator.search import build_index, extract_sections
+    site = tmp_path / "site"
+    build_pages(str(site), root=docs_tree, jobs=1)
+    index = json.loads((site / "search.json").read_text())
+    assert index["terms"] == sorted(index["terms"])
+    postings = dict(zip(index["terms"], index["postings"]))
+    
+    def lookup(term):
+        return [
+            (index["pages"][page][0], anchor, heading)
+            for page, anchor, heading in (index["sections"][number] for number in postings[term])
+        ]
+    
+    assert lookup("usage") == [("pkg/", "usage", "Usage")]
+    assert lookup("package") == [("./", "home-page", "Home Page"), ("pkg/", "package", "Package")]
+    assert lookup("heading") == [("pkg/sub/", "", "")]
+    assert 'data-root="../../"' in (site / "pkg" / "sub" / "index.html").read_text()
+    
+    assert extract_sections('<p>Intro &amp; more</p><h2 id="a-b">A <code>b</code></h2><p>Body</p>') == [
+        ("", "", ["intro", "more"]), ("a-b", "A b", ["body"])
+    ]
+    
+    # Terms are ordered as JavaScript compares strings, by UTF-16 code units
+    index = json.loads(build_index([("./", "Page", [("", "", ["été", "x\uff41", "x\U0001d41a"])])]))
+    assert index["terms"] == ["x\U0001d41a", "x\uff41", "été"]
+    assert index["postings"] == [[0], [0], [0]]
+
+def test_optimized_build(docs_tree, tmp_path):
+    """Test that styles move to a hashed asset and pages are minified and gzipped."""
+    import gzip
+    from site_generator.optimize import minify_html
+    from site_generator.pages import build_pages
+    (docs_tree / "docs" / "site" / "template.html").write_text(
+        "<html>\n  <head>\n    <style>\n      body {\n        margin: 0;\n      }\n    </style>\n  </head>\n"
+        "  <body>\n    <!-- page -->\n    <nav>{{nav}}</nav>\n    {{content}}\n  </body>\n</html>\n"
+    )
+    (docs_tree / "pkg" / "README.md").write_text("# Package\n\n```\nkeep   this\n    indented\n```\n")
+    site = tmp_path / "site"
+    
+    build_pages(str(site), root=docs_tree, jobs=1, optimize=True)
+    
+    [stylesheet] = (site / "assets").glob("site.*.css")
+    assert stylesheet.read_text() == "body{margin:0}"
+    package = (site / "pkg" / "index.html").read_text()
+    assert f'<link rel="stylesheet" href="../assets/{stylesheet.name}">' in package
+    assert "<style>" not in package and "<!--" not in package and "\n  " not in package.split("<pre>")[0]
+    assert "keep   this\n    indented" in package
+    assert gzip.decompress((site / "pkg" / "index.html.gz").read_bytes()).decode() == package
+    assert (site / "search.json.gz").exists() and (site / "assets" / (stylesheet.name + ".gz")).exists()
+    
+    before = snapshot(site)
+    build_pages(str(site), root=docs_tree, jobs=1, optimize=True)
+    assert snapshot(site) == before
+    
+    build_pages(str(site), root=docs_tree, jobs=1)
+    assert "<style>" in (site / "pkg" / "index.html").read_text()
+    assert not (site / "pkg" / "index.html.gz").exists()
+    assert not (site / "assets").exists()
+    
+    assert minify_html("<p>a   b\n   c</p>\n<script>\n    x();\n</script>") == "<p>a b\nc</p>\n<script>\nx();\n</script>\n"
@@ -66,3 +66,460 @@ def test_generate_all_summaries(generator, temp_project):
     src_summary = (temp_project / "src/SUMMARY").read_text()
     assert "print('hello')" in src_summary
     assert "def test(): pass" in src_summary
+
+def test_generate_all_summaries_reads_each_file_once(temp_project, monkeypatch):
+    """Test that nested files are read once and shared by every ancestor."""
+    generator = SummaryGenerator(temp_project, layout="inline")
+    (temp_project / "src/pkg").mkdir()
+    (temp_project / "src/pkg/deep.py").write_text("x = 1")
+    
+    from summary_generator.limits import FileLimits
+    reads = []
+    original_read = FileLimits.read
+    def counting_read(self, path, size):
+        reads.append(path)
+        return original_read(self, path, size)
+    monkeypatch.setattr(FileLimits, "read", counting_read)
+    
+    generator.generate_all_summaries()
+    
+    assert reads.count(temp_project / "src/pkg/deep.py") == 1
+    for summary in ("SUMMARY", "src/SUMMARY", "src/pkg/SUMMARY"):
+        assert "x = 1" in (temp_project / summary).read_text()
+
+def test_summary_order_matches_sorted_paths(temp_project):
+    """Test that files are ordered like sorted(rglob) with nested directories."""
+    generator = SummaryGenerator(temp_project, layout="inline")
+    (temp_project / "src/a").mkdir()
+    (temp_project / "src/a/inner.py").write_text("inner")
+    (temp_project / "src/a.py").write_text("outer")
+    
+    summary = generator.generate_directory_summary(temp_project / "src")
+    headers = [line for line in summary.splitlines() if line.startswith("File:")]
+    
+    assert headers == [
+        "File: src/a/inner.py",
+        "File: src/a.py",
+        "File: src/main.py",
+        "File: src/utils.py",
+    ]
+
+def test_linked_layout_inlines_direct_files_only(temp_project):
+    """Test linked summaries inline their own files and link to subdirectories."""
+    (temp_project / "src/pkg/inner").mkdir(parents=True)
+    (temp_project / "src/pkg/inner/deep.py").write_text("x = 1")
+    (temp_project / "docs").mkdir()
+    (temp_project / "docs/guide.md").write_text("# Guide")
+    
+    summary_files = SummaryGenerator(temp_project).generate_all_summaries()
+    
+    assert len(summary_files) == 4
+    root = (temp_project / "SUMMARY").read_text()
+    assert "# Test Project" in root
+    assert "print('hello')" not in root
+    assert root.endswith(
+        "Subdirectories\n" + "=" * 80 + "\n"
+        "- docs/SUMMARY: 1 files, 7 bytes\n"
+        "- src/SUMMARY: 3 files, 35 bytes\n"
+    )
+    # src/pkg has no files of its own, so src links straight to src/pkg/inner
+    src = (temp_project / "src/SUMMARY").read_text()
+    assert "x = 1" not in src
+    assert "- pkg/inner/SUMMARY: 1 files, 5 bytes" in src
+    assert "Subdirectories" not in (temp_project / "src/pkg/inner/SUMMARY").read_text()
+
+def test_incremental_skips_unchanged_summaries(generator, temp_project):
+    """Test that a rerun leaves summaries with unchanged inputs untouched."""
+    generator.generate_all_summaries()
+    root_mtime = (temp_project / "SUMMARY").stat().st_mtime_ns
+    src_mtime = (temp_project / "src/SUMMARY").stat().st_mtime_ns
+    
+    (temp_project / "README.md").write_text("# Changed Project")
+    summary_files = SummaryGenerator(temp_project).generate_all_summaries()
+    
+    assert len(summary_files) == 2
+    assert (temp_project / "src/SUMMARY").stat().st_mtime_ns == src_mtime
+    assert (temp_project / "SUMMARY").stat().st_mtime_ns != root_mtime
+    assert "# Changed Project" in (temp_project / "SUMMARY").read_text()
+
+def test_incremental_rebuilds_deleted_summary(generator, temp_project):
+    """Test that a missing output is rebuilt even if inputs are unchanged."""
+    generator.generate_all_summaries()
+    (temp_project / "src/SUMMARY").unlink()
+    
+    SummaryGenerator(temp_project).generate_all_summaries()
+    
+    assert "print('hello')" in (temp_project / "src/SUMMARY").read_text()
+
+def test_special_summaries_incremental(temp_project):
+    """Test that special summaries are only rewritten when inputs change."""
+    from summary_generator.special_summaries import generate_special_summaries
+    
+    files = generate_special_summaries(temp_project)
+    mtimes = {path: path.stat().st_mtime_ns for path in files}
+    
+    (temp_project / "src/utils.py").write_text("def changed(): pass")
+    files = generate_special_summaries(temp_project)
+    
+    python_md = temp_project / "SUMMARIES/PYTHON.md"
+    assert "def changed()" in python_md.read_text()
+    assert python_md.stat().st_mtime_ns != mtimes[python_md]
+    readmes_md = temp_project / "SUMMARIES/READMEs.md"
+    assert readmes_md.stat().st_mtime_ns == mtimes[readmes_md]
+
+def test_python_summary_rebuilt_for_new_extractor_version(temp_project, monkeypatch):
+    """Test that PYTHON.md is rebuilt when the signature extractor's output changes."""
+    from summary_generator import special_summaries
+    from summary_generator.signature_extractor import SignatureExtractor
+    special_summaries.generate_special_summaries(temp_project)
+    
+    monkeypatch.setattr(SignatureExtractor, "VERSION", SignatureExtractor.VERSION + 1)
+    monkeypatch.setattr(special_summaries, "generate_python_summary", lambda *args, **kwargs: "new format")
+    special_summaries.generate_special_summaries(temp_project)
+    
+    assert (temp_project / "SUMMARIES/PYTHON.md").read_text() == "new format"
+
+def test_manifest_drops_records_of_deleted_files(temp_project):
+    """Test the manifest forgets inputs and outputs that are gone."""
+    import json
+    import shutil
+    from summary_generator.__main__ import generate
+    (temp_project / "docs").mkdir()
+    (temp_project / "docs/guide.md").write_text("# Guide")
+    generate(str(temp_project), push=False)
+    
+    (temp_project / "src/utils.py").unlink()
+    shutil.rmtree(temp_project / "docs")
+    generate(str(temp_project), push=False)
+    
+    data = json.loads((temp_project / ".summary_cache/manifest.json").read_text())
+    assert "src/main.py" in data["files"]
+    assert not any(key.startswith(("src/utils.py", "docs/")) for key in data["files"])
+    assert "SUMMARIES/PYTHON.md" in data["outputs"]
+    assert "docs/SUMMARY" not in data["outputs"]
+
+def test_python_summary_keeps_its_own_file_selection(temp_project):
+    """Test PYTHON.md lists Python files the directory summaries exclude."""
+    from summary_generator.__main__ import generate
+    (temp_project / "pyproject.toml").write_text('[tool.summary]\nignore_patterns = ["tools/"]\n')
+    (temp_project / "tools").mkdir()
+    (temp_project / "tools/release.py").write_text("def release(): pass")
+    
+    generate(str(temp_project), push=False, no_cache=True)
+    
+    assert not (temp_project / "tools/SUMMARY").exists()
+    assert "def release()" in (temp_project / "SUMMARIES/PYTHON.md").read_text()
+
+def test_python_file_over_cap_read_once(temp_project, monkeypatch):
+    """Test a Python file over its cap is read once for SUMMARY, hash and parsing."""
+    import builtins
+    from summary_generator import limits
+    from summary_generator.__main__ import generate
+    (temp_project / "pyproject.toml").write_text(
+        '[tool.summary]\nmax_file_bytes_by_suffix = {".py" = 32}\n'
+    )
+    big = temp_project / "src/big.py"
+    big.write_text("x = 1\n" * 10 + "def last(): pass\n")
+    opened = []
+    def recording_open(path, *args, **kwargs):
+        opened.append(Path(path))
+        return builtins.open(path, *args, **kwargs)
+    monkeypatch.setattr(limits, "open", recording_open, raising=False)
+    
+    generate(str(temp_project), push=False, no_cache=True)
+    
+    assert opened.count(big) == 1
+    assert "[... truncated" in (temp_project / "src/SUMMARY").read_text()
+    assert "def last()" in (temp_project / "SUMMARIES/PYTHON.md").read_text()
+
+def test_python_summary_sees_changes_past_size_cap(temp_project):
+    """Test that PYTHON.md is rebuilt when a file changes beyond its size cap."""
+    from summary_generator.special_summaries import generate_special_summaries
+    (temp_project / "pyproject.toml").write_text(
+        '[tool.summary]\nmax_file_bytes_by_suffix = {".py" = 32}\n'
+    )
+    big = temp_project / "src/big.py"
+    big.write_text("x = 1\n" * 10 + "def first(): pass\n")
+    generate_special_summaries(temp_project)
+    
+    # Same size, so the truncated content and its marker are unchanged too
+    big.write_text("x = 1\n" * 10 + "def other(): pass\n")
+    generate_special_summaries(temp_project)
+    
+    python_md = (temp_project / "SUMMARIES/PYTHON.md").read_text()
+    assert "def other()" in python_md
+    assert "def first()" not in python_md
+
+@pytest.mark.parametrize("output_format", ["files", "both"])
+def test_generate_reads_each_input_once(temp_project, monkeypatch, output_format):
+    """Test that all outputs of a run share one scan and one read per file."""
+    from summary_generator.__main__ import generate
+    from summary_generator.limits import FileLimits
+    (temp_project / "src/README.md").write_text("# Source")
+    
+    reads = []
+    original_read = FileLimits.read
+    def counting_read(self, path, size):
+        reads.append(path)
+        return original_read(self, path, size)
+    monkeypatch.setattr(FileLimits, "read", counting_read)
+    original_read_text = Path.read_text
+    def counting_read_text(self, *args, **kwargs):
+        reads.append(self)
+        return original_read_text(self, *args, **kwargs)
+    monkeypatch.setattr(Path, "read_text", counting_read_text)
+    
+    generate(str(temp_project), push=False, no_cache=True, output_format=output_format)
+    
+    inputs = [path for path in reads if ".summary_cache" not in path.parts]
+    assert len(set(inputs)) == len(inputs)
+    for name in ("README.md", "src/README.md", "src/main.py", "src/utils.py"):
+        assert reads.count(temp_project / name) == 1
+    assert "# Source" in (temp_project / "SUMMARIES/README_SUBs.md").read_bytes().decode()
+    assert "def test()" in (temp_project / "SUMMARIES/PYTHON.md").read_bytes().decode()
+
+def test_generate_summaries_for_changed_directories(temp_project):
+    """Test regenerating only the summaries affected by changed files."""
+    generator = SummaryGenerator(temp_project, layout="inline")
+    from summary_generator.changes import affected_directories
+    
+    (temp_project / "docs").mkdir()
+    (temp_project / "docs/guide.md").write_text("# Guide")
+    changed = [temp_project / "src/main.py"]
+    
+    summary_files = generator.generate_summaries(
+        affected_directories(changed, temp_project)
+    )
+    
+    assert sorted(summary_files) == [temp_project / "SUMMARY", temp_project / "src/SUMMARY"]
+    assert not (temp_project / "docs/SUMMARY").exists()
+    assert "# Guide" in (temp_project / "SUMMARY").read_text()
+
+def test_since_scans_only_affected_directories(temp_project, monkeypatch):
+    """Test that a --since run skips unchanged subtrees and matches a full run."""
+    import os
+    from summary_generator.changes import affected_directories
+    (temp_project / "src/pkg/inner").mkdir(parents=True)
+    (temp_project / "src/pkg/inner/deep.py").write_text("x = 1")
+    (temp_project / "docs/api").mkdir(parents=True)
+    (temp_project / "docs/api/ref.md").write_text("# Ref")
+    SummaryGenerator(temp_project).generate_all_summaries()
+    
+    (temp_project / "src/pkg/inner/deep.py").write_text("x = 12345")
+    (temp_project / "src/pkg/new.py").write_text("y = 2")
+    scanned = []
+    original_scandir = os.scandir
+    def recording_scandir(path):
+        scanned.append(Path(path))
+        return original_scandir(path)
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+    changed = [temp_project / "src/pkg/inner/deep.py", temp_project / "src/pkg/new.py"]
+    
+    summary_files = SummaryGenerator(temp_project).generate_summaries(
+        affected_directories(changed, temp_project)
+    )
+    monkeypatch.setattr(os, "scandir", original_scandir)
+    
+    assert sorted(summary_files) == [
+        temp_project / "SUMMARY", temp_project / "src/SUMMARY",
+        temp_project / "src/pkg/SUMMARY", temp_project / "src/pkg/inner/SUMMARY"
+    ]
+    assert temp_project / "docs" not in scanned
+    assert temp_project / "docs/api" not in scanned
+    since = {path: path.read_bytes() for path in temp_project.rglob("SUMMARY")}
+    SummaryGenerator(temp_project, incremental=False).generate_all_summaries()
+    assert since == {path: path.read_bytes() for path in temp_project.rglob("SUMMARY")}
+    assert b"- src/SUMMARY: 4 files, 44 bytes" in since[temp_project / "SUMMARY"]
+
+def test_changed_files_since_ref(temp_project):
+    """Test listing changed files relative to the root from git."""
+    import subprocess
+    from summary_generator.changes import changed_files
+    
+    repo = temp_project / "repo"
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    git = ["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@t"]
+    (repo / "a.py").write_text("a = 1")
+    (repo / "b.md").write_text("b")
+    subprocess.run([*git, "add", "."], check=True)
+    subprocess.run([*git, "commit", "-qm", "init"], check=True)
+    (repo / "a.py").write_text("a = 2")
+    
+    assert changed_files("HEAD", repo) == [repo / "a.py"]
+    
+    (repo / "é.md").write_text("new")
+    (repo / "SUMMARY").write_text("generated")
+    assert changed_files("HEAD", repo) == [repo / "a.py", repo / "é.md"]
+
+def test_since_removes_summaries_of_emptied_directories(temp_project):
+    """Test that deleting a directory's last file removes its SUMMARY."""
+    from summary_generator.changes import affected_directories
+    (temp_project / "d/e").mkdir(parents=True)
+    (temp_project / "d/e/e.md").write_text("# E")
+    SummaryGenerator(temp_project).generate_all_summaries()
+    assert (temp_project / "d/e/SUMMARY").exists()
+    
+    (temp_project / "d/e/e.md").unlink()
+    SummaryGenerator(temp_project).generate_summaries(
+        affected_directories([temp_project / "d/e/e.md"], temp_project)
+    )
+    
+    assert not (temp_project / "d/e/SUMMARY").exists()
+    assert "d/e/SUMMARY" not in (temp_project / "SUMMARY").read_text()
+
+def git_output(cwd, *args):
+    """Run git with a test identity and return its output."""
+    import subprocess
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout
+
+@pytest.fixture
+def pushed_project(tmp_path):
+    """Create a clone whose summaries were generated and pushed to a local bare origin."""
+    from summary_generator.__main__ import generate
+    remote, work = tmp_path / "remote.git", tmp_path / "work"
+    git_output(tmp_path, "init", "-q", "--bare", "-b", "main", str(remote))
+    git_output(tmp_path, "init", "-q", "-b", "main", str(work))
+    (work / "README.md").write_text("# Project")
+    for name in ("a", "b"):
+        (work / name).mkdir()
+        (work / name / "README.md").write_text(f"# {name}")
+        (work / name / "mod.py").write_text(f"def {name}(): pass")
+    git_output(work, "add", ".")
+    git_output(work, "commit", "-qm", "init")
+    git_output(work, "remote", "add", "origin", str(remote))
+    git_output(work, "push", "-q", "origin", "main")
+    generate(str(work), push=True)
+    return work, remote
+
+def assert_summaries_branch_complete(repo):
+    """Check the pushed summaries branch has every output and the change to a/mod.py."""
+    git_output(repo, "fetch", "-q", "origin")
+    tree = git_output(repo, "ls-tree", "-r", "--name-only", "origin/summaries").split()
+    for name in ("SUMMARY", "a/SUMMARY", "b/SUMMARY", "SUMMARIES/READMEs.md",
+                 "SUMMARIES/README_SUBs.md", "SUMMARIES/PYTHON.md"):
+        assert name in tree
+    assert "def a2()" in git_output(repo, "show", "origin/summaries:a/SUMMARY")
+    assert "def b()" in git_output(repo, "show", "origin/summaries:b/SUMMARY")
+    assert "def a2()" in git_output(repo, "show", "origin/summaries:SUMMARIES/PYTHON.md")
+
+def test_since_push_keeps_every_output_on_branch(pushed_project):
+    """Test that a --since run still commits the outputs it did not regenerate."""
+    from summary_generator.__main__ import generate
+    work, _ = pushed_project
+    
+    (work / "a/mod.py").write_text("def a2(): pass")
+    generate(str(work), push=True, since="HEAD")
+    
+    assert_summaries_branch_complete(work)
+
+def test_since_from_clean_checkout_regenerates_everything(pushed_project, tmp_path):
+    """Test that --since in a fresh clone, with no earlier outputs on disk, keeps every summary."""
+    from summary_generator.__main__ import generate
+    _, remote = pushed_project
+    clone = tmp_path / "clone"
+    git_output(tmp_path, "clone", "-q", "-b", "main", str(remote), str(clone))
+    assert not (clone / "b/SUMMARY").exists()
+    
+    (clone / "a/mod.py").write_text("def a2(): pass")
+    generate(str(clone), push=True, since="HEAD")
+    
+    assert_summaries_branch_complete(clone)
+
+@pytest.mark.parametrize("layout", ["linked", "inline"])
+@pytest.mark.parametrize("incremental", [False, True])
+def test_streaming_matches_in_memory(temp_project, incremental, layout, monkeypatch):
+    """Test that streamed summaries are byte-identical to in-memory ones."""
+    from summary_generator import writer
+    monkeypatch.setattr(writer, "CHUNK_SIZE", 8)
+    
+    (temp_project / "src/crlf.txt").write_bytes(b"one\r\ntwo\rthree\r\n" * 5)
+    (temp_project / "src/bad.txt").write_bytes(b"ok\xff\xfe")
+    (temp_project / "src/pkg").mkdir()
+    (temp_project / "src/pkg/big.md").write_text("line\n" * 100)
+    
+    expected = {}
+    for directory in ("", "src", "src/pkg"):
+        expected[directory] = SummaryGenerator(
+            temp_project, incremental=False, layout=layout
+        ).generate_directory_summary(temp_project / directory)
+    
+    gen = SummaryGenerator(temp_project, incremental=incremental, streaming=True, layout=layout)
+    summary_files = gen.generate_all_summaries()
+    
+    assert len(summary_files) == 3
+    for directory, content in expected.items():
+        assert (temp_project / directory / "SUMMARY").read_bytes() == content.encode("utf-8")
+    assert not list(temp_project.rglob("SUMMARY.tmp"))
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("incremental", [False, True])
+def test_threaded_io_matches_serial(temp_project, streaming, incremental):
+    """Test that reads and writes on a thread pool give identical, ordered output."""
+    for i in range(8):
+        package = temp_project / f"src/pkg{i}"
+        package.mkdir()
+        for j in range(5):
+            (package / f"mod{j}.py").write_text(f"value = {i * j}\n" * (j + 1))
+    
+    serial = SummaryGenerator(temp_project, incremental=False).generate_all_summaries()
+    expected = {path: path.read_bytes() for path in serial}
+    for path in serial:
+        path.unlink()
+    
+    threaded = SummaryGenerator(
+        temp_project, incremental=incremental, streaming=streaming, jobs=4
+    ).generate_all_summaries()
+    
+    assert threaded == serial
+    for path, content in expected.items():
+        assert path.read_bytes() == content
+    assert not list(temp_project.rglob("*.tmp"))
+
+def test_binary_file_skipped_after_sniffing(tmp_path, monkeypatch):
+    """Test a large binary is rejected after reading only its first bytes."""
+    import builtins
+    from summary_generator import limits
+    blob = tmp_path / "blob.bin"
+    blob.write_bytes(b"\0" * (1024 * 1024))
+    read_bytes = []
+    class Recording:
+        def __init__(self, f):
+            self.f = f
+        def __enter__(self):
+            return self
+        def __exit__(self, *exc):
+            self.f.close()
+        def read(self, *args):
+            data = self.f.read(*args)
+            read_bytes.append(len(data))
+            return data
+    monkeypatch.setattr(limits, "open", lambda *args: Recording(builtins.open(*args)), raising=False)
+    
+    with pytest.raises(limits.BinaryFileError):
+        limits.FileLimits(max_bytes=0).read(blob, blob.stat().st_size)
+    assert sum(read_bytes) == limits.SNIFF_BYTES
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_size_caps_and_binary_files(temp_project, streaming, monkeypatch):
+    """Test large files are truncated and binary files skipped in both modes."""
+    from summary_generator import writer
+    from summary_generator.limits import FileLimits
+    monkeypatch.setattr(writer, "CHUNK_SIZE", 8)
+    
+    # The cap cuts the two-byte "é" in half, so it is dropped
+    (temp_project / "src/big.json").write_text("x" * 15 + "é" + "tail")
+    (temp_project / "src/blob.txt").write_bytes(b"text\0more")
+    (temp_project / "src/small.txt").write_text("short\r\n")
+    limits = FileLimits(max_bytes=1000, by_suffix={".json": 16})
+    
+    SummaryGenerator(temp_project, incremental=False, streaming=streaming,
+                     limits=limits).generate_all_summaries()
+    content = (temp_project / "src" / "SUMMARY").read_text()
+    
+    assert "x" * 15 + "\n[... truncated: showing the first 16 of 21 bytes ...]" in content
+    assert "tail" not in content
+    assert "blob.txt" not in content
+    assert "short\n" in content
@@ -0,0 +1,78 @@
+"""Tests for stat-snapshot polling and watch-mode rebuilds."""
+import os
+import pytest
+from benchmarks import RepoSpec, build_repo
+from project_utils.watch import SnapshotWatcher, changed_paths, take_snapshot
+from summary_generator.watch import WatchSession
+
+def bump(path, text):
+    """Rewrite a file and move its mtime forward so the change is always seen."""
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a small synthetic project with README and site templates."""
+    root = tmp_path / "repo"
+    build_repo(root, RepoSpec(files=12, depth=1, fanout=2, file_size=128, classes=1, methods=1))
+    return root
+
+def test_snapshot_diff_and_debounce(tmp_path):
+    """Test that a burst of changes is reported once, after it settles."""
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "skip").mkdir()
+    (tmp_path / "skip/b.txt").write_text("b")
+    take = lambda: take_snapshot(tmp_path, include_directory=lambda path: path.name != "skip")
+    assert set(take()) == {tmp_path / "a.txt"}
+
+    writes = iter([lambda: bump(tmp_path / "c.txt", "c"), lambda: None])
+    watcher = SnapshotWatcher(take, sleep=lambda seconds: next(writes)())
+    bump(tmp_path / "a.txt", "changed")
+    (tmp_path / "skip/b.txt").write_text("ignored")
+
+    assert watcher.wait() == {tmp_path / "a.txt", tmp_path / "c.txt"}
+    assert watcher.wait(timeout=0) == set()
+
+    (tmp_path / "c.txt").unlink()
+    assert changed_paths(watcher.snapshot, take()) == {tmp_path / "c.txt"}
+
+def test_absorb_ignores_own_writes_only(tmp_path):
+    """Test that absorbed outputs are not reported but other edits still are."""
+    (tmp_path / "out.md").write_text("out")
+    (tmp_path / "in.md").write_text("in")
+    watcher = SnapshotWatcher(lambda: take_snapshot(tmp_path), sleep=lambda seconds: None)
+
+    bump(tmp_path / "out.md", "rebuilt")
+    bump(tmp_path / "in.md", "edited during the rebuild")
+    watcher.absorb([tmp_path / "out.md"])
+
+    assert watcher.wait() == {tmp_path / "in.md"}
+
+def test_rebuild_regenerates_only_affected_outputs(project):
+    """Test that each kind of change refreshes just the outputs depending on it."""
+    site = project / "_site" / "index.html"
+    session = WatchSession(project, site_dir=project / "_site")
+    outputs = session.rebuild()
+    assert project / "README.md" in outputs
+    assert site in outputs
+    assert (project / "src" / "SUMMARY").exists()
+    assert (project / "SUMMARIES" / "PYTHON.md").exists()
+
+    module = project / "src" / "dir0_0" / "module_4.py"
+    bump(module, "def edited(): pass\n")
+    site_mtime = site.stat().st_mtime_ns
+    outputs = session.rebuild({module})
+
+    assert "def edited()" in (project / "src" / "dir0_0" / "SUMMARY").read_text()
+    assert "def edited()" in (project / "SUMMARIES" / "PYTHON.md").read_text()
+    assert project / "README.md" not in outputs
+    assert site.stat().st_mtime_ns == site_mtime
+
+    template = project / "docs" / "readme" / "sections" / "usage.md.j2"
+    bump(template, "## Usage\n\nWatch mode.\n")
+    outputs = session.rebuild({template})
+
+    assert "Watch mode." in (project / "README.md").read_text()
+    assert "Watch mode." in site.read_text()
+    assert "Watch mode." in (project / "SUMMARIES" / "READMEs.md").read_text()